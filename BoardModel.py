@@ -0,0 +1,126 @@
+from enum import Enum
+
+###########################################################################
+# Class:  BoardModel
+#
+# Display-independent state of the Wordle board: the letter and mark of
+# every tile and the mark of every keyboard key. Every mutator returns
+# only the cells whose state actually changed, so a view can update just
+# those widgets, each with a single call.
+###########################################################################
+
+class Mark(Enum):
+    UNMARKED  = 0
+    CORRECT   = 1
+    INCORRECT = 2
+    MISPLACED = 3
+    INVALID   = 4
+
+# a key keeps its best mark: correct beats misplaced beats incorrect
+_KEY_RANK = {Mark.UNMARKED: 0, Mark.INCORRECT: 1, Mark.MISPLACED: 2, Mark.CORRECT: 3}
+
+KEYBOARD_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+class Change:
+    ''' One widget whose state differs from what is on screen:
+            kind:   "tile" or "key"
+            where:  (row, col) for a tile, the lowercase letter for a key
+            letter: the letter to show
+            mark:   the Mark to show
+    '''
+    __slots__ = ("kind", "where", "letter", "mark")
+
+    def __init__(self, kind: str, where: tuple[int, int] | str, letter: str, mark: Mark) -> None:
+        self.kind = kind
+        self.where = where
+        self.letter = letter
+        self.mark = mark
+
+    def __repr__(self) -> str:
+        return f"Change({self.kind!r}, {self.where!r}, {self.letter!r}, {self.mark.name})"
+
+class BoardModel:
+    __slots__ = ("_rows", "_cols", "_letters", "_marks", "_keys")
+
+    def __init__(self, rows: int = 6, cols: int = 5) -> None:
+        ''' initializer for an empty board
+        Parameters:
+            rows: number of guesses on the board
+            cols: letters per guess
+        '''
+        self._rows = rows
+        self._cols = cols
+        self._letters = [[""] * cols for _ in range(rows)]
+        self._marks = [[Mark.UNMARKED] * cols for _ in range(rows)]
+        self._keys = {letter: Mark.UNMARKED for letter in KEYBOARD_LETTERS}
+
+    def rows(self) -> int:
+        ''' getter for the number of rows '''
+        return self._rows
+
+    def cols(self) -> int:
+        ''' getter for the number of letters per row '''
+        return self._cols
+
+    def letter(self, row: int, col: int) -> str:
+        ''' returns the letter in a tile ("" if empty) '''
+        return self._letters[row][col]
+
+    def mark(self, row: int, col: int) -> Mark:
+        ''' returns the mark of a tile '''
+        return self._marks[row][col]
+
+    def word(self, row: int) -> str:
+        ''' returns the letters typed in a row, joined '''
+        return "".join(self._letters[row])
+
+    def keyMark(self, letter: str) -> Mark:
+        ''' returns the mark of a keyboard key '''
+        return self._keys[letter.lower()]
+
+    def setTile(self, row: int, col: int, letter: str, mark: Mark = Mark.UNMARKED) -> list[Change]:
+        ''' sets a tile's letter and mark
+        Returns:
+            the change, or an empty list if the tile already looked like that
+        '''
+        if self._letters[row][col] == letter and self._marks[row][col] == mark:
+            return []
+        self._letters[row][col] = letter
+        self._marks[row][col] = mark
+        return [Change("tile", (row, col), letter, mark)]
+
+    def markTile(self, row: int, col: int, mark: Mark) -> list[Change]:
+        ''' changes a tile's mark, keeping its letter '''
+        return self.setTile(row, col, self._letters[row][col], mark)
+
+    def markKeys(self, word: str, marks: list[Mark]) -> list[Change]:
+        ''' upgrades the keyboard with the marks of one scored word; a key
+            never goes from correct to misplaced or from either to incorrect
+        Returns:
+            one change per key whose mark actually changed
+        '''
+        best: dict[str, Mark] = {}
+        for letter, mark in zip(word.lower(), marks):
+            if _KEY_RANK[mark] > _KEY_RANK[best.get(letter, Mark.UNMARKED)]:
+                best[letter] = mark
+        changes = []
+        for letter, mark in best.items():
+            if _KEY_RANK[mark] > _KEY_RANK[self._keys[letter]]:
+                self._keys[letter] = mark
+                changes.append(Change("key", letter, letter.upper(), mark))
+        return changes
+
+    def reset(self) -> list[Change]:
+        ''' clears the board and keyboard
+        Returns:
+            changes for only the tiles and keys that were not already clear
+        '''
+        changes = []
+        for row in range(self._rows):
+            for col in range(self._cols):
+                changes += self.setTile(row, col, "")
+        for letter, mark in self._keys.items():
+            if mark != Mark.UNMARKED:
+                self._keys[letter] = Mark.UNMARKED
+                changes.append(Change("key", letter, letter.upper(), Mark.UNMARKED))
+        return changes
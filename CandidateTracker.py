@@ -0,0 +1,167 @@
+import numpy as np
+from FeedbackMatrix import*
+
+###########################################################################
+# Candidate sets are Python ints used as bitsets over the rows of a
+# WordStore (bit i set = word i is still possible). LetterIndex holds the
+# precomputed bitsets each piece of feedback narrows by, so processing a
+# guess is a handful of big-int ANDs instead of a rescan of the word list.
+###########################################################################
+
+def _toBitset(flags: np.ndarray) -> int:
+    ''' packs a boolean array into an int with bit i set where flags[i] is True '''
+    return int.from_bytes(np.packbits(flags, bitorder="little").tobytes(), "little")
+
+def bitsetIndices(bits: int, size: int) -> np.ndarray:
+    '''This function lists the set bits of a bitset
+    parameters: bits - the bitset
+    size - number of words the bitset ranges over
+    returns: int64 array of set bit positions, in increasing order'''
+    raw = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little")[:size])
+
+###########################################################################
+class LetterIndex:
+    ''' Per-position letter bitsets and per-letter count bitsets over a
+        WordStore:
+            position(pos, letter) -> words with that letter at that position
+            atLeast(letter, k)    -> words with k or more copies of that letter
+    '''
+    __slots__ = ("_size", "_word_len", "_positions", "_at_least")
+
+    def __init__(self, words: WordStore) -> None:
+        ''' initializer: builds every bitset with one numpy pass per letter
+        Parameters:
+            words: the store the bitsets index into
+        '''
+        letters = words.letterArray()
+        self._size = len(words)
+        self._word_len = words.wordLength()
+        self._positions = [[_toBitset(letters[:, pos] == letter) for letter in range(26)]
+                           for pos in range(self._word_len)]
+        self._at_least = []
+        for letter in range(26):
+            counts = (letters == letter).sum(axis=1)
+            # index k holds words with >= k copies; k = 0 is every word and
+            # k = word_len + 1 is none, so callers never need bounds checks
+            self._at_least.append([_toBitset(counts >= k) for k in range(self._word_len + 2)])
+
+    def size(self) -> int:
+        ''' getter for the number of words indexed '''
+        return self._size
+
+    def wordLength(self) -> int:
+        ''' getter for the number of letters per word '''
+        return self._word_len
+
+    def everything(self) -> int:
+        ''' returns the bitset with every word set '''
+        return (1 << self._size) - 1
+
+    def position(self, pos: int, letter: int) -> int:
+        ''' returns the bitset of words with the letter (0-25) at pos '''
+        return self._positions[pos][letter]
+
+    def atLeast(self, letter: int, count: int) -> int:
+        ''' returns the bitset of words with at least count copies of the letter '''
+        return self._at_least[letter][min(count, self._word_len + 1)]
+
+###########################################################################
+class CandidateTracker:
+    ''' The set of solutions still consistent with the feedback of one game,
+        plus the revealed hints that hard mode requires later guesses to use.
+    '''
+    __slots__ = ("_index", "_words", "_bits", "_greens", "_min_counts")
+
+    def __init__(self, index: LetterIndex, words: WordStore) -> None:
+        ''' initializer for a fresh game (every word possible)
+        Parameters:
+            index: the LetterIndex built over words
+            words: the solution words
+        '''
+        self._index = index
+        self._words = words
+        self.reset()
+
+    def reset(self) -> None:
+        ''' makes every word possible again and forgets the revealed hints '''
+        self._bits = self._index.everything()
+        self._greens = [-1] * self._index.wordLength()
+        self._min_counts = [0] * 26
+
+    def update(self, guess: str, code: int) -> None:
+        ''' narrows the candidates by the feedback for one guess
+        Parameters:
+            guess: the guessed word
+            code:  its base-3 feedback pattern code
+        '''
+        index = self._index
+        bits = self._bits
+        shown = [0] * 26         # green + misplaced copies of each letter
+        grayed = set()           # letters with at least one incorrect copy
+        for pos, ch in enumerate(guess):
+            letter = ord(ch) - 97
+            digit = code % 3
+            code //= 3
+            if digit == CORRECT:
+                bits &= index.position(pos, letter)
+                self._greens[pos] = letter
+                shown[letter] += 1
+            else:
+                bits &= ~index.position(pos, letter)
+                if digit == MISPLACED:
+                    shown[letter] += 1
+                else:
+                    grayed.add(letter)
+        for letter in range(26):
+            if shown[letter]:
+                bits &= index.atLeast(letter, shown[letter])
+                self._min_counts[letter] = max(self._min_counts[letter], shown[letter])
+            if letter in grayed:
+                # an incorrect copy means the solution has exactly the shown count
+                bits &= ~index.atLeast(letter, shown[letter] + 1)
+        self._bits = bits
+
+    def words(self) -> WordStore:
+        ''' getter for the words being tracked '''
+        return self._words
+
+    def remainingCount(self) -> int:
+        ''' returns how many words are still possible '''
+        return self._bits.bit_count()
+
+    def remainingIndices(self) -> np.ndarray:
+        ''' returns the rows of the words that are still possible '''
+        return bitsetIndices(self._bits, self._index.size())
+
+    def remainingCandidates(self) -> list[str]:
+        ''' returns the words that are still possible, in sorted order '''
+        return [self._words[int(i)] for i in self.remainingIndices()]
+
+    def allowsHardMode(self, guess: str) -> bool:
+        ''' checks a guess against hard-mode rules: every correct letter must
+            stay in place and every revealed letter must be reused
+        '''
+        counts = [0] * 26
+        for pos, ch in enumerate(guess):
+            letter = ord(ch) - 97
+            if self._greens[pos] >= 0 and self._greens[pos] != letter:
+                return False
+            counts[letter] += 1
+        for letter in range(26):
+            if counts[letter] < self._min_counts[letter]:
+                return False
+        return True
+
+###################
+def main() -> None:
+    words = WordStore(["abide", "speed", "crane", "eerie", "abbey"])
+    tracker = CandidateTracker(LetterIndex(words), words)
+    tracker.update("speed", patternCode("speed", "abide"))
+    printTest(CandidateTracker.remainingCandidates, tracker, expected=["abide"], is_method=True)
+    printTest(CandidateTracker.allowsHardMode, tracker, "deter", expected=True, is_method=True)
+    printTest(CandidateTracker.allowsHardMode, tracker, "crane", expected=False, is_method=True)
+    printTest(CandidateTracker.remainingCount, tracker, expected=1, is_method=True)
+
+if __name__ == "__main__":
+    main()
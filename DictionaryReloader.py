@@ -0,0 +1,287 @@
+''' Live reload of the word lists: a background thread watches the two .txt
+    files and, once an edit has settled, builds the new dictionary (packed
+    stores, feedback matrix, letter index) off the game thread. Only then
+    is the reference swapped, in one assignment, so readers either see the
+    old version or the fully built new one.
+
+    Games keep the dictionary they started with: Wordle and the server read
+    current() when a game starts and hold on to that snapshot until it ends.
+    The cache files of a version (packed lists, feedback matrix, opener
+    scores, strategy tree) are deleted once it is more than keep versions
+    old; a game still on it keeps its already-mapped matrix.
+
+    Usage:
+        python DictionaryReloader.py [--watch [--interval SECONDS]]
+
+    Without --watch only the self-checks run (on scratch copies of the lists
+    and a scratch cache directory).
+
+    With WORDLE_METRICS=1 the rebuild time and the swap pause are recorded
+    as dictionary_rebuild_seconds and dictionary_swap_seconds.
+'''
+import argparse
+import glob
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Callable
+from WordDictionary import*
+from Metrics import*
+
+_log = logging.getLogger("wordle.reload")
+_metrics = Metrics.shared()
+
+###########################################################################
+class DictionaryReloader:
+    ''' Holds the current WordDictionary for a pair of word files and
+        replaces it when the files change. Reading current() takes no lock.
+    '''
+    __slots__ = ("_solutions_fname", "_allowed_fname", "_interval", "_prepare",
+                 "_current", "_version", "_stamp", "_pending", "_listeners",
+                 "_lock", "_stop", "_thread", "_last_rebuild", "_last_swap",
+                 "_keep", "_retired", "_pruned")
+
+    def __init__(self, solutions_fname: str, allowed_words_fname: str, interval: float = 1.0,
+                 prepare: Callable[[WordDictionary], None] | None = None,
+                 watch: bool = True, keep: int = 2) -> None:
+        ''' initializer: loads the current version, then starts watching
+        Parameters:
+            solutions_fname:     file with the list of solution words
+            allowed_words_fname: file with the list of allowed words
+            interval:            seconds between checks of the files
+            prepare:             extra warm-up run on each new version before
+                                 it goes live (e.g. loading solver tables)
+            watch:               if False, only reload when checkNow() is called
+            keep:                versions (the current one included) whose
+                                 cache files are kept; older ones are deleted
+        '''
+        self._solutions_fname = solutions_fname
+        self._allowed_fname = allowed_words_fname
+        self._interval = interval
+        self._prepare = prepare
+        self._listeners: list[Callable[[WordDictionary], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stamp = self._fileStamp()
+        self._pending = None
+        self._current = self._build()
+        self._version = 1
+        self._last_rebuild = 0.0
+        self._last_swap = 0.0
+        self._keep = max(keep, 1)
+        self._retired: list[tuple[str, str]] = []   # (dictionary, feedback) digests, oldest first
+        self._pruned = 0
+        self._thread = None
+        if watch:
+            self._thread = threading.Thread(target = self._watch, name = "dictionary-reload",
+                                            daemon = True)
+            self._thread.start()
+
+    def current(self) -> WordDictionary:
+        ''' returns the newest fully built dictionary '''
+        return self._current
+
+    def version(self) -> int:
+        ''' getter for how many versions have gone live (1 at start) '''
+        return self._version
+
+    def lastTimings(self) -> tuple[float, float]:
+        ''' returns (rebuild, swap pause) of the last reload, in seconds '''
+        return self._last_rebuild, self._last_swap
+
+    def prunedFiles(self) -> int:
+        ''' getter for the number of old cache files deleted so far '''
+        return self._pruned
+
+    def addListener(self, listener: Callable[[WordDictionary], None]) -> None:
+        ''' registers a function called with each new version after the swap '''
+        self._listeners.append(listener)
+
+    def stop(self) -> None:
+        ''' stops watching the files '''
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def checkNow(self) -> bool:
+        ''' checks the files once, reloading if they changed and have not
+            changed again since the previous check
+        Returns:
+            True if a new version went live
+        '''
+        stamp = self._fileStamp()
+        if stamp == self._stamp:
+            self._pending = None
+            return False
+        if stamp != self._pending:
+            # still being written (or just saved): wait for one quiet interval
+            self._pending = stamp
+            return False
+        self._pending = None
+        reloaded = self.reload()
+        self._stamp = stamp
+        return reloaded
+
+    def reload(self) -> bool:
+        ''' builds the dictionary from the files now and swaps it in if the
+            word lists changed; a failed build keeps the current version
+        Returns:
+            True if a new version went live
+        '''
+        start = time.perf_counter()
+        try:
+            dictionary = self._build()
+        except (OSError, ValueError) as error:
+            _log.warning("word list reload failed, keeping version %d: %s", self._version, error)
+            if _metrics.enabled:
+                _metrics.inc("dictionary_reload_failures_total")
+            return False
+        rebuild = time.perf_counter() - start
+        if dictionary.digest() == self._current.digest():
+            return False
+        # the only work done while readers could notice is this assignment
+        with self._lock:
+            start = time.perf_counter()
+            previous = self._current
+            self._current = dictionary
+            self._version += 1
+            swap = time.perf_counter() - start
+        self._last_rebuild, self._last_swap = rebuild, swap
+        _log.info("word lists reloaded: version %d (%d solutions, %d allowed), "
+                  "rebuilt in %.1f ms, swapped in %.1f us", self._version,
+                  len(dictionary.solutions()), len(dictionary.allowed()), 1e3 * rebuild, 1e6 * swap)
+        if _metrics.enabled:
+            _metrics.inc("dictionary_reloads_total")
+            _metrics.observe("dictionary_rebuild_seconds", rebuild)
+            _metrics.observe("dictionary_swap_seconds", swap)
+        for listener in self._listeners:
+            # the new version is already live, so one failing listener must
+            # not keep the others (or the bookkeeping below) from running
+            try:
+                listener(dictionary)
+            except Exception:
+                _log.exception("word list reload listener %r failed", listener)
+        self._retired.append((previous.digest(), previous.feedback().digest()))
+        self._prune()
+        return True
+
+    def _build(self) -> WordDictionary:
+        ''' private helper: load a dictionary and everything derived from it '''
+        dictionary = loadDictionary(self._solutions_fname, self._allowed_fname)
+        dictionary.solutions()
+        dictionary.feedback().solutionColumns()
+        dictionary.letterIndex()
+        if self._prepare is not None:
+            self._prepare(dictionary)
+        return dictionary
+
+    def _prune(self) -> None:
+        ''' private helper: delete the cache files of versions older than the
+            last keep, unless a kept version has the same words
+        '''
+        kept = {self._current.digest(), self._current.feedback().digest()}
+        while len(self._retired) > self._keep - 1:
+            digests = self._retired.pop(0)
+            kept.update(digest for version in self._retired for digest in version)
+            for digest in digests:
+                if digest in kept:
+                    continue
+                for path in glob.glob(cachePath(f"*-{digest[:16]}.bin")):
+                    try:
+                        os.remove(path)
+                    except OSError as error:
+                        _log.warning("could not delete old cache file %s: %s", path, error)
+                        continue
+                    self._pruned += 1
+                    if _metrics.enabled:
+                        _metrics.inc("dictionary_cache_files_pruned_total")
+
+    def _fileStamp(self) -> tuple:
+        ''' private helper: modification time and size of both files '''
+        stamp = []
+        for fname in (self._solutions_fname, self._allowed_fname):
+            try:
+                info = os.stat(fname)
+                stamp.append((info.st_mtime_ns, info.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _watch(self) -> None:
+        ''' watcher thread: poll the files until stop() '''
+        while not self._stop.wait(self._interval):
+            try:
+                self.checkNow()
+            except Exception:
+                _log.exception("word list watcher")
+
+###################
+def main() -> None:
+    logging.basicConfig(level = os.environ.get("WORDLE_LOG", "INFO").upper(),
+                        format = "%(asctime)s %(name)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description = "watch the word lists and time each reload")
+    parser.add_argument("--watch", action = "store_true",
+                        help = "after the checks, watch the real word lists until Ctrl-C")
+    parser.add_argument("--interval", type = float, default = 1.0)
+    args = parser.parse_args()
+
+    # reload a scratch copy of the lists with one solution removed; the
+    # pruning below must not touch the shared cache, so it is a scratch one too
+    with tempfile.TemporaryDirectory(prefix = "wordle-reload-") as scratch, scratchCache():
+        solutions = os.path.join(scratch, "answers.txt")
+        allowed = os.path.join(scratch, "allowed.txt")
+        shutil.copy("wordle-answers.txt", solutions)
+        shutil.copy("wordle-allowed-guesses.txt", allowed)
+        reloader = DictionaryReloader(solutions, allowed, watch = False)
+        before = reloader.current()
+        with open(solutions) as f:
+            words = f.read().split()
+        with open(solutions, "w") as f:
+            f.write("\n".join(w for w in words if w != "abide") + "\n")
+        os.utime(solutions, ns = (time.time_ns(), time.time_ns() + 1))
+        printTest(DictionaryReloader.checkNow, reloader, expected=False, is_method=True)
+        printTest(DictionaryReloader.checkNow, reloader, expected=True, is_method=True)
+        printTest(DictionaryReloader.version, reloader, expected=2, is_method=True)
+        # the old snapshot is untouched
+        printTest(WordStore.__contains__, before.solutions(), "abide", expected=True, is_method=True)
+        printTest(WordStore.__contains__, reloader.current().solutions(), "abide", expected=False,
+                  is_method=True)
+        rebuild, swap = reloader.lastTimings()
+        print(f"rebuild {1e3 * rebuild:.1f} ms, swap pause {1e6 * swap:.2f} us")
+        with open(solutions, "w") as f:
+            f.write("Not A Word\n")
+        reloader.checkNow()
+        printTest(DictionaryReloader.checkNow, reloader, expected=False, is_method=True)
+        printTest(DictionaryReloader.version, reloader, expected=2, is_method=True)
+
+        # keeping one version deletes the old lists and matrix at each swap
+        with open(solutions, "w") as f:
+            f.write("abide\nspeed\n")
+        with open(allowed, "w") as f:
+            f.write("abide\ncrane\nspeed\n")
+        reloader = DictionaryReloader(solutions, allowed, watch = False, keep = 1)
+        seen = []
+        reloader.addListener(lambda dictionary: 1 / 0)
+        reloader.addListener(seen.append)
+        with open(solutions, "w") as f:
+            f.write("abide\n")
+        reloader.reload()
+        printTest(DictionaryReloader.prunedFiles, reloader, expected=2, is_method=True)
+        # a failing listener does not stop the ones after it
+        print(f"later listener ran: {seen == [reloader.current()]}")
+
+    if not args.watch:
+        return
+    reloader = DictionaryReloader("wordle-answers.txt", "wordle-allowed-guesses.txt", args.interval)
+    print(f"watching the word lists every {args.interval} s (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        reloader.stop()
+
+if __name__ == "__main__":
+    main()
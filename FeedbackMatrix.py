@@ -0,0 +1,307 @@
+import os
+import struct
+import numpy as np
+from utils import*
+from WordStore import*
+
+###########################################################################
+# Feedback patterns are stored as a single base-3 code per (solution, guess)
+# pair: digit i (least significant first) is 0 for an incorrect letter,
+# 1 for a misplaced letter and 2 for a correct letter.  With five letters
+# every pattern fits in 0..242, so the whole answers x allowed-guesses table
+# is one uint8 matrix that is built once and memory-mapped afterwards
+# (longer words need wider codes; the header records their size).
+###########################################################################
+
+INCORRECT = 0
+MISPLACED = 1
+CORRECT   = 2
+
+_FILE_MAGIC   = b"WFBM"
+_FILE_VERSION = 2
+_HEADER       = struct.Struct("<4sHIIH32s") # magic, version, rows, cols, code bytes, digest
+_HEADER_SIZE  = 64                          # header is padded to this size
+_BUILD_CHUNK  = 256                         # solutions scored per numpy pass
+
+def encodeWords(words: list[str]) -> np.ndarray:
+    '''This function turns a list of equal-length lowercase words into
+    an array of letter indices (a=0 .. z=25)
+    parameters: words - list of words
+    returns: uint8 array of shape (len(words), word length)'''
+    if len(words) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+    raw = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+    return (raw.reshape(len(words), -1) - ord("a")).astype(np.uint8)
+
+def patternCode(guess: str, solution: str) -> int:
+    '''This function scores a single guess against a solution
+    parameters: guess - the guessed word
+    solution - the solution word
+    returns: the base-3 feedback pattern code'''
+    remaining = {}
+    for i in range(len(solution)):
+        if guess[i] != solution[i]:
+            remaining[solution[i]] = remaining.get(solution[i], 0) + 1
+    code = 0
+    place = 1
+    for i in range(len(guess)):
+        if guess[i] == solution[i]:
+            code += CORRECT * place
+        elif remaining.get(guess[i], 0) > 0:
+            remaining[guess[i]] -= 1
+            code += MISPLACED * place
+        place *= 3
+    return code
+
+def decodePattern(code: int, word_len: int = 5) -> tuple[list[int], list[int]]:
+    '''This function turns a pattern code back into index lists
+    parameters: code - base-3 feedback pattern code
+    word_len - number of letters in the word
+    returns: [correct indices, misplaced indices]'''
+    correct = []
+    almost = []
+    for i in range(word_len):
+        digit = code % 3
+        if digit == CORRECT:
+            correct.append(i)
+        elif digit == MISPLACED:
+            almost.append(i)
+        code //= 3
+    return [correct, almost]
+
+def _scoreCodes(guesses: np.ndarray, solutions: np.ndarray) -> np.ndarray:
+    '''This function scores every guess against every solution at once
+    parameters: guesses - letter-index array of shape (G, L)
+    solutions - letter-index array of shape (S, L)
+    returns: array of pattern codes of shape (G, S)'''
+    word_len = guesses.shape[1]
+    g = guesses[:, None, :]
+    s = solutions[None, :, :]
+    green = g == s                                   # (G, S, L)
+    codes = np.zeros((guesses.shape[0], solutions.shape[0]), dtype=np.int64)
+    for i in range(word_len - 1, -1, -1):
+        letter = guesses[:, i][:, None, None]        # (G, 1, 1)
+        # copies of this letter in the solution that are not already green
+        available = ((s == letter) & ~green).sum(axis=2)
+        # earlier non-green copies of this letter in the guess use those up
+        used = ((g[:, :, :i] == letter) & ~green[:, :, :i]).sum(axis=2)
+        yellow = ~green[:, :, i] & (used < available)
+        codes = codes * 3 + np.where(green[:, :, i], CORRECT, yellow.astype(np.int64))
+    return codes
+
+
+def _codeDtype(word_len: int) -> type:
+    '''This function picks the smallest unsigned type holding 3**word_len codes
+    parameters: word_len - number of letters in the words
+    returns: a numpy integer type'''
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if 3 ** word_len <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.uint64
+
+def scoreMany(guesses: list[str] | str | np.ndarray,
+              solutions: list[str] | str | np.ndarray,
+              chunk_size: int = 512) -> np.ndarray:
+    '''This function scores many guesses against many solutions in one call
+    parameters: guesses - a word, a list of words, a WordStore, or an encodeWords array
+    solutions - a word, a list of words, a WordStore, or an encodeWords array
+    chunk_size - guesses scored per numpy pass (bounds temporary memory)
+    returns: packed pattern codes of shape (len(guesses), len(solutions));
+    a dimension given as a single word is dropped from the result'''
+    single_guess = isinstance(guesses, str)
+    single_solution = isinstance(solutions, str)
+    if single_guess:
+        guesses = [guesses]
+    if single_solution:
+        solutions = [solutions]
+    if isinstance(guesses, WordStore):
+        guesses = guesses.letterArray()
+    elif not isinstance(guesses, np.ndarray):
+        guesses = encodeWords(list(guesses))
+    if isinstance(solutions, WordStore):
+        solutions = solutions.letterArray()
+    elif not isinstance(solutions, np.ndarray):
+        solutions = encodeWords(list(solutions))
+    word_len = max(guesses.shape[1], solutions.shape[1])
+    codes = np.zeros((guesses.shape[0], solutions.shape[0]), dtype=_codeDtype(word_len))
+    if codes.size:
+        if guesses.shape[1] != solutions.shape[1]:
+            raise ValueError("guesses and solutions must have the same length")
+        for start in range(0, guesses.shape[0], chunk_size):
+            chunk = guesses[start:start + chunk_size]
+            codes[start:start + chunk_size] = _scoreCodes(chunk, solutions)
+    if single_guess:
+        codes = codes[0]
+    if single_solution:
+        codes = codes[..., 0]
+    return codes
+
+
+###########################################################################
+class FeedbackMatrix:
+    ''' Precomputed feedback pattern for every (solution, allowed guess) pair,
+        backed by a memory-mapped file in the cache directory.
+    '''
+    __slots__ = ("_solutions", "_guesses", "_solution_columns",
+                 "_matrix", "_flat", "_cols", "_path", "_digest", "_decoded")
+
+    def __init__(self, solution_words: WordStore, allowed_words: WordStore) -> None:
+        ''' initializer: loads the matrix from the cache, building it first
+            if no cache file exists for these exact word lists
+        Parameters:
+            solution_words: store of possible solutions (matrix rows)
+            allowed_words:  store of allowed guesses (matrix columns)
+        '''
+        self._solutions = solution_words
+        self._guesses   = allowed_words
+        self._solution_columns = None
+        self._cols = len(allowed_words)
+        digest = contentHash(solution_words.codes().tobytes(), allowed_words.codes().tobytes())
+        self._digest = digest
+        self._path = cachePath(f"feedback-v{_FILE_VERSION}-{digest[:16]}.bin")
+        self._matrix = self._load(digest)
+        if self._matrix is None:
+            self._build(digest)
+            self._matrix = self._load(digest)
+        self._flat = (memoryview(self._matrix).cast("B").cast(self._matrix.dtype.char)
+                      if self._matrix.size else b"")
+        word_len = solution_words.wordLength()
+        self._decoded = [decodePattern(code, word_len) for code in range(3 ** word_len)]
+
+    @staticmethod
+    def mapFile(path: str, digest: str | None = None) -> np.ndarray | None:
+        ''' memory-maps a matrix cache file (used directly by worker processes)
+        Parameters:
+            path:   the cache file
+            digest: if given, the word-list hash the file must have been built from
+        Returns:
+            the read-only (solutions x guesses) matrix, or None if the file is
+            missing or does not match
+        '''
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        magic, version, rows, cols, itemsize, stored = _HEADER.unpack(header)
+        if magic != _FILE_MAGIC or version != _FILE_VERSION or itemsize not in (1, 2, 4):
+            return None
+        if digest is not None and stored != bytes.fromhex(digest):
+            return None
+        dtype = np.dtype(f"<u{itemsize}")
+        if rows * cols == 0:
+            return np.zeros((rows, cols), dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r",
+                         offset=_HEADER_SIZE, shape=(rows, cols))
+
+    def _load(self, digest: str) -> np.ndarray | None:
+        ''' private helper to memory-map the cache file, if it is valid '''
+        matrix = FeedbackMatrix.mapFile(self._path, digest)
+        if matrix is None or matrix.shape != (len(self._solutions), len(self._guesses)):
+            return None
+        return matrix
+
+    def _build(self, digest: str) -> None:
+        ''' private helper to score every pair and write the cache file '''
+        rows = len(self._solutions)
+        cols = len(self._guesses)
+        guesses = self._guesses.letterArray()
+        solutions = self._solutions.letterArray()
+        dtype = np.dtype(_codeDtype(self._solutions.wordLength())).newbyteorder("<")
+        tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            header = _HEADER.pack(_FILE_MAGIC, _FILE_VERSION, rows, cols, dtype.itemsize,
+                                  bytes.fromhex(digest))
+            f.write(header.ljust(_HEADER_SIZE, b"\0"))
+            for start in range(0, rows, _BUILD_CHUNK):
+                # rows of the file are solutions, so transpose each chunk
+                codes = scoreMany(guesses, solutions[start:start + _BUILD_CHUNK])
+                f.write(np.ascontiguousarray(codes.T, dtype=dtype).tobytes())
+        # rename is atomic, so concurrent starts never see a partial file
+        os.replace(tmp_path, self._path)
+
+    def matrix(self) -> np.ndarray:
+        ''' getter for the (solutions x allowed guesses) code matrix (uint8
+            up to 5 letters, wider for longer words)
+        '''
+        return self._matrix
+
+    def path(self) -> str:
+        ''' getter for the cache file backing this matrix '''
+        return self._path
+
+    def digest(self) -> str:
+        ''' getter for the hash of the word lists this matrix was built from '''
+        return self._digest
+
+    def solutionWords(self) -> WordStore:
+        ''' getter for the solution words (matrix rows) '''
+        return self._solutions
+
+    def guessWords(self) -> WordStore:
+        ''' getter for the allowed guesses (matrix columns) '''
+        return self._guesses
+
+    def solutionColumns(self) -> np.ndarray:
+        ''' returns, for every solution row, its column among the allowed
+            guesses (-1 if the solution is not an allowed guess)
+        '''
+        if self._solution_columns is None:
+            self._solution_columns = np.array([self._guesses.indexOf(w) for w in self._solutions],
+                                              dtype=np.int64)
+        return self._solution_columns
+
+    def solutionIndex(self, word: str) -> int:
+        ''' returns the row of a solution word, or -1 if it is not a solution '''
+        return self._solutions.indexOf(word)
+
+    def guessIndex(self, word: str) -> int:
+        ''' returns the column of an allowed word, or -1 if it is not allowed '''
+        return self._guesses.indexOf(word)
+
+    def codes(self, solution_row: int, guesses: list[str]) -> np.ndarray:
+        ''' returns the pattern codes for many guesses against the solution
+            in the given row as one array of the matrix dtype
+        '''
+        cols = np.fromiter((self._guesses.indexOf(g) for g in guesses),
+                           dtype=np.int64, count=len(guesses))
+        if len(cols) and cols.min() < 0:
+            # some guesses are outside the allowed list, so score them directly
+            return scoreMany(guesses, self._solutions[solution_row]).astype(self._matrix.dtype)
+        return self._matrix[solution_row, cols]
+
+    def code(self, solution_row: int, guess: str) -> int:
+        ''' returns the pattern code for a guess against the solution in
+            the given row, falling back to direct scoring for words that
+            are not in the allowed list
+        '''
+        col = self._guesses.indexOf(guess)
+        if col < 0:
+            return patternCode(guess, self._solutions[solution_row])
+        return self._flat[solution_row * self._cols + col]
+
+    def lookup(self, solution_row: int, guess: str) -> list[list[int]]:
+        ''' returns [correct indices, misplaced indices] for a guess against
+            the solution in the given row
+        '''
+        correct, almost = self._decoded[self.code(solution_row, guess)]
+        return [correct[:], almost[:]]
+
+###################
+def main() -> None:
+    printTest(patternCode, "abbey", "babes", expected=1 + 3 + 2 * 9 + 2 * 27)
+    printTest(patternCode, "speed", "abide", expected=3 ** 2 + 3 ** 4)
+    printTest(patternCode, "eerie", "abide", expected=3 ** 3 + 2 * 3 ** 4)
+    printTest(decodePattern, 2 + 1 * 3 + 2 * 81, expected=[[0, 4], [1]])
+    printTest(decodePattern, 0, expected=[[], []])
+    # six letters need uint16 codes, which the cache file must map back as such
+    sixes = WordStore(["banana", "bandit", "castle", "folder"], 6)
+    with scratchCache():
+        feedback = FeedbackMatrix(sixes, WordStore(["barber", "castle"], 6))
+        reloaded = FeedbackMatrix(sixes, feedback.guessWords())
+        printTest(FeedbackMatrix.code, reloaded, 2, "barber", expected=87, is_method=True)
+        printTest(FeedbackMatrix.code, reloaded, 3, "barber", expected=648, is_method=True)
+
+if __name__ == "__main__":
+    main()
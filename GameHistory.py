@@ -0,0 +1,482 @@
+''' Persistent history of finished games: an append-only log of fixed-width
+    binary records, split into segment files, with aggregate queries (win
+    rate, guess histogram, streaks, hardest words, per-day stats) that run
+    over memory-mapped segments without parsing anything.
+
+    Usage:
+        python GameHistory.py [--dir DIR]          report on a history
+        python GameHistory.py --bench N [--dir DIR] time N synthetic records
+
+    A record is 20 bytes: timestamp (u4, seconds), solution row (u2), up to
+    six guess columns in the allowed list (u2 each, 0xffff when unused),
+    the number of guesses (u1) and whether the game was won (u1). Ids are
+    only meaningful for the word lists they came from, so every segment
+    header carries the hash of those lists and a new segment is started
+    whenever they change.
+
+    record() only puts the game on a queue; a background thread resolves
+    word ids, packs records in batches and appends them, so a slow disk
+    never stalls gameplay.
+'''
+import argparse
+import logging
+import os
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable
+import numpy as np
+from utils import*
+from WordDictionary import*
+from Metrics import*
+
+MAX_GUESSES   = 6
+NO_GUESS      = 0xFFFF
+
+RECORD_DTYPE  = np.dtype([("timestamp", "<u4"), ("solution", "<u2"),
+                          ("guesses", "<u2", (MAX_GUESSES,)),
+                          ("count", "u1"), ("won", "u1")])
+
+_SEGMENT_MAGIC   = b"WGHS"
+_SEGMENT_VERSION = 1
+# magic, version, record size, segment number, dictionary hash prefix
+_SEGMENT_HEADER  = struct.Struct("<4sHHI16s4x")
+
+_log = logging.getLogger("wordle.history")
+_metrics = Metrics.shared()
+
+###########################################################################
+class GameHistory:
+    ''' Writer and query front end for one history directory. Segments are
+        named segment-NNNNNN.bin and hold at most segment_records records;
+        only whole records are ever read, so a torn write at the end of the
+        last segment is ignored (and trimmed the next time it is opened).
+    '''
+    __slots__ = ("_directory", "_dictionary", "_digest", "_segment_records", "_queue",
+                 "_thread", "_file", "_segment", "_segment_digest", "_segment_count", "_written")
+
+    def __init__(self, directory: str | None = None, dictionary: WordDictionary | None = None,
+                 segment_records: int = 1 << 22) -> None:
+        ''' initializer: opens (or creates) the history and starts the writer
+        Parameters:
+            directory:       where the segments live (default: the cache directory)
+            dictionary:      the word lists games are played with; needed to
+                             record games and to turn ids back into words
+            segment_records: records per segment file (4M records = 80 MB)
+        '''
+        self._directory = directory or cachePath("history")
+        os.makedirs(self._directory, exist_ok = True)
+        self._dictionary = dictionary
+        self._digest = dictionary.digest()[:16] if dictionary is not None else ""
+        self._segment_records = segment_records
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._file = None
+        self._segment = -1
+        self._segment_digest = ""
+        self._segment_count = 0
+        self._written = 0
+        self._thread = threading.Thread(target = self._writer, name = "game-history", daemon = True)
+        self._thread.start()
+
+    def directory(self) -> str:
+        ''' getter for the history directory '''
+        return self._directory
+
+    def setDictionary(self, dictionary: WordDictionary) -> None:
+        ''' switches to a new version of the word lists: later games default
+            to it and the word queries only look at games played with it
+        '''
+        self._dictionary = dictionary
+        self._digest = dictionary.digest()[:16]
+
+    # ---------------------------------------------------------------- writing
+
+    def record(self, solution: str, guesses: list[str], won: bool,
+               timestamp: float | None = None, dictionary: WordDictionary | None = None) -> None:
+        ''' queues one finished game; returns at once
+        Parameters:
+            solution:   the game's solution word
+            guesses:    the valid guesses, in order (at most six)
+            won:        whether the last guess was the solution
+            timestamp:  when the game ended (default: now)
+            dictionary: the word lists the game was played with (default:
+                        this history's), which the ids are taken from
+        Raises ValueError for a word outside those lists, which has no id
+        '''
+        dictionary = dictionary or self._dictionary
+        if dictionary is None:
+            raise ValueError("recording games needs the dictionary they were played with")
+        if dictionary.solutions().indexOf(solution) < 0:
+            raise ValueError(f"{solution!r} is not a solution word")
+        allowed = dictionary.allowed()
+        for guess in guesses[:MAX_GUESSES]:
+            if allowed.indexOf(guess) < 0:
+                raise ValueError(f"{guess!r} is not an allowed guess")
+        self._queue.put((solution, tuple(guesses), won,
+                         time.time() if timestamp is None else timestamp, dictionary))
+
+    def recordBatch(self, records: np.ndarray) -> None:
+        ''' queues already-packed records (an array of RECORD_DTYPE) with ids
+            from this history's word lists, e.g. when importing in bulk
+        '''
+        self._queue.put((np.asarray(records, dtype = RECORD_DTYPE), self._digest))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        ''' waits until everything queued so far is on disk
+        Returns:
+            False if the timeout ran out first
+        '''
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        ''' writes everything still queued and stops the writer '''
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def written(self) -> int:
+        ''' getter for the number of records written by this object '''
+        return self._written
+
+    def _writer(self) -> None:
+        ''' writer thread: drain the queue in batches until close() '''
+        while True:
+            items = [self._queue.get()]
+            while len(items) < 4096:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            games = []
+            stop = False
+            for item in items:
+                # a run of games ends at a marker, a bulk batch, or a switch
+                # of word lists (which also starts a new segment)
+                if games and (not isinstance(item, tuple) or len(item) != 5
+                              or item[4] is not games[0][4]):
+                    self._write(lambda: self._append(self._pack(games), games[0][4].digest()[:16]),
+                                len(games))
+                    games = []
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    item.set()
+                elif len(item) == 2:
+                    self._write(lambda: self._append(*item), len(item[0]))
+                else:
+                    games.append(item)
+            if games:
+                self._write(lambda: self._append(self._pack(games), games[0][4].digest()[:16]),
+                            len(games))
+            if stop:
+                if self._file is not None:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, write: Callable[[], None], count: int) -> None:
+        ''' private helper: run one write, logging a failure instead of
+            letting it end the writer thread (flush() would then never return)
+        '''
+        try:
+            write()
+        except Exception:
+            _log.exception("game history: dropped %d records", count)
+
+    def _pack(self, games: list[tuple]) -> np.ndarray:
+        ''' private helper: turn queued games (all from one dictionary) into records '''
+        records = np.zeros(len(games), dtype = RECORD_DTYPE)
+        solutions = games[0][4].solutions()
+        allowed = games[0][4].allowed()
+        guess_ids = np.full((len(games), MAX_GUESSES), NO_GUESS, dtype = np.uint16)
+        for row, (_, guesses, _, _, _) in enumerate(games):
+            guesses = guesses[:MAX_GUESSES]
+            guess_ids[row, :len(guesses)] = [allowed.indexOf(g) for g in guesses]
+        records["timestamp"] = [int(game[3]) for game in games]
+        records["solution"] = [solutions.indexOf(game[0]) for game in games]
+        records["guesses"] = guess_ids
+        records["count"] = [min(len(game[1]), MAX_GUESSES) for game in games]
+        records["won"] = [bool(game[2]) for game in games]
+        return records
+
+    def _append(self, records: np.ndarray, digest: str) -> None:
+        ''' private helper: write records whose ids come from the word lists
+            with the given hash, starting a new segment when the current one
+            is full or was written with other lists
+        '''
+        if not len(records):
+            return
+        start = time.perf_counter()
+        done = 0
+        while done < len(records):
+            if (self._file is None or self._segment_count >= self._segment_records
+                    or digest != self._segment_digest):
+                self._openSegment(digest)
+            n = min(len(records) - done, self._segment_records - self._segment_count)
+            self._file.write(records[done:done + n].tobytes())
+            self._segment_count += n
+            done += n
+        # flushed per batch, so readers in this process see the games at once
+        self._file.flush()
+        self._written += len(records)
+        if _metrics.enabled:
+            _metrics.inc("history_records_written_total", len(records))
+            _metrics.observe("history_write_seconds", time.perf_counter() - start)
+
+    def _openSegment(self, digest: str) -> None:
+        ''' private helper: continue the last segment if it has room and the
+            same word lists, else start the next one
+        '''
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        segments = self._segmentFiles()
+        if self._segment < 0 and segments:
+            number, path = segments[-1]
+            header = _readSegmentHeader(path)
+            count = _recordCount(path)
+            if header is not None and header[1] == digest and count < self._segment_records:
+                self._file = open(path, "r+b")
+                # drop a torn record left by a crash
+                self._file.truncate(_SEGMENT_HEADER.size + count * RECORD_DTYPE.itemsize)
+                self._file.seek(0, os.SEEK_END)
+                self._segment, self._segment_count = number, count
+                self._segment_digest = digest
+                return
+        self._segment = max(self._segment, segments[-1][0] if segments else -1) + 1
+        self._segment_count = 0
+        self._segment_digest = digest
+        self._file = open(self._segmentPath(self._segment), "xb")
+        self._file.write(_SEGMENT_HEADER.pack(_SEGMENT_MAGIC, _SEGMENT_VERSION,
+                                              RECORD_DTYPE.itemsize, self._segment,
+                                              digest.encode()))
+
+    def _segmentPath(self, number: int) -> str:
+        ''' private helper: file name of a segment '''
+        return os.path.join(self._directory, f"segment-{number:06d}.bin")
+
+    def _segmentFiles(self) -> list[tuple[int, str]]:
+        ''' private helper: (number, path) of every segment, in order '''
+        found = []
+        for name in os.listdir(self._directory):
+            if name.startswith("segment-") and name.endswith(".bin"):
+                found.append((int(name[8:-4]), os.path.join(self._directory, name)))
+        return sorted(found)
+
+    # ---------------------------------------------------------------- queries
+
+    def segments(self, current_only: bool = False) -> list[np.ndarray]:
+        ''' maps every segment's whole records (oldest first)
+        Parameters:
+            current_only: only segments written with this object's word lists
+        '''
+        mapped = []
+        for _, path in self._segmentFiles():
+            header = _readSegmentHeader(path)
+            count = _recordCount(path)
+            if header is None or count == 0 or (current_only and header[1] != self._digest):
+                continue
+            mapped.append(np.memmap(path, dtype = RECORD_DTYPE, mode = "r",
+                                    offset = _SEGMENT_HEADER.size, shape = (count,)))
+        return mapped
+
+    def count(self) -> int:
+        ''' returns the number of games recorded '''
+        return sum(len(s) for s in self.segments())
+
+    def winRate(self) -> float:
+        ''' returns the fraction of games won (0.0 with no games) '''
+        games = wins = 0
+        for records in self.segments():
+            games += len(records)
+            wins += int(np.count_nonzero(records["won"]))
+        return wins / games if games else 0.0
+
+    def guessHistogram(self) -> list[int]:
+        ''' returns games by result: index 0 counts losses, index n counts
+            games won in n guesses
+        '''
+        histogram = np.zeros(MAX_GUESSES + 1, dtype = np.int64)
+        for records in self.segments():
+            won = records["won"].astype(bool)
+            histogram += np.bincount(records["count"][won], minlength = MAX_GUESSES + 1)[:MAX_GUESSES + 1]
+            histogram[0] += len(won) - np.count_nonzero(won)
+        return histogram.tolist()
+
+    def streaks(self) -> tuple[int, int]:
+        ''' returns (current, longest) winning streak over all games '''
+        current = longest = 0
+        for records in self.segments():
+            losses = np.flatnonzero(records["won"] == 0)
+            if not len(losses):
+                current += len(records)
+                continue
+            longest = max(longest, current + int(losses[0]))
+            if len(losses) > 1:
+                longest = max(longest, int(np.diff(losses).max()) - 1)
+            current = len(records) - int(losses[-1]) - 1
+        return current, max(longest, current)
+
+    def hardestWords(self, n: int = 10, min_games: int = 1) -> list[tuple[str, int, float, float]]:
+        ''' ranks solutions by average score, counting a loss as seven guesses
+            (only segments written with this object's word lists are used)
+        Returns:
+            up to n (word, games, win rate, average score), hardest first
+        '''
+        if self._dictionary is None:
+            raise ValueError("naming words needs the dictionary the games were played with")
+        size = len(self._dictionary.solutions())
+        games = np.zeros(size, dtype = np.int64)
+        wins = np.zeros(size, dtype = np.int64)
+        score = np.zeros(size, dtype = np.float64)
+        for records in self.segments(current_only = True):
+            solution = records["solution"]
+            won = records["won"]
+            games += np.bincount(solution, minlength = size)[:size]
+            wins += np.bincount(solution, weights = won, minlength = size)[:size].astype(np.int64)
+            score += np.bincount(solution, minlength = size,
+                                 weights = np.where(won, records["count"], MAX_GUESSES + 1))[:size]
+        played = np.flatnonzero(games >= max(min_games, 1))
+        average = score[played] / games[played]
+        order = played[np.lexsort((-games[played], -average))][:n]
+        solutions = self._dictionary.solutions()
+        return [(solutions[int(i)], int(games[i]), float(wins[i] / games[i]), float(score[i] / games[i]))
+                for i in order]
+
+    def dailyStats(self, utc_offset_hours: float = 0.0) -> list[tuple[str, int, int, float]]:
+        ''' groups games by calendar day
+        Parameters:
+            utc_offset_hours: time zone the days are counted in
+        Returns:
+            (YYYY-MM-DD, games, wins, average guesses in won games) per day
+            with games, oldest first
+        '''
+        shift = int(utc_offset_hours * 3600)
+        totals: dict[int, np.ndarray] = {}
+        for records in self.segments():
+            days = (records["timestamp"].astype(np.int64) + shift) // 86400
+            # a segment spans few days, so count by offset from its first day
+            first = int(days.min())
+            days -= first
+            won = records["won"].astype(np.float64)
+            parts = np.stack([np.bincount(days),
+                              np.bincount(days, weights = won),
+                              np.bincount(days, weights = won * records["count"])], axis = 1)
+            for offset in np.flatnonzero(parts[:, 0]).tolist():
+                totals[first + offset] = totals.get(first + offset, 0) + parts[offset]
+        return [(time.strftime("%Y-%m-%d", time.gmtime(day * 86400)), int(row[0]), int(row[1]),
+                 float(row[2] / row[1]) if row[1] else 0.0)
+                for day, row in sorted(totals.items())]
+
+    def summary(self) -> dict:
+        ''' returns games, win_rate, histogram and the (current, longest) streaks '''
+        current, longest = self.streaks()
+        return {"games": self.count(), "win_rate": self.winRate(),
+                "histogram": self.guessHistogram(), "streak": current, "max_streak": longest}
+
+###########################################################################
+def _readSegmentHeader(path: str) -> tuple[int, str] | None:
+    ''' returns (segment number, dictionary hash prefix) of a segment, or
+        None if the file is not a segment this version can read
+    '''
+    with open(path, "rb") as f:
+        data = f.read(_SEGMENT_HEADER.size)
+    if len(data) < _SEGMENT_HEADER.size:
+        return None
+    magic, version, record_size, number, digest = _SEGMENT_HEADER.unpack(data)
+    if magic != _SEGMENT_MAGIC or version != _SEGMENT_VERSION or record_size != RECORD_DTYPE.itemsize:
+        return None
+    return number, digest.decode()
+
+def _recordCount(path: str) -> int:
+    ''' returns how many whole records a segment holds '''
+    return max(0, os.path.getsize(path) - _SEGMENT_HEADER.size) // RECORD_DTYPE.itemsize
+
+def syntheticRecords(n: int, solutions: int, allowed: int, days: int = 365,
+                     seed: int = 0) -> np.ndarray:
+    ''' returns n random but plausible records (for benchmarks) '''
+    rng = np.random.default_rng(seed)
+    records = np.zeros(n, dtype = RECORD_DTYPE)
+    records["timestamp"] = 1_700_000_000 + rng.integers(0, days * 86400, n)
+    records["solution"] = rng.integers(0, solutions, n)
+    counts = rng.choice(np.arange(1, MAX_GUESSES + 1), n, p = [.01, .06, .23, .34, .23, .13])
+    records["count"] = counts
+    records["won"] = rng.random(n) < 0.95
+    guesses = rng.integers(0, allowed, (n, MAX_GUESSES))
+    guesses[np.arange(MAX_GUESSES) >= counts[:, None]] = NO_GUESS
+    records["guesses"] = guesses
+    return records
+
+###################
+def main() -> None:
+    dictionary = loadDictionary("wordle-answers.txt", "wordle-allowed-guesses.txt")
+    parser = argparse.ArgumentParser(description = "report on (or benchmark) the game history")
+    parser.add_argument("--dir", default = None)
+    parser.add_argument("--bench", type = int, default = 0, metavar = "N")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix = "wordle-history-")
+    try:
+        history = GameHistory(scratch, dictionary, segment_records = 2)
+        history.record("abide", ["crane", "slate", "abide"], True, 86400 * 19000)
+        history.record("speed", ["crane", "slate", "abide", "eerie", "geese", "seize"], False, 86400 * 19000)
+        history.record("abide", ["abide"], True, 86400 * 19001)
+        try:
+            history.record("zzzzz", ["crane"], True)
+        except ValueError as error:
+            print(f"rejected: {error}")
+        printTest(GameHistory.flush, history, 5.0, expected=True, is_method=True)
+        history.close()
+        printTest(GameHistory.count, history, expected=3, is_method=True)
+        printTest(GameHistory.guessHistogram, history, expected=[1, 1, 0, 1, 0, 0, 0], is_method=True)
+        printTest(GameHistory.streaks, history, expected=(1, 1), is_method=True)
+        printTest(GameHistory.hardestWords, history, 1, expected=[("speed", 1, 0.0, 7.0)], is_method=True)
+        printTest(GameHistory.dailyStats, history,
+                  expected=[("2022-01-08", 2, 1, 3.0), ("2022-01-09", 1, 1, 1.0)], is_method=True)
+        # reopening continues the last segment rather than starting a new one
+        history = GameHistory(scratch, dictionary, segment_records = 4)
+        history.record("abide", ["abide"], True)
+        history.close()
+        printTest(GameHistory.count, history, expected=4, is_method=True)
+    finally:
+        shutil.rmtree(scratch)
+
+    if args.bench:
+        directory = args.dir or tempfile.mkdtemp(prefix = "wordle-history-")
+        history = GameHistory(directory, dictionary)
+        chunk = 1 << 20
+        start = time.perf_counter()
+        for done in range(0, args.bench, chunk):
+            history.recordBatch(syntheticRecords(min(chunk, args.bench - done),
+                                                 len(dictionary.solutions()),
+                                                 len(dictionary.allowed()), seed = done))
+        queued = time.perf_counter() - start
+        history.flush()
+        total = time.perf_counter() - start
+        print(f"wrote {args.bench:,} records in {total:.2f} s ({args.bench / total:,.0f}/s, "
+              f"{queued:.2f} s spent generating and queueing)")
+        one = time.perf_counter()
+        for _ in range(1000):
+            history.record("abide", ["crane", "abide"], True)
+        print(f"record() call: {1e6 * (time.perf_counter() - one) / 1000:.2f} us")
+        history.close()
+    else:
+        history = GameHistory(args.dir, dictionary)
+        history.close()
+    for name, query in (("summary", history.summary), ("hardest", lambda: history.hardestWords(5)),
+                        ("days", lambda: history.dailyStats()[-3:])):
+        start = time.perf_counter()
+        result = query()
+        print(f"{name:8s} {1000 * (time.perf_counter() - start):8.1f} ms  {result}")
+    if args.bench and args.dir is None:
+        shutil.rmtree(history.directory())
+
+if __name__ == "__main__":
+    main()
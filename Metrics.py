@@ -0,0 +1,218 @@
+''' In-process instrumentation for the game engine: counters, gauges and
+    latency histograms, exported as Prometheus text or JSON snapshots.
+
+    Recording is off unless WORDLE_METRICS=1 is set (or setEnabled(True) is
+    called). Hot paths check the enabled flag before reading the clock, so
+    when it is off each instrumented call costs one attribute read.
+
+    Usage in a hot path:
+        metrics = Metrics.shared()
+        if metrics.enabled:
+            start = time.perf_counter()
+        ...
+        if metrics.enabled:
+            metrics.observe("check_guess_seconds", time.perf_counter() - start)
+'''
+import bisect
+import json
+import os
+import threading
+import time
+
+# histogram bucket upper bounds in seconds: 1 us doubling up to ~16 s
+_BUCKETS = tuple(1e-6 * 2 ** k for k in range(25))
+
+###########################################################################
+class Histogram:
+    ''' Fixed-bucket latency histogram (Prometheus style: le buckets) '''
+    __slots__ = ("_counts", "_count", "_sum", "_max")
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(_BUCKETS) + 1)   # the last bucket is +Inf
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ''' records one sample '''
+        self._counts[bisect.bisect_left(_BUCKETS, seconds)] += 1
+        self._count += 1
+        self._sum += seconds
+        if seconds > self._max:
+            self._max = seconds
+
+    def count(self) -> int:
+        ''' getter for the number of samples '''
+        return self._count
+
+    def total(self) -> float:
+        ''' getter for the sum of all samples, in seconds '''
+        return self._sum
+
+    def quantile(self, fraction: float) -> float:
+        ''' returns the upper bound of the bucket holding the given quantile
+            (an over-estimate by at most a factor of two)
+        '''
+        if self._count == 0:
+            return 0.0
+        rank = fraction * self._count
+        seen = 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank and n:
+                return _BUCKETS[i] if i < len(_BUCKETS) else self._max
+        return self._max
+
+    def snapshot(self) -> dict:
+        ''' returns count, sum, max and p50/p90/p99 in seconds '''
+        return {"count": self._count, "sum": self._sum, "max": self._max,
+                "p50": self.quantile(0.50), "p90": self.quantile(0.90),
+                "p99": self.quantile(0.99)}
+
+    def buckets(self) -> list[tuple[float, int]]:
+        ''' returns (upper bound, cumulative count) for every bucket '''
+        cumulative = []
+        seen = 0
+        for bound, n in zip(_BUCKETS + (float("inf"),), self._counts):
+            seen += n
+            cumulative.append((bound, seen))
+        return cumulative
+
+###########################################################################
+class Metrics:
+    ''' A registry of named counters, gauges and histograms. Names follow
+        Prometheus conventions (snake_case, *_total for counters, *_seconds
+        for histograms).
+    '''
+    __slots__ = ("enabled", "_counters", "_gauges", "_histograms", "_lock", "_started")
+
+    _shared: 'Metrics | None' = None
+
+    @classmethod
+    def shared(cls) -> 'Metrics':
+        ''' returns the process-wide registry, enabled if WORDLE_METRICS=1 '''
+        if cls._shared is None:
+            cls._shared = Metrics(os.environ.get("WORDLE_METRICS", "") == "1")
+        return cls._shared
+
+    def __init__(self, enabled: bool = False) -> None:
+        ''' initializer for an empty registry
+        Parameters:
+            enabled: whether instrumented code should record anything
+        '''
+        # a public attribute rather than a getter: it is read on every hot call
+        self.enabled = enabled
+        self._counters: dict[str, int] = {}
+        self._gauges: dict[str, float] = {}
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def setEnabled(self, enabled: bool) -> None:
+        ''' turns recording on or off '''
+        self.enabled = enabled
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        ''' adds to a counter '''
+        if name in self._counters:
+            self._counters[name] += amount
+        else:
+            # a new name changes the dict's size, so only add it under the lock
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + amount
+
+    def setGauge(self, name: str, value: float) -> None:
+        ''' sets a gauge to a value '''
+        if name in self._gauges:
+            self._gauges[name] = value
+        else:
+            with self._lock:
+                self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        ''' records a latency sample in a histogram '''
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram())
+        histogram.observe(seconds)
+
+    def counter(self, name: str) -> int:
+        ''' returns a counter's value (0 if never incremented) '''
+        return self._counters.get(name, 0)
+
+    def histogram(self, name: str) -> Histogram | None:
+        ''' returns a histogram, or None if nothing was observed under name '''
+        return self._histograms.get(name)
+
+    def reset(self) -> None:
+        ''' drops every recorded value '''
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._started = time.time()
+
+    def snapshot(self) -> dict:
+        ''' returns every counter, gauge and histogram summary as plain data '''
+        counters, gauges, histograms = self._copies()
+        return {"since": self._started, "counters": counters, "gauges": gauges,
+                "histograms": {name: h.snapshot() for name, h in histograms.items()}}
+
+    def toJSON(self) -> str:
+        ''' returns a JSON snapshot '''
+        return json.dumps(self.snapshot(), sort_keys = True)
+
+    def toPrometheus(self, prefix: str = "wordle_") -> str:
+        ''' returns every metric in the Prometheus text exposition format '''
+        counters, gauges, histograms = self._copies()
+        lines = []
+        for name, value in sorted(counters.items()):
+            lines.append(f"# TYPE {prefix}{name} counter")
+            lines.append(f"{prefix}{name} {value}")
+        for name, value in sorted(gauges.items()):
+            lines.append(f"# TYPE {prefix}{name} gauge")
+            lines.append(f"{prefix}{name} {value!r}")
+        for name, histogram in sorted(histograms.items()):
+            lines.append(f"# TYPE {prefix}{name} histogram")
+            for bound, seen in histogram.buckets():
+                le = "+Inf" if bound == float("inf") else f"{bound:.6g}"
+                lines.append(f'{prefix}{name}_bucket{{le="{le}"}} {seen}')
+            lines.append(f"{prefix}{name}_sum {histogram.total()!r}")
+            lines.append(f"{prefix}{name}_count {histogram.count()}")
+        return "\n".join(lines) + "\n"
+
+    def _copies(self) -> tuple[dict[str, int], dict[str, float], dict[str, Histogram]]:
+        ''' private helper: the three registries copied under the lock, so an
+            export never iterates a dict another thread is adding names to
+        '''
+        with self._lock:
+            return dict(self._counters), dict(self._gauges), dict(self._histograms)
+
+###################
+def main() -> None:
+    from printTest import printTest
+    metrics = Metrics(enabled = True)
+    for seconds in (3e-6, 5e-6, 1e-3):
+        metrics.observe("demo_seconds", seconds)
+    metrics.inc("demo_total", 2)
+    printTest(Metrics.counter, metrics, "demo_total", expected=2, is_method=True)
+    printTest(Histogram.count, metrics.histogram("demo_seconds"), expected=3, is_method=True)
+    printTest(Histogram.quantile, metrics.histogram("demo_seconds"), 0.3, expected=4e-6, is_method=True)
+
+    # what an instrumented call costs with recording off and on
+    for enabled in (False, True):
+        metrics = Metrics(enabled)
+        n = 200_000
+        start = time.perf_counter()
+        for _ in range(n):
+            if metrics.enabled:
+                t0 = time.perf_counter()
+            if metrics.enabled:
+                metrics.observe("x_seconds", time.perf_counter() - t0)
+                metrics.inc("x_total")
+        print(f"enabled={enabled!s:5}: {1e9 * (time.perf_counter() - start) / n:.0f} ns per call")
+    print(metrics.toPrometheus()[:300])
+
+if __name__ == "__main__":
+    main()
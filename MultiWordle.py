@@ -0,0 +1,275 @@
+''' Multi-board Wordle (Dordle, Quordle, Octordle, ...): N solutions played
+    at once, every guess going to every board that is not solved yet.
+
+    Usage:
+        python MultiWordle.py [--boards 1 2 4 8 16] [--games N] [--word-len N]
+
+    The main program measures the cost of one guess as the number of boards
+    grows. A guess is scored against all unsolved boards in one batched
+    operation: a single gather from the feedback matrix, or one vectorized
+    scoreMany call when the word lists are too long for the matrix to be
+    worth building (more than MATRIX_BUDGET bytes).
+'''
+import argparse
+import os
+import random
+import tempfile
+import time
+import numpy as np
+from WordDictionary import*
+
+# largest feedback matrix (in bytes) worth building and mapping for a game;
+# past it every guess is scored directly
+MATRIX_BUDGET = 256 << 20
+
+###########################################################################
+def wordListFiles(word_len: int = 5) -> tuple[str, str]:
+    '''This function names the word lists for a word length: the usual
+    files for 5 letters, else wordle-answers-N.txt and
+    wordle-allowed-guesses-N.txt
+    parameters: word_len - letters per word
+    returns: (solutions file, allowed words file)'''
+    if word_len == 5:
+        names = ("wordle-answers.txt", "wordle-allowed-guesses.txt")
+    else:
+        names = (f"wordle-answers-{word_len}.txt", f"wordle-allowed-guesses-{word_len}.txt")
+    for name in names:
+        if not os.path.exists(name):
+            raise FileNotFoundError(f"no word list {name} for {word_len}-letter games")
+    return names
+
+def matrixBytes(dictionary: WordDictionary) -> int:
+    '''This function sizes the feedback matrix over a dictionary's word
+    lists without building it
+    parameters: dictionary - the word lists
+    returns: solutions x allowed words x bytes per pattern code'''
+    code_bytes = np.min_scalar_type(3 ** dictionary.solutions().wordLength() - 1).itemsize
+    return len(dictionary.solutions()) * len(dictionary.allowed()) * code_bytes
+
+###########################################################################
+class MultiWordle:
+    ''' Game engine for N simultaneous boards sharing one dictionary. Board
+        state is kept in arrays (solution rows, the guess on which each board
+        was solved, and one code per guess per board), so nothing is looped
+        over per board when a guess is scored.
+    '''
+    __slots__ = ("_dictionary", "_solutions", "_allowed", "_matrix", "_letters",
+                 "_boards", "_max_guesses", "_word_len", "_win_code",
+                 "_rows", "_solved_at", "_active", "_active_rows", "_guesses", "_codes")
+
+    def __init__(self, boards: int = 4, max_guesses: int | None = None, word_len: int = 5,
+                 solutions_fname: str | None = None, allowed_words_fname: str | None = None,
+                 matrix_budget: int = MATRIX_BUDGET) -> None:
+        ''' initializer for a multi-board game
+        Parameters:
+            boards: number of simultaneous solutions
+            max_guesses: guesses allowed (default: boards + 5, which gives the
+                usual 6 / 7 / 9 / 13 for 1 / 2 / 4 / 8 boards)
+            word_len: letters per word; picks the matching word lists
+            solutions_fname, allowed_words_fname: explicit word lists instead
+            matrix_budget: largest feedback matrix to use; past it guesses
+                are scored directly
+        '''
+        if boards < 1:
+            raise ValueError("need at least one board")
+        if solutions_fname is None or allowed_words_fname is None:
+            solutions_fname, allowed_words_fname = wordListFiles(word_len)
+        self._dictionary = loadDictionary(solutions_fname, allowed_words_fname)
+        self._solutions = self._dictionary.solutions()
+        self._allowed = self._dictionary.allowed()
+        self._word_len = self._solutions.wordLength()
+        if len(self._solutions) < boards:
+            raise ValueError(f"only {len(self._solutions)} solutions for {boards} boards")
+        # the memory-mapped matrix unless it would be too large to build and
+        # keep around (long lists of long words); then guesses are scored directly
+        # (a plain ndarray view: indexing an np.memmap costs more than the gather)
+        self._matrix = np.asarray(self._dictionary.feedback().matrix()) \
+            if matrixBytes(self._dictionary) <= matrix_budget else None
+        self._letters = self._solutions.letterArray() if self._matrix is None else None
+        self._boards = boards
+        self._max_guesses = max_guesses if max_guesses is not None else boards + 5
+        self._win_code = 3 ** self._word_len - 1
+        self.newGame()
+
+    def newGame(self, solutions: list[str] | None = None) -> None:
+        ''' starts a new game
+        Parameters:
+            solutions: one solution word per board (default: distinct random ones)
+        '''
+        if solutions is None:
+            rows = random.sample(range(len(self._solutions)), self._boards)
+        else:
+            if len(solutions) != self._boards:
+                raise ValueError(f"need {self._boards} solutions, got {len(solutions)}")
+            rows = [self._solutions.indexOf(word) for word in solutions]
+            if min(rows) < 0:
+                raise ValueError(f"not all of {solutions} are solution words")
+        self._rows = np.array(rows, dtype = np.int64)
+        self._solved_at = np.full(self._boards, -1, dtype = np.int16)
+        self._active = np.arange(self._boards)   # boards not solved yet
+        self._active_rows = self._rows.copy()    # and their solution rows
+        self._guesses: list[str] = []
+        # code of every guess on every board; -1 once the board was solved
+        # (int64: codes run up to 3**word_len, past int16 from 10 letters on)
+        self._codes = np.full((self._max_guesses, self._boards), -1, dtype = np.int64)
+
+    def guess(self, word: str) -> np.ndarray | None:
+        ''' plays a guess on every unsolved board
+        Returns:
+            the pattern code for each board (-1 for boards solved earlier),
+            or None if the word is not allowed
+        '''
+        if self.isOver():
+            raise ValueError("game is over")
+        col = self._allowed.indexOf(word)
+        if col < 0:
+            return None
+        turn = len(self._guesses)
+        active = self._active
+        if self._matrix is not None:
+            codes = self._matrix[self._active_rows, col]
+        else:
+            codes = scoreMany(word, self._letters[self._active_rows])
+        self._codes[turn, active] = codes
+        solved = codes == self._win_code
+        if solved.any():
+            self._solved_at[active[solved]] = turn
+            self._active = active[~solved]
+            self._active_rows = self._active_rows[~solved]
+        self._guesses.append(word)
+        return self._codes[turn].copy()
+
+    def boardCount(self) -> int:
+        ''' getter for the number of boards '''
+        return self._boards
+
+    def maxGuesses(self) -> int:
+        ''' getter for the number of guesses allowed '''
+        return self._max_guesses
+
+    def wordLength(self) -> int:
+        ''' getter for the letters per word '''
+        return self._word_len
+
+    def numGuesses(self) -> int:
+        ''' getter for the guesses made this game '''
+        return len(self._guesses)
+
+    def guesses(self) -> list[str]:
+        ''' getter for the guesses made this game, in order '''
+        return list(self._guesses)
+
+    def solvedCount(self) -> int:
+        ''' returns how many boards are solved '''
+        return self._boards - len(self._active)
+
+    def isSolved(self, board: int) -> bool:
+        ''' returns True once a board's solution has been guessed '''
+        return bool(self._solved_at[board] >= 0)
+
+    def won(self) -> bool:
+        ''' returns True once every board is solved '''
+        return len(self._active) == 0
+
+    def isOver(self) -> bool:
+        ''' returns True once every board is solved or the guesses ran out '''
+        return self.won() or len(self._guesses) >= self._max_guesses
+
+    def history(self, board: int) -> list[tuple[str, int]]:
+        ''' returns (guess, pattern code) for every guess a board received '''
+        return [(word, int(self._codes[turn, board])) for turn, word in enumerate(self._guesses)
+                if self._codes[turn, board] >= 0]
+
+    def solutions(self) -> list[str]:
+        ''' returns the solution of every board '''
+        return [self._solutions[int(row)] for row in self._rows]
+
+    def allowed(self) -> WordStore:
+        ''' getter for the allowed guesses '''
+        return self._allowed
+
+###########################################################################
+def benchmark(board_counts: list[int], games: int = 200, word_len: int = 5,
+              seed: int = 1) -> list[dict]:
+    ''' plays random games for each board count, timing only the guesses
+    Returns:
+        one dict per board count with boards, guesses, us_per_guess and
+        us_per_board_guess (the same guesses scored one board at a time,
+        for comparison)
+    '''
+    rng = random.Random(seed)
+    rows = []
+    for boards in board_counts:
+        engine = MultiWordle(boards, word_len = word_len)
+        words = list(engine.allowed())
+        dictionary = loadDictionary(*wordListFiles(word_len))
+        solutions = list(dictionary.solutions())
+        feedback = dictionary.feedback() if matrixBytes(dictionary) <= MATRIX_BUDGET else None
+        batched = 0.0
+        looped = 0.0
+        count = 0
+        for _ in range(games):
+            picked = rng.sample(solutions, boards)
+            engine.newGame(picked)
+            solution_rows = [feedback.solutionIndex(s) for s in picked] if feedback else []
+            while not engine.isOver():
+                word = rng.choice(words)
+                start = time.perf_counter()
+                engine.guess(word)
+                batched += time.perf_counter() - start
+                if feedback is not None:
+                    # baseline: one lookup per board
+                    start = time.perf_counter()
+                    for row in solution_rows:
+                        feedback.code(row, word)
+                    looped += time.perf_counter() - start
+                count += 1
+        rows.append({"boards": boards, "guesses": count,
+                     "us_per_guess": 1e6 * batched / count,
+                     "us_per_board_guess": 1e6 * looped / count})
+    return rows
+
+###################
+def main() -> None:
+    printTest(wordListFiles, 5, expected=("wordle-answers.txt", "wordle-allowed-guesses.txt"))
+    engine = MultiWordle(4)
+    engine.newGame(["crane", "slate", "abide", "speed"])
+    engine.guess("slate")
+    printTest(MultiWordle.solvedCount, engine, expected=1, is_method=True)
+    printTest(MultiWordle.history, engine, 3, expected=[("slate", 83)], is_method=True)
+    for word in ("crane", "abide", "speed"):
+        engine.guess(word)
+    printTest(MultiWordle.won, engine, expected=True, is_method=True)
+    printTest(MultiWordle.history, engine, 1, expected=[("slate", 242)], is_method=True)
+
+    # six letters: codes past 255, through the matrix and scored directly
+    with tempfile.TemporaryDirectory() as directory, scratchCache():
+        solutions_fname = os.path.join(directory, "answers-6.txt")
+        allowed_fname = os.path.join(directory, "allowed-6.txt")
+        words = ["banana", "bandit", "castle", "folder"]
+        with open(solutions_fname, "w") as f:
+            f.write("\n".join(words) + "\n")
+        with open(allowed_fname, "w") as f:
+            f.write("\n".join(words + ["barber"]) + "\n")
+        for budget in (MATRIX_BUDGET, 0):
+            engine = MultiWordle(4, solutions_fname = solutions_fname, allowed_words_fname = allowed_fname,
+                                 matrix_budget = budget)
+            engine.newGame(words)
+            engine.guess("barber")
+            printTest(MultiWordle.wordLength, engine, expected=6, is_method=True)
+            printTest(MultiWordle.history, engine, 0, expected=[("barber", 8)], is_method=True)
+            printTest(MultiWordle.history, engine, 2, expected=[("barber", 87)], is_method=True)
+            printTest(MultiWordle.history, engine, 3, expected=[("barber", 648)], is_method=True)
+
+    parser = argparse.ArgumentParser(description = "time multi-board guesses")
+    parser.add_argument("--boards", type = int, nargs = "+", default = [1, 2, 4, 8, 16, 32])
+    parser.add_argument("--games", type = int, default = 200)
+    parser.add_argument("--word-len", type = int, default = 5)
+    args = parser.parse_args()
+    print(f"{'boards':>6} {'guesses':>8} {'us/guess':>9} {'us (per-board loop)':>20}")
+    for row in benchmark(args.boards, args.games, args.word_len):
+        print(f"{row['boards']:6d} {row['guesses']:8d} {row['us_per_guess']:9.2f} "
+              f"{row['us_per_board_guess']:20.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+''' Compact multi-grid window for MultiWordle: one small grid per board, all
+    fed by the same typing. Each grid is an ordinary WordleController with
+    its own renderer and animation scheduler, so boards reveal in parallel;
+    every guess is scored once, for all boards, by the engine.
+
+    Usage:
+        python MultiWordleGUI.py [--boards N] [--word-len N] [--turbo]
+'''
+import argparse
+import math
+import tkinter as tk
+from PIL import Image, ImageTk
+from WordleGUI import*
+from MultiWordle import*
+
+###########################################################################
+class SmallLetterBox(LetterBox):
+    ''' LetterBox drawn with the scaled-down tile images of a MultiWordleGUI '''
+    __slots__ = ()
+
+    def __init__(self, window: tk.Misc) -> None:
+        super().__init__(window, image = MultiWordleGUI._photos["blank"], font = ('Arial', 12, 'bold'))
+
+    def _image(self, mark: Mark) -> ImageTk.PhotoImage:
+        return MultiWordleGUI._photos[{Mark.CORRECT:   "correct",
+                                       Mark.INCORRECT: "incorrect",
+                                       Mark.MISPLACED: "misplaced",
+                                       Mark.INVALID:   "invalid"}.get(mark, "blank")]
+
+class GridRenderer(TkRenderer):
+    ''' TkRenderer for one board of a multi-grid: no keyboard and no
+        per-board end message (the window shows one for the whole game)
+    '''
+    __slots__ = ()
+
+    def draw(self, change: Change) -> None:
+        if change.kind == "tile":
+            super().draw(change)
+
+    def showFinal(self) -> None:
+        pass
+
+    def hideFinal(self) -> None:
+        pass
+
+###########################################################################
+class MultiWordleGUI:
+    __slots__ = ("_engine", "_window", "_controllers", "_status", "_last_codes")
+
+    # scaled tile images, created once the root window exists
+    _photos: dict[str, ImageTk.PhotoImage] = {}
+
+    def __init__(self, engine: MultiWordle, tile_px: int = 28, columns: int | None = None,
+                 turbo: bool = False) -> None:
+        ''' initializer for the multi-grid window
+        Parameters:
+            engine:  the MultiWordle game to show and play
+            tile_px: size of one tile in pixels
+            columns: grids per row of the window (default: about square)
+            turbo:   if True, skip all animations
+        '''
+        self._engine = engine
+        self._window = tk.Tk()
+        self._window.configure(bg = "#ececec")
+        self._window.title(f"Wordle x{engine.boardCount()}")
+        menubar = tk.Menu(self._window)
+        file_menu = tk.Menu(menubar, tearoff = 0)
+        file_menu.add_command(label = "New Game", command = self._newGame)
+        file_menu.add_separator()
+        file_menu.add_command(label = "Quit", command = self._window.quit)
+        menubar.add_cascade(label = "File", menu = file_menu)
+        self._window.config(menu = menubar)
+
+        assets = TileAssets.shared()
+        for name in ("blank", "correct", "incorrect", "misplaced", "invalid"):
+            image = assets.image(name).resize((tile_px, tile_px), Image.LANCZOS)
+            MultiWordleGUI._photos[name] = ImageTk.PhotoImage(image, master = self._window)
+
+        boards = engine.boardCount()
+        columns = columns or math.ceil(math.sqrt(boards))
+        grids = tk.Frame(self._window, bg = "#ececec")
+        grids.pack(padx = 10, pady = 10)
+        self._controllers: list[WordleController] = []
+        for board in range(boards):
+            frame = tk.Frame(grids, bg = "#ececec")
+            frame.grid(row = board // columns, column = board % columns, padx = 6, pady = 6)
+            letters = []
+            for r in range(engine.maxGuesses()):
+                row = []
+                for c in range(engine.wordLength()):
+                    box = SmallLetterBox(frame)
+                    box.grid(row = r, column = c)
+                    row.append(box)
+                letters.append(row)
+            # one scheduler per board, so all boards animate at the same time
+            renderer = GridRenderer(letters, {}, None, FrameScheduler(self._window, turbo = turbo))
+            self._controllers.append(WordleController(
+                lambda word, board = board: self._result(board), lambda: None, renderer,
+                engine.maxGuesses(), engine.wordLength()))
+
+        self._status = tk.Label(self._window, bg = "#ececec", font = ('Arial', 14, 'bold'))
+        self._status.pack(pady = (0, 10))
+        self._last_codes = None
+        self._showStatus()
+
+        self._window.bind("<Key>", self._handleLetter)
+        self._window.bind("<Return>", self._handleReturn)
+
+    def start(self) -> None:
+        ''' method to make window start listening for keypress events '''
+        self._window.mainloop()
+
+    def _active(self) -> list[WordleController]:
+        ''' private helper: controllers of the boards still being played '''
+        return [c for c in self._controllers if c.gameState() == GameState.ACTIVE]
+
+    def _handleLetter(self, event: tk.Event) -> None:
+        ''' listener: type into (or backspace on) every unsolved board '''
+        for controller in self._active():
+            if event.keysym == "BackSpace":
+                controller.pressBackspace()
+            elif len(event.char) == 1 and 'A' <= event.char.upper() <= 'Z':
+                controller.pressLetter(event.char)
+
+    def _handleReturn(self, event: tk.Event | None = None) -> None:
+        ''' listener: score the typed word on all boards at once, then let
+            each unsolved board reveal its own result
+        '''
+        active = self._active()
+        if not active or self._engine.isOver():
+            return
+        # during an invalid-word rollback the new word is still queued behind
+        # it, so queue the scoring too and read the row once it has run
+        locked = [c for c in active if c.rowLocked()]
+        if locked:
+            locked[0].renderer().schedule(0, self._handleReturn)
+            return
+        word = active[0].board().word(active[0].currentRow())
+        if len(word) < self._engine.wordLength():
+            return
+        self._last_codes = self._engine.guess(word.lower())
+        for controller in active:
+            controller.pressReturn()
+        self._showStatus()
+
+    def _result(self, board: int) -> list[list[int]] | None:
+        ''' private helper: a board's share of the last batched guess, in the
+            form a WordleController handler returns
+        '''
+        if self._last_codes is None:
+            return None
+        return decodePattern(int(self._last_codes[board]), self._engine.wordLength())
+
+    def _showStatus(self) -> None:
+        ''' private helper: solved boards and guesses left, or the result '''
+        engine = self._engine
+        if engine.won():
+            text = f"Solved all {engine.boardCount()} in {engine.numGuesses()}!"
+        elif engine.isOver():
+            text = "Out of guesses: " + " ".join(word.upper() for word in engine.solutions())
+        else:
+            text = (f"{engine.solvedCount()}/{engine.boardCount()} solved, "
+                    f"{engine.maxGuesses() - engine.numGuesses()} guesses left")
+        self._status.config(text = text)
+
+    def _newGame(self) -> None:
+        ''' private helper method to reset to a new game '''
+        # fast-forward queued keys (and any guess queued behind a rollback)
+        # while they still belong to the old game
+        for controller in self._controllers:
+            controller.renderer().finish()
+        self._engine.newGame()
+        self._last_codes = None
+        for controller in self._controllers:
+            controller.newGame()
+        self._showStatus()
+
+###################
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "play several Wordle boards at once")
+    parser.add_argument("--boards", type = int, default = 4)
+    parser.add_argument("--word-len", type = int, default = 5)
+    parser.add_argument("--max-guesses", type = int, default = None)
+    parser.add_argument("--turbo", action = "store_true")
+    args = parser.parse_args()
+    engine = MultiWordle(args.boards, args.max_guesses, args.word_len)
+    MultiWordleGUI(engine, turbo = args.turbo).start()
+
+if __name__ == "__main__":
+    main()
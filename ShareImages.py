@@ -0,0 +1,385 @@
+''' Batch share-image generator: renders the result grid of every finished
+    game in a transcript file as an image, with no Tk window.
+
+    Usage:
+        python ShareImages.py TRANSCRIPTS OUT_DIR [--format png | pgm]
+                              [--workers N] [--chunk N] [--tile-dir DIR]
+        python ShareImages.py --demo N OUT_DIR ...
+        python ShareImages.py --test
+
+    A transcript has one game per line: the solution, then every guess in
+    order ("crane slate trace crane"); blank lines and "#" lines are
+    skipped, and so are games with guesses of another length than the
+    solution, non-letters or more guesses than --max-guesses (counted in
+    the report). Boards are as wide as their solution. --demo plays N random games instead of
+    reading a file.
+
+    Transcripts are read lazily and rendered in chunks across a process
+    pool. Boards are assembled from cached rows: a row depends only on its
+    feedback pattern, so the few hundred patterns that occur are drawn
+    once per worker and then only copied.
+'''
+import argparse
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator
+import numpy as np
+from PIL import Image
+from FeedbackMatrix import*
+from TileAssets import*
+from readPGM import*
+
+SOLUTIONS_FNAME = "wordle-answers.txt"
+ALLOWED_FNAME   = "wordle-allowed-guesses.txt"
+
+# feedback digit -> tile name; "blank" is used for rows never guessed
+_TILE_FOR_DIGIT = {INCORRECT: "incorrect", MISPLACED: "misplaced", CORRECT: "correct"}
+
+###########################################################################
+class ShareRenderer:
+    ''' Draws finished boards as pixel arrays from the tile bitmaps: the
+        game PNGs (via TileAssets) or, if tile_dir holds blank.pgm,
+        correct.pgm, misplaced.pgm and incorrect.pgm, those PGM tiles.
+        Rendered rows are cached by pattern code.
+    '''
+    __slots__ = ("_format", "_tiles", "_gap", "_max_guesses", "_word_len",
+                 "_palette", "_background", "_rows", "_blank_row", "_hits", "_misses")
+
+    def __init__(self, fmt: str = "png", tile_dir: str | None = None, tile_size: int | None = None,
+                 gap: int = 4, max_guesses: int = 6, word_len: int = 5) -> None:
+        ''' initializer for a ShareRenderer
+        Parameters:
+            fmt:         "png" (RGBA output) or "pgm" (grayscale output)
+            tile_dir:    directory of PGM tiles (default: the game's PNG tiles)
+            tile_size:   resize tiles to this many pixels square (default: as is)
+            gap:         background pixels between tiles
+            max_guesses: rows on every board
+            word_len:    tiles per row
+        '''
+        if fmt not in ("png", "pgm"):
+            raise ValueError(f"unknown image format {fmt!r}")
+        self._format = fmt
+        self._gap = gap
+        self._max_guesses = max_guesses
+        self._word_len = word_len
+        names = ["blank"] + list(_TILE_FOR_DIGIT.values())
+        if tile_dir is not None and os.path.exists(os.path.join(tile_dir, "blank.pgm")):
+            images = {name: Image.fromarray(np.asarray(loadPGM(os.path.join(tile_dir, f"{name}.pgm"),
+                                                               mmap = False), dtype = np.uint8))
+                      for name in names}
+        else:
+            assets = TileAssets.shared()
+            images = {name: assets.image(name) for name in names}
+        mode = "RGBA" if fmt == "png" else "L"
+        self._tiles: dict[str, np.ndarray] = {}
+        for name, image in images.items():
+            if tile_size is not None:
+                image = image.resize((tile_size, tile_size), Image.LANCZOS)
+            self._tiles[name] = np.asarray(image.convert(mode))
+        self._palette = None
+        # the window background color, so blank (white) tiles stand out
+        self._background = np.array([236, 236, 236, 255] if fmt == "png" else 236, dtype = np.uint8)
+        if fmt == "png":
+            # flat tiles use a handful of colors: draw and encode palette
+            # indices instead of RGBA, a quarter of the bytes to compress
+            pixels = np.concatenate([tile.reshape(-1, 4) for tile in self._tiles.values()]
+                                    + [self._background.reshape(1, 4)])
+            colors, inverse = np.unique(pixels, axis = 0, return_inverse = True)
+            if len(colors) <= 256:
+                inverse = inverse.reshape(-1).astype(np.uint8)
+                at = 0
+                for name, tile in self._tiles.items():
+                    size = tile.shape[0] * tile.shape[1]
+                    self._tiles[name] = inverse[at:at + size].reshape(tile.shape[:2])
+                    at += size
+                self._palette = colors
+                self._background = inverse[-1]
+        self._rows: dict[int, np.ndarray] = {}
+        self._blank_row = self._drawRow(["blank"] * word_len)
+        self._hits = 0
+        self._misses = 0
+
+    def render(self, codes: list[int]) -> np.ndarray:
+        ''' returns the pixels of a board with one row per pattern code
+            (rows past the last guess are blank)
+        '''
+        pieces = []
+        spacer = self._spacer(self._blank_row.shape[1])
+        for i in range(self._max_guesses):
+            if i < len(codes):
+                row = self._rows.get(codes[i])
+                if row is None:
+                    self._misses += 1
+                    row = self._drawRow(self._tileNames(codes[i]))
+                    self._rows[codes[i]] = row
+                else:
+                    self._hits += 1
+            else:
+                row = self._blank_row
+            if i > 0:
+                pieces.append(spacer)
+            pieces.append(row)
+        return np.concatenate(pieces, axis = 0)
+
+    def save(self, codes: list[int], path: str) -> int:
+        ''' renders a board and writes it to path
+        Returns:
+            the number of bytes written
+        '''
+        pixels = self.render(codes)
+        if self._format == "pgm":
+            savePGM(path, pixels, 255)
+        elif self._palette is not None:
+            image = Image.fromarray(pixels, "P")
+            image.putpalette(self._palette.reshape(-1).tobytes(), "RGBA")
+            image.save(path, compress_level = 1)
+        else:
+            Image.fromarray(pixels, "RGBA").save(path, compress_level = 1)
+        return os.path.getsize(path)
+
+    def extension(self) -> str:
+        ''' returns the file extension of the output format '''
+        return self._format
+
+    def cacheStats(self) -> dict[str, int]:
+        ''' returns row cache hits, misses and cached rows '''
+        return {"row_hits": self._hits, "row_misses": self._misses, "rows_cached": len(self._rows)}
+
+    def _tileNames(self, code: int) -> list[str]:
+        ''' private helper: tile name of every position of a pattern code '''
+        names = []
+        for _ in range(self._word_len):
+            names.append(_TILE_FOR_DIGIT[code % 3])
+            code //= 3
+        return names
+
+    def _drawRow(self, names: list[str]) -> np.ndarray:
+        ''' private helper: tiles side by side with gaps between them '''
+        tiles = [self._tiles[name] for name in names]
+        gap = self._spacer(self._gap, tiles[0].shape[0])
+        pieces = []
+        for i, tile in enumerate(tiles):
+            if i > 0:
+                pieces.append(gap)
+            pieces.append(tile)
+        row = np.concatenate(pieces, axis = 1)
+        row.flags.writeable = False
+        return row
+
+    def _spacer(self, width: int, height: int | None = None) -> np.ndarray:
+        ''' private helper: background, gap tall (between rows) or
+            tile tall and gap wide (between tiles)
+        '''
+        shape = (self._gap, width) if height is None else (height, width)
+        return np.full(shape + self._background.shape, self._background, dtype = np.uint8)
+
+###########################################################################
+def readTranscripts(filename: str) -> Iterator[tuple[str, list[str]]]:
+    ''' lazily yields (solution, guesses) for every game in a transcript file '''
+    with open(filename) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            words = line.replace(",", " ").lower().split()
+            yield words[0], words[1:]
+
+def isValidGame(solution: str, guesses: list[str]) -> bool:
+    ''' checks that every word of a game is lowercase a-z and as long as the
+        solution, so it can be scored
+    '''
+    return all(len(word) == len(solution) and word.isascii() and word.isalpha()
+               and word.islower() for word in [solution, *guesses])
+
+def demoTranscripts(count: int, max_guesses: int = 6, seed: int = 1) -> Iterator[tuple[str, list[str]]]:
+    ''' yields count random games: random guesses until the solution is hit
+        (with some chance each turn) or the guesses run out
+    '''
+    with open(SOLUTIONS_FNAME) as f:
+        solutions = f.read().split()
+    with open(ALLOWED_FNAME) as f:
+        allowed = f.read().split()
+    rng = random.Random(seed)
+    for _ in range(count):
+        solution = rng.choice(solutions)
+        guesses = []
+        while len(guesses) < max_guesses:
+            if len(guesses) > 0 and rng.random() < 0.3:
+                guesses.append(solution)
+                break
+            guesses.append(rng.choice(allowed))
+        yield solution, guesses
+
+###########################################################################
+# per-process renderers by word length, created on demand from the
+# settings _initWorker stores
+_worker_settings: tuple[str, str | None, int | None, int] | None = None
+_worker_renderers: dict[int, ShareRenderer] = {}
+
+def _initWorker(fmt: str, tile_dir: str | None, tile_size: int | None, max_guesses: int) -> None:
+    ''' process pool initializer: keeps the renderer settings; each worker
+        then builds one renderer (and row cache) per word length it sees
+    '''
+    global _worker_settings
+    _worker_settings = (fmt, tile_dir, tile_size, max_guesses)
+    _worker_renderers.clear()
+
+def _workerRenderer(word_len: int) -> ShareRenderer:
+    ''' private helper: this worker's renderer for boards word_len tiles wide '''
+    renderer = _worker_renderers.get(word_len)
+    if renderer is None:
+        fmt, tile_dir, tile_size, max_guesses = _worker_settings
+        renderer = ShareRenderer(fmt, tile_dir, tile_size, max_guesses = max_guesses,
+                                 word_len = word_len)
+        _worker_renderers[word_len] = renderer
+    return renderer
+
+def _renderChunk(args: tuple[str, list[tuple[int, str, list[str]]]]) -> tuple[int, int, int, dict]:
+    ''' process pool task: renders and writes every game in a chunk
+    Returns:
+        images written, bytes written, the worker's pid and its (running)
+        row cache stats
+    '''
+    out_dir, games = args
+    written = 0
+    size = 0
+    for index, solution, guesses in games:
+        renderer = _workerRenderer(len(solution))
+        codes = [patternCode(guess, solution) for guess in guesses]
+        size += renderer.save(codes, os.path.join(out_dir, f"game-{index:08d}.{renderer.extension()}"))
+        written += 1
+    stats = {"row_hits": 0, "row_misses": 0, "rows_cached": 0}
+    for renderer in _worker_renderers.values():
+        for key, value in renderer.cacheStats().items():
+            stats[key] += value
+    return written, size, os.getpid(), stats
+
+def renderAll(transcripts: Iterable[tuple[str, list[str]]], out_dir: str, fmt: str = "png",
+              workers: int | None = None, chunk: int = 256, tile_dir: str | None = None,
+              tile_size: int | None = None, max_guesses: int = 6) -> dict:
+    ''' renders every game across a process pool, reading transcripts only
+        as fast as the workers keep up
+    Returns:
+        dict with images, bytes, skipped (games that fail isValidGame or
+        have more than max_guesses guesses), seconds, images_per_sec and
+        row cache stats
+    '''
+    os.makedirs(out_dir, exist_ok = True)
+    workers = workers or os.cpu_count() or 1
+    totals = {"images": 0, "bytes": 0, "skipped": 0}
+    cache: dict[int, dict] = {}   # latest row cache stats of each worker pid
+    start = time.perf_counter()
+
+    def chunks() -> Iterator[list[tuple[int, str, list[str]]]]:
+        batch = []
+        for index, (solution, guesses) in enumerate(transcripts):
+            # one bad line must not take the whole batch down in a worker
+            # so must a game with more guesses than the board has rows
+            if not isValidGame(solution, guesses) or len(guesses) > max_guesses:
+                totals["skipped"] += 1
+                continue
+            batch.append((index, solution, guesses))
+            if len(batch) == chunk:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    with ProcessPoolExecutor(workers, initializer = _initWorker,
+                             initargs = (fmt, tile_dir, tile_size, max_guesses)) as pool:
+        pending = set()
+        for batch in chunks():
+            # keep a couple of chunks per worker in flight, no more
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when = FIRST_COMPLETED)
+                for future in done:
+                    _collect(future.result(), totals, cache)
+            pending.add(pool.submit(_renderChunk, (out_dir, batch)))
+        for future in pending:
+            _collect(future.result(), totals, cache)
+    seconds = time.perf_counter() - start
+
+    return {"images": totals["images"], "bytes": totals["bytes"], "skipped": totals["skipped"],
+            "seconds": seconds,
+            "images_per_sec": totals["images"] / seconds if seconds > 0 else 0.0,
+            "row_hits": sum(stats["row_hits"] for stats in cache.values()),
+            "row_misses": sum(stats["row_misses"] for stats in cache.values())}
+
+def _collect(result: tuple[int, int, int, dict], totals: dict[str, int],
+             cache: dict[int, dict]) -> None:
+    ''' private helper: add one finished chunk to the running totals '''
+    images, size, pid, stats = result
+    totals["images"] += images
+    totals["bytes"] += size
+    # a worker's stats are running totals, so its latest report replaces the last
+    cache[pid] = stats
+
+###################
+def _checkRender(games: list[tuple[str, list[str]]], max_guesses: int) -> tuple[int, int, list[int]]:
+    ''' private test helper: renders games as PGM into a temporary directory
+    Returns:
+        images written, games skipped and the pixel width of every image
+    '''
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        report = renderAll(games, folder, "pgm", workers = 1, max_guesses = max_guesses)
+        widths = [np.asarray(loadPGM(os.path.join(folder, name), mmap = False)).shape[1]
+                  for name in sorted(os.listdir(folder))]
+    return report["images"], report["skipped"], widths
+
+def _testRender() -> None:
+    ''' checks that boards are as wide as their solution and that games
+        with too many guesses are skipped rather than cut short
+    '''
+    from printTest import printTest
+    six = ShareRenderer("pgm", word_len = 6)
+    five = ShareRenderer("pgm", word_len = 5)
+    games = [("planet", ["castle", "planes", "planet"]),
+             ("crane", ["slate", "crane"]),
+             ("crane", ["slate", "trace", "crate", "grace"])]
+    printTest(_checkRender, games, 3,
+              expected = (2, 1, [six.render([0]).shape[1], five.render([0]).shape[1]]))
+    # the last tile of a 6-letter row is drawn from the sixth digit
+    printTest(ShareRenderer._tileNames, six, patternCode("castle", "planet"),
+              expected = ["incorrect", "misplaced", "incorrect", "misplaced", "misplaced", "misplaced"],
+              is_method = True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "render share images for finished games")
+    parser.add_argument("transcripts", nargs = "?", help = "transcript file (omit with --demo)")
+    parser.add_argument("out_dir", nargs = "?")
+    parser.add_argument("--test", action = "store_true", help = "run the self-checks and exit")
+    parser.add_argument("--demo", type = int, default = None, help = "render N random games instead")
+    parser.add_argument("--format", choices = ("png", "pgm"), default = "png")
+    parser.add_argument("--workers", type = int, default = None)
+    parser.add_argument("--chunk", type = int, default = 256)
+    parser.add_argument("--tile-dir", default = None, help = "directory with PGM tiles")
+    parser.add_argument("--tile-size", type = int, default = None)
+    parser.add_argument("--max-guesses", type = int, default = 6)
+    args = parser.parse_args()
+    if args.test:
+        _testRender()
+        return
+    if args.demo is not None and args.out_dir is None:
+        # with --demo the only positional is the output directory
+        args.transcripts, args.out_dir = None, args.transcripts
+    if args.out_dir is None:
+        parser.error("give an output directory")
+
+    if args.demo is not None:
+        transcripts = demoTranscripts(args.demo, args.max_guesses)
+    elif args.transcripts is not None:
+        transcripts = readTranscripts(args.transcripts)
+    else:
+        parser.error("give a transcript file or --demo N")
+    report = renderAll(transcripts, args.out_dir, args.format, args.workers, args.chunk,
+                       args.tile_dir, args.tile_size, args.max_guesses)
+    print(f"images       : {report['images']} ({report['bytes'] / 1e6:.1f} MB)")
+    print(f"skipped      : {report['skipped']} invalid games")
+    print(f"time         : {report['seconds']:.2f} s ({report['images_per_sec']:.0f} images/sec)")
+    print(f"row cache    : {report['row_hits']} hits, {report['row_misses']} misses")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+import argparse
+import bisect
+import os
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from WordDictionary import*
+from WordleSolver import*
+
+###########################################################################
+# Class:  StrategyTree
+#
+# The whole solver strategy, precomputed: the opener, then for every
+# feedback pattern the next guess, and so on until every solution is
+# reached. Each node holds the solver's choice for the candidates still
+# possible there, so following the tree plays exactly the games the solver
+# would, but a hint is a lookup instead of an entropy search.
+#
+# Stored flat (CSR style) in the cache directory, keyed by the feedback
+# matrix hash:
+#     guesses[node]            allowed-word column guessed at the node (16-bit,
+#                              or 32-bit for lists of more than 65,536 words)
+#     edge_start[node .. +1]   the node's slice of the edge arrays
+#     edge_pattern[edge]       feedback code of the edge (sorted per node; as
+#                              wide as the feedback matrix's codes)
+#     edge_child[edge]         node reached on that feedback
+# A won game (all-green code) has no edge. Build it offline with
+#     python StrategyTree.py --build [--workers N]
+###########################################################################
+
+_TREE_MAGIC   = b"WSTR"
+_TREE_VERSION = 3
+# magic, version, word length, guess bytes, code bytes, nodes, edges,
+# feedback matrix digest
+_TREE_HEADER  = struct.Struct("<4sHHHHII32s")
+
+def _guessType(words: int) -> np.dtype:
+    ''' returns the narrowest type holding a column of a list of words '''
+    return np.dtype(np.uint16) if words <= 1 << 16 else np.dtype(np.uint32)
+
+class StrategyTree:
+    __slots__ = ("_guesses", "_edge_start", "_edge_pattern", "_edge_child",
+                 "_words", "_digest", "_win_code")
+
+    def __init__(self, guesses: np.ndarray, edge_start: np.ndarray, edge_pattern: np.ndarray,
+                 edge_child: np.ndarray, words: WordStore, digest: str) -> None:
+        ''' initializer from the flat arrays (see build and load)
+        Parameters:
+            guesses, edge_start, edge_pattern, edge_child: the tree arrays
+            words:  the allowed guesses the columns refer to
+            digest: hash of the feedback matrix the tree was built from
+        '''
+        guesses = np.asarray(guesses)
+        assert len(words) <= 1 << 32, f"{len(words)} words do not fit 32-bit tree columns"
+        assert guesses.size == 0 or int(guesses.max()) < len(words), \
+            "tree guesses must be columns of the allowed words"
+        # walked from Python one step at a time, so keep plain memoryviews:
+        # indexing those is far cheaper than indexing numpy arrays
+        guesses = np.ascontiguousarray(guesses, dtype = _guessType(len(words)))
+        self._guesses = memoryview(guesses).cast("B").cast(guesses.dtype.char)
+        self._edge_start = memoryview(np.ascontiguousarray(edge_start, dtype = np.uint32)).cast("B").cast("I")
+        edge_pattern = np.ascontiguousarray(edge_pattern)
+        self._edge_pattern = memoryview(edge_pattern).cast("B").cast(edge_pattern.dtype.char)
+        self._edge_child = memoryview(np.ascontiguousarray(edge_child, dtype = np.uint32)).cast("B").cast("I")
+        self._words = words
+        self._digest = digest
+        self._win_code = 3 ** words.wordLength() - 1
+
+    @staticmethod
+    def path(feedback: FeedbackMatrix) -> str:
+        ''' returns the cache file for the tree over a feedback matrix '''
+        return cachePath(f"strategy-v{_TREE_VERSION}-{feedback.digest()[:16]}.bin")
+
+    @classmethod
+    def cached(cls, feedback: FeedbackMatrix) -> 'StrategyTree | None':
+        ''' loads the tree built for a feedback matrix, or returns None if
+            it has not been built (building is an offline job)
+        '''
+        return cls.load(cls.path(feedback), feedback)
+
+    @classmethod
+    def load(cls, path: str, feedback: FeedbackMatrix) -> 'StrategyTree | None':
+        ''' reads a tree file, or returns None if it is missing or was built
+            from other word lists
+        '''
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _TREE_HEADER.size:
+            return None
+        magic, version, word_len, guess_width, width, nodes, edges, digest = _TREE_HEADER.unpack_from(data)
+        if magic != _TREE_MAGIC or version != _TREE_VERSION or guess_width not in (2, 4) \
+                or width not in (1, 2, 4) or digest != bytes.fromhex(feedback.digest()) \
+                or len(data) != _TREE_HEADER.size + guess_width * nodes + 4 * (nodes + 1) \
+                                + (width + 4) * edges:
+            return None
+        offset = _TREE_HEADER.size
+        arrays = []
+        for dtype, count in ((np.dtype(f"<u{guess_width}"), nodes), (np.uint32, nodes + 1),
+                             (np.dtype(f"<u{width}"), edges), (np.uint32, edges)):
+            arrays.append(np.frombuffer(data, dtype = dtype, count = count, offset = offset))
+            offset += arrays[-1].nbytes
+        return cls(*arrays, feedback.guessWords(), feedback.digest())
+
+    def save(self, path: str) -> None:
+        ''' writes the tree file atomically '''
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_TREE_HEADER.pack(_TREE_MAGIC, _TREE_VERSION, self._words.wordLength(),
+                                      self._guesses.itemsize, self._edge_pattern.itemsize,
+                                      len(self._guesses), len(self._edge_pattern),
+                                      bytes.fromhex(self._digest)))
+            for part in (self._guesses, self._edge_start, self._edge_pattern, self._edge_child):
+                f.write(part.tobytes())
+        os.replace(tmp_path, path)
+
+    def root(self) -> int:
+        ''' getter for the root node (the opener) '''
+        return 0
+
+    def guess(self, node: int) -> str:
+        ''' returns the word to play at a node '''
+        return self._words[self._guesses[node]]
+
+    def child(self, node: int, code: int) -> int:
+        ''' returns the node reached from a node on a feedback code, or -1
+            if that feedback cannot happen (or the game was won)
+        '''
+        lo = self._edge_start[node]
+        hi = self._edge_start[node + 1]
+        i = bisect.bisect_left(self._edge_pattern, code, lo, hi)
+        if i < hi and self._edge_pattern[i] == code:
+            return self._edge_child[i]
+        return -1
+
+    def nodeCount(self) -> int:
+        ''' getter for the number of nodes '''
+        return len(self._guesses)
+
+    def sizeBytes(self) -> int:
+        ''' returns the size of the tree file '''
+        return _TREE_HEADER.size + self._guesses.itemsize * len(self._guesses) + 4 * len(self._edge_start) \
+            + (self._edge_pattern.itemsize + 4) * len(self._edge_pattern)
+
+    def play(self, feedback: FeedbackMatrix, solution_row: int) -> list[str]:
+        ''' follows the tree against a solution
+        Returns:
+            the guesses played, ending with the solution
+        '''
+        node = 0
+        played = []
+        while node >= 0:
+            word = self.guess(node)
+            played.append(word)
+            code = feedback.code(solution_row, word)
+            if code == self._win_code:
+                break
+            node = self.child(node, code)
+        return played
+
+###########################################################################
+# worker state, created once per process by _initWorker
+_worker_feedback: FeedbackMatrix | None = None
+_worker_solver: WordleSolver | None = None
+
+def _initWorker(solutions_fname: str, allowed_words_fname: str) -> None:
+    ''' process pool initializer: the mapped matrix and a solver per worker '''
+    global _worker_feedback, _worker_solver
+    _worker_feedback = loadDictionary(solutions_fname, allowed_words_fname).feedback()
+    _worker_solver = WordleSolver(_worker_feedback, workers = 1)
+
+def _subtree(feedback: FeedbackMatrix, solver: WordleSolver, candidates: np.ndarray,
+             nodes: list[tuple[int, list[tuple[int, int]]]]) -> int:
+    ''' appends the subtree for a set of candidate rows to nodes (preorder,
+        child indices local to the list)
+    Returns:
+        the index of the subtree's root in nodes
+    '''
+    col = feedback.guessIndex(solver.bestGuess(candidates))
+    index = len(nodes)
+    edges: list[tuple[int, int]] = []
+    nodes.append((col, edges))
+    codes = np.asarray(feedback.matrix()[candidates, col])
+    win_code = 3 ** feedback.solutionWords().wordLength() - 1
+    # group the candidates by the feedback this guess would get
+    order = np.argsort(codes, kind = "stable")
+    patterns, starts = np.unique(codes[order], return_index = True)
+    ends = list(starts[1:]) + [len(order)]
+    for pattern, lo, hi in zip(patterns.tolist(), starts.tolist(), ends):
+        if pattern != win_code:
+            edges.append((pattern, _subtree(feedback, solver, candidates[order[lo:hi]], nodes)))
+    return index
+
+def _subtreeTask(candidates: np.ndarray) -> list[tuple[int, list[tuple[int, int]]]]:
+    ''' process pool task: the whole subtree below one opener feedback '''
+    nodes: list[tuple[int, list[tuple[int, int]]]] = []
+    _subtree(_worker_feedback, _worker_solver, candidates, nodes)
+    return nodes
+
+def buildTree(solutions_fname: str, allowed_words_fname: str,
+              workers: int | None = None) -> StrategyTree:
+    ''' builds the full tree: the opener in this process, then the subtree
+        below every opener feedback on a process pool (largest first, so
+        the slowest subtrees start early)
+    '''
+    feedback = loadDictionary(solutions_fname, allowed_words_fname).feedback()
+    solver = WordleSolver(feedback)
+    candidates = solver.allCandidates()
+    col = feedback.guessIndex(solver.bestGuess(candidates))
+    codes = np.asarray(feedback.matrix()[:, col])
+    win_code = 3 ** feedback.solutionWords().wordLength() - 1
+    parts = [(int(pattern), candidates[codes == pattern]) for pattern in np.unique(codes)
+             if pattern != win_code]
+    parts.sort(key = lambda part: -len(part[1]))
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        _initWorker(solutions_fname, allowed_words_fname)
+        subtrees = [_subtreeTask(rows) for _, rows in parts]
+    else:
+        with ProcessPoolExecutor(workers, initializer = _initWorker,
+                                 initargs = (solutions_fname, allowed_words_fname)) as pool:
+            subtrees = list(pool.map(_subtreeTask, [rows for _, rows in parts]))
+
+    # concatenate the subtrees after the root, shifting their local indices
+    guesses = [col]
+    edges: list[list[tuple[int, int]]] = [[]]
+    for (pattern, _), nodes in sorted(zip(parts, subtrees), key = lambda item: item[0][0]):
+        base = len(guesses)
+        edges[0].append((pattern, base))
+        for guess, children in nodes:
+            guesses.append(guess)
+            edges.append([(code, base + child) for code, child in children])
+    edge_start = np.zeros(len(guesses) + 1, dtype = np.uint32)
+    edge_start[1:] = np.cumsum([len(e) for e in edges])
+    flat = [edge for node_edges in edges for edge in node_edges]
+    return StrategyTree(np.array(guesses, dtype = np.uint32), edge_start,
+                        np.array([code for code, _ in flat], dtype = feedback.matrix().dtype),
+                        np.array([child for _, child in flat], dtype = np.uint32),
+                        feedback.guessWords(), feedback.digest())
+
+def treeReport(tree: StrategyTree, feedback: FeedbackMatrix) -> dict:
+    ''' plays every solution through the tree
+    Returns:
+        dict with nodes, bytes, depth (most guesses needed), mean_guesses,
+        histogram (guesses -> solutions) and us_per_hint (one tree step)
+    '''
+    solutions = feedback.solutionWords()
+    counts = [len(tree.play(feedback, row)) for row in range(len(solutions))]
+    histogram: dict[int, int] = {}
+    for n in counts:
+        histogram[n] = histogram.get(n, 0) + 1
+    # time the hint path alone: the guess at a node plus the step to its child
+    steps = 0
+    start = time.perf_counter()
+    for row in range(len(solutions)):
+        node = tree.root()
+        while node >= 0:
+            word = tree.guess(node)
+            steps += 1
+            node = tree.child(node, feedback.code(row, word))
+    seconds = time.perf_counter() - start
+    return {"nodes": tree.nodeCount(), "bytes": tree.sizeBytes(), "depth": max(counts),
+            "mean_guesses": sum(counts) / len(counts), "histogram": dict(sorted(histogram.items())),
+            "us_per_hint": 1e6 * seconds / steps}
+
+###################
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "build or inspect the precomputed solver tree")
+    parser.add_argument("--build", action = "store_true", help = "(re)build the tree")
+    parser.add_argument("--workers", type = int, default = None)
+    args = parser.parse_args()
+
+    feedback = loadDictionary("wordle-answers.txt", "wordle-allowed-guesses.txt").feedback()
+    tree = None if args.build else StrategyTree.cached(feedback)
+    if tree is None:
+        start = time.perf_counter()
+        tree = buildTree("wordle-answers.txt", "wordle-allowed-guesses.txt", args.workers)
+        tree.save(StrategyTree.path(feedback))
+        print(f"build time   : {time.perf_counter() - start:.1f} s")
+    printTest(StrategyTree.guess, tree, 0, expected=WordleSolver(feedback).bestGuess(
+        np.arange(len(feedback.solutionWords()))), is_method=True)
+    # a won game has no edge to follow
+    printTest(StrategyTree.child, tree, 0, tree._win_code, expected=-1, is_method=True)
+
+    # six-letter codes go past 255, so the edges need the matrix's wider codes
+    with tempfile.TemporaryDirectory() as directory, scratchCache():
+        words_fname = os.path.join(directory, "words-6.txt")
+        with open(words_fname, "w") as f:
+            f.write("banner\nbutter\ncorner\ndinner\nfolder\nmatter\n")
+        sixes = loadDictionary(words_fname, words_fname).feedback()
+        buildTree(words_fname, words_fname, workers = 1).save(os.path.join(directory, "tree.bin"))
+        small = StrategyTree.load(os.path.join(directory, "tree.bin"), sixes)
+    printTest(StrategyTree.guess, small, 0, expected="banner", is_method=True)
+    printTest(StrategyTree.guess, small, small.child(0, patternCode("banner", "corner")),
+              expected="corner", is_method=True)
+
+    # past 65,536 allowed words the guess columns need 32 bits
+    import itertools
+    many = WordStore(["".join(letters) for letters in
+                      itertools.islice(itertools.product("abcdefghijklmnopqrstuvwxyz", repeat = 4), 70_000)], 4)
+    with tempfile.TemporaryDirectory() as directory, scratchCache():
+        wide = FeedbackMatrix(WordStore([many[69_999]], 4), many)
+        StrategyTree(np.array([69_999]), np.zeros(2, dtype = np.uint32), np.zeros(0, dtype = np.uint8),
+                     np.zeros(0, dtype = np.uint32), many, wide.digest()).save(os.path.join(directory, "wide.bin"))
+        wide_tree = StrategyTree.load(os.path.join(directory, "wide.bin"), wide)
+    printTest(StrategyTree.guess, wide_tree, 0, expected=many[69_999], is_method=True)
+
+    report = treeReport(tree, feedback)
+    print(f"nodes        : {report['nodes']} ({report['bytes']:,} bytes)")
+    print(f"depth        : {report['depth']}")
+    print(f"mean guesses : {report['mean_guesses']:.4f}")
+    print(f"hint cost    : {report['us_per_hint']:.2f} us per step")
+    for guesses, count in report["histogram"].items():
+        print(f"  {guesses}: {count:5d}")
+
+if __name__ == "__main__":
+    main()
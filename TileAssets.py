@@ -0,0 +1,203 @@
+import os
+import struct
+import time
+from PIL import Image, ImageTk
+from utils import*
+from printTest import*
+
+###########################################################################
+# Class:  TileAssets
+#
+# All tile and key images packed into one sprite atlas. The atlas is built
+# once from the individual PNGs and kept in the cache directory as raw
+# RGBA pixels, so later starts skip PNG decoding entirely (the cache is
+# keyed by a hash of the source PNG files). PhotoImage handles are created
+# once per Tk root and shared by every LetterBox, KeyBox and new game.
+###########################################################################
+
+TILE_NAMES = ("blank", "correct", "incorrect", "misplaced", "invalid",
+              "key_available", "key_correct", "key_incorrect", "key_misplaced",
+              "final")
+
+_ATLAS_MAGIC   = b"WTAT"
+_ATLAS_VERSION = 1
+_ATLAS_HEADER  = struct.Struct("<4sHHII")   # magic, version, tile count, width, height
+_ATLAS_ENTRY   = struct.Struct("<16sIIII")  # name, x, y, width, height
+
+def _sourceDir() -> str:
+    ''' the directory holding the tile PNGs: images/ if present, else the
+        directory of this module
+    '''
+    here = os.path.dirname(os.path.abspath(__file__))
+    for candidate in ("images", os.path.join(here, "images"), here):
+        if os.path.exists(os.path.join(candidate, "blank.png")):
+            return candidate
+    return here
+
+class TileAssets:
+    ''' Decoded images of every tile state, loaded from the cached sprite
+        atlas (or built from the PNGs), with one shared PhotoImage per state
+        and Tk root.
+    '''
+    __slots__ = ("_source_dir", "_tiles", "_photos", "_timings")
+
+    _shared: 'TileAssets | None' = None
+
+    @classmethod
+    def shared(cls) -> 'TileAssets':
+        ''' returns the process-wide asset cache, loading it on first use '''
+        if cls._shared is None:
+            cls._shared = TileAssets()
+        return cls._shared
+
+    def __init__(self, source_dir: str | None = None, use_cache: bool = True) -> None:
+        ''' initializer: loads the atlas from the raw-pixel cache, or builds it
+            from the PNGs (and writes the cache) when there is none
+        Parameters:
+            source_dir: directory with the tile PNGs (default: images/ or here)
+            use_cache:  if False, always decode the PNGs and write no cache file
+        '''
+        self._source_dir = source_dir or _sourceDir()
+        self._photos: dict[tuple[int, str], ImageTk.PhotoImage] = {}
+        self._timings: dict[str, float] = {}
+        start = time.perf_counter()
+        sources = [os.path.join(self._source_dir, f"{name}.png") for name in TILE_NAMES]
+        parts = []
+        for path in sources:
+            with open(path, "rb") as f:
+                parts.append(f.read())
+        cache_path = cachePath(f"tiles-v{_ATLAS_VERSION}-{contentHash(*parts)[:16]}.rgba")
+        self._timings["hash_ms"] = 1000 * (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        loaded = self._readCache(cache_path) if use_cache else None
+        if loaded is None:
+            atlas, boxes = self._buildAtlas(sources)
+            self._timings["decode_ms"] = 1000 * (time.perf_counter() - start)
+            if use_cache:
+                self._writeCache(cache_path, atlas, boxes)
+        else:
+            atlas, boxes = loaded
+            self._timings["cache_ms"] = 1000 * (time.perf_counter() - start)
+        # only the per-state tiles are kept; the atlas itself is dropped
+        self._tiles = {name: atlas.crop(box) for name, box in boxes.items()}
+
+    def image(self, name: str) -> Image.Image:
+        ''' returns the decoded PIL image for a tile state '''
+        return self._tiles[name]
+
+    def photo(self, name: str, master: 'tk.Misc') -> ImageTk.PhotoImage:
+        ''' returns the shared PhotoImage for a tile state on a given Tk root,
+            creating it the first time it is asked for
+        '''
+        # each PhotoImage keeps its Tcl interpreter alive, so the id is unique
+        key = (id(master.tk), name)
+        photo = self._photos.get(key)
+        if photo is None:
+            photo = ImageTk.PhotoImage(self._tiles[name], master = master)
+            self._photos[key] = photo
+        return photo
+
+    def memoryBytes(self) -> int:
+        ''' returns the bytes of decoded pixels held by the tiles '''
+        return sum(tile.width * tile.height * 4 for tile in self._tiles.values())
+
+    def timings(self) -> dict[str, float]:
+        ''' returns load timings in milliseconds: hash_ms (reading the PNG
+            files to key the cache), then either cache_ms (raw pixels loaded)
+            or decode_ms (PNGs decoded and packed into the atlas)
+        '''
+        return dict(self._timings)
+
+    @staticmethod
+    def _buildAtlas(sources: list[str]) -> tuple[Image.Image, dict[str, tuple]]:
+        ''' private helper: decode every PNG and paste it into one strip '''
+        images = [Image.open(path).convert("RGBA") for path in sources]
+        width = sum(image.width for image in images)
+        height = max(image.height for image in images)
+        atlas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        boxes = {}
+        x = 0
+        for name, image in zip(TILE_NAMES, images):
+            atlas.paste(image, (x, 0))
+            boxes[name] = (x, 0, x + image.width, image.height)
+            x += image.width
+        return atlas, boxes
+
+    @staticmethod
+    def _writeCache(path: str, atlas: Image.Image, boxes: dict[str, tuple]) -> None:
+        ''' private helper: store the atlas as raw RGBA pixels plus its box table '''
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_ATLAS_HEADER.pack(_ATLAS_MAGIC, _ATLAS_VERSION, len(boxes),
+                                       atlas.width, atlas.height))
+            for name, (x0, y0, x1, y1) in boxes.items():
+                f.write(_ATLAS_ENTRY.pack(name.encode(), x0, y0, x1 - x0, y1 - y0))
+            f.write(atlas.tobytes())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _readCache(path: str) -> tuple[Image.Image, dict[str, tuple]] | None:
+        ''' private helper: load the raw-pixel atlas, if the cache is valid '''
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _ATLAS_HEADER.size:
+            return None
+        magic, version, count, width, height = _ATLAS_HEADER.unpack_from(data)
+        pixels_at = _ATLAS_HEADER.size + count * _ATLAS_ENTRY.size
+        if magic != _ATLAS_MAGIC or version != _ATLAS_VERSION \
+                or len(data) != pixels_at + width * height * 4:
+            return None
+        boxes = {}
+        for i in range(count):
+            name, x, y, w, h = _ATLAS_ENTRY.unpack_from(data, _ATLAS_HEADER.size + i * _ATLAS_ENTRY.size)
+            boxes[name.rstrip(b"\0").decode()] = (x, y, x + w, y + h)
+        atlas = Image.frombuffer("RGBA", (width, height), data[pixels_at:], "raw", "RGBA", 0, 1)
+        return atlas, boxes
+
+###################
+def _atlasFile(kind: str) -> str:
+    ''' private test helper: writes the atlas built from the PNGs to the
+        (scratch) cache and then damages it: "intact", "truncated" (pixels
+        cut short) or "version" (another format version)
+    Returns:
+        the cache file's path
+    '''
+    sources = [os.path.join(_sourceDir(), f"{name}.png") for name in TILE_NAMES]
+    path = cachePath(f"tiles-test-{kind}.rgba")
+    TileAssets._writeCache(path, *TileAssets._buildAtlas(sources))
+    with open(path, "r+b") as f:
+        if kind == "truncated":
+            f.truncate(os.path.getsize(path) - 1)
+        elif kind == "version":
+            f.seek(len(_ATLAS_MAGIC))
+            f.write(struct.pack("<H", _ATLAS_VERSION + 1))
+    return path
+
+def _checkCacheRead(kind: str) -> tuple[bool, bool] | None:
+    ''' private test helper: reads back an _atlasFile of the given kind
+    Returns:
+        None if _readCache rejects it, else whether its boxes and its
+        pixels equal the atlas built straight from the PNGs
+    '''
+    sources = [os.path.join(_sourceDir(), f"{name}.png") for name in TILE_NAMES]
+    with scratchCache():
+        loaded = TileAssets._readCache(_atlasFile(kind))
+    if loaded is None:
+        return None
+    atlas, boxes = TileAssets._buildAtlas(sources)
+    return loaded[1] == boxes, loaded[0].tobytes() == atlas.tobytes()
+
+def main() -> None:
+    printTest(_checkCacheRead, "intact", expected = (True, True))
+    printTest(_checkCacheRead, "truncated", expected = None)
+    printTest(_checkCacheRead, "version", expected = None)
+
+    for use_cache in (False, True, True):
+        assets = TileAssets(use_cache = use_cache)
+        print(f"cache={use_cache!s:5} {assets.timings()}  {assets.memoryBytes() / 1024:.1f} KB decoded")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import os
+import struct
+import time
+from array import array
+from FeedbackMatrix import*
+from CandidateTracker import*
+
+###########################################################################
+# Class:  WordDictionary
+#
+# The solution and allowed word lists, packed and sorted once into a binary
+# artifact in the cache directory. The artifact is keyed by a hash of the
+# raw .txt files, so editing either file rebuilds it automatically; loading
+# it is a few array reads with no parsing or sorting. The stores (and the
+# feedback matrix built on them) are only loaded when first asked for.
+###########################################################################
+
+_DICT_MAGIC   = b"WDCT"
+_DICT_VERSION = 1
+# magic, version, word length, typecode, then (codes, table) lengths for
+# the solution store and for the allowed store
+_DICT_HEADER  = struct.Struct("<4sHHcxIIII")
+
+class WordDictionary:
+    __slots__ = ("_solutions_fname", "_allowed_fname", "_digest", "_path",
+                 "_solutions", "_allowed", "_feedback", "_letter_index", "_timings")
+
+    def __init__(self, solutions_fname: str, allowed_words_fname: str) -> None:
+        ''' initializer: hashes the source files but does not load anything yet
+        Parameters:
+            solutions_fname:     file with the list of solution words
+            allowed_words_fname: file with the list of allowed words
+        '''
+        self._solutions_fname = solutions_fname
+        self._allowed_fname = allowed_words_fname
+        self._solutions = None
+        self._allowed = None
+        self._feedback = None
+        self._letter_index = None
+        self._timings: dict[str, float] = {}
+        start = time.perf_counter()
+        with open(solutions_fname, "rb") as f:
+            solutions_raw = f.read()
+        with open(allowed_words_fname, "rb") as f:
+            allowed_raw = f.read()
+        self._digest = contentHash(solutions_raw, allowed_raw)
+        self._path = cachePath(f"dictionary-v{_DICT_VERSION}-{self._digest[:16]}.bin")
+        self._timings["hash_ms"] = 1000 * (time.perf_counter() - start)
+
+    def digest(self) -> str:
+        ''' getter for the hash of the source word files '''
+        return self._digest
+
+    def solutions(self) -> WordStore:
+        ''' getter for the solution words, loading the artifact on first use '''
+        if self._solutions is None:
+            self._load()
+        return self._solutions
+
+    def allowed(self) -> WordStore:
+        ''' getter for the allowed guesses, loading the artifact on first use '''
+        if self._allowed is None:
+            self._load()
+        return self._allowed
+
+    def feedback(self) -> FeedbackMatrix:
+        ''' getter for the feedback matrix over these words (loaded on first use) '''
+        if self._feedback is None:
+            start = time.perf_counter()
+            self._feedback = FeedbackMatrix(self.solutions(), self.allowed())
+            self._timings["feedback_ms"] = 1000 * (time.perf_counter() - start)
+        return self._feedback
+
+    def letterIndex(self) -> LetterIndex:
+        ''' getter for the letter bitsets over the solutions (built on first use) '''
+        if self._letter_index is None:
+            start = time.perf_counter()
+            self._letter_index = LetterIndex(self.solutions())
+            self._timings["index_ms"] = 1000 * (time.perf_counter() - start)
+        return self._letter_index
+
+    def timings(self) -> dict[str, float]:
+        ''' returns the load timings so far, in milliseconds:
+            hash_ms (reading and hashing the .txt files), build_ms (only when
+            the artifact had to be rebuilt), load_ms (reading the artifact)
+            feedback_ms (mapping the feedback matrix) and index_ms
+            (building the letter bitsets)
+        '''
+        return dict(self._timings)
+
+    def _load(self) -> None:
+        ''' private helper: read the artifact, building it first if needed '''
+        stores = self._read()
+        if stores is None:
+            start = time.perf_counter()
+            self._build()
+            self._timings["build_ms"] = 1000 * (time.perf_counter() - start)
+            stores = self._read()
+        self._solutions, self._allowed = stores
+
+    def _read(self) -> tuple[WordStore, WordStore] | None:
+        ''' private helper to read the artifact, if it exists and is valid '''
+        start = time.perf_counter()
+        if not os.path.exists(self._path):
+            return None
+        with open(self._path, "rb") as f:
+            data = f.read()
+        if len(data) < _DICT_HEADER.size:
+            return None
+        magic, version, word_len, typecode, *sizes = _DICT_HEADER.unpack_from(data)
+        if magic != _DICT_MAGIC or version != _DICT_VERSION:
+            return None
+        typecode = typecode.decode()
+        offset = _DICT_HEADER.size
+        arrays = []
+        for size, kind in zip(sizes, (typecode, "I", typecode, "I")):
+            part = array(kind)
+            nbytes = size * part.itemsize
+            if offset + nbytes > len(data):
+                return None
+            part.frombytes(data[offset:offset + nbytes])
+            arrays.append(part)
+            offset += nbytes
+        solutions = WordStore.fromCodes(arrays[0], word_len, arrays[1])
+        allowed = WordStore.fromCodes(arrays[2], word_len, arrays[3])
+        self._timings["load_ms"] = 1000 * (time.perf_counter() - start)
+        return solutions, allowed
+
+    def _build(self) -> None:
+        ''' private helper: parse, pack and sort the word files into the artifact '''
+        with open(self._solutions_fname, "r") as f:
+            solutions = WordStore(f.read().split())
+        with open(self._allowed_fname, "r") as f:
+            allowed = WordStore(f.read().split(), solutions.wordLength())
+        parts = [solutions.codes(), solutions.table(), allowed.codes(), allowed.table()]
+        header = _DICT_HEADER.pack(_DICT_MAGIC, _DICT_VERSION, solutions.wordLength(),
+                                   solutions.codes().typecode.encode(),
+                                   *(len(part) for part in parts))
+        tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            for part in parts:
+                f.write(part.tobytes())
+        os.replace(tmp_path, self._path)
+
+# dictionaries already loaded in this process, keyed by file names and hash
+_loaded: dict[tuple[str, str, str], WordDictionary] = {}
+
+def loadDictionary(solutions_fname: str, allowed_words_fname: str) -> WordDictionary:
+    '''This function returns the dictionary for a pair of word files, reusing
+    one already loaded in this process if the files have not changed
+    parameters: solutions_fname - file with the list of solution words
+    allowed_words_fname - file with the list of allowed words
+    returns: a WordDictionary'''
+    dictionary = WordDictionary(solutions_fname, allowed_words_fname)
+    key = (os.path.abspath(solutions_fname), os.path.abspath(allowed_words_fname),
+           dictionary.digest())
+    if key not in _loaded:
+        # the files changed: forget older versions, which then live only as
+        # long as something (e.g. a game in progress) still refers to them
+        for stale in [k for k in _loaded if k[:2] == key[:2]]:
+            del _loaded[stale]
+    return _loaded.setdefault(key, dictionary)
+
+###################
+def main() -> None:
+    dictionary = WordDictionary("wordle-answers.txt", "wordle-allowed-guesses.txt")
+    dictionary.solutions()
+    dictionary.feedback()
+    for name, ms in dictionary.timings().items():
+        print(f"{name:12s} {ms:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
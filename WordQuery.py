@@ -0,0 +1,262 @@
+''' Word-helper queries over a word list: a pattern with known letters
+    ("?a??e"), letters the word must contain, letters it must not contain,
+    and optionally no repeated letters.
+
+    Usage:
+        python WordQuery.py PATTERN [--contains LETTERS] [--excludes LETTERS]
+                                    [--no-doubles] [--offset N] [--limit N]
+                                    [--words FILE]
+                                    (words of 1 to 12 letters a-z)
+        python WordQuery.py --bench [--size N] [--length N]
+
+    Every constraint is one precomputed bitset from a LetterIndex (a letter
+    at a position, or at least k copies of a letter), so a query is a few
+    big-int ANDs whatever the list size. Words come back in sorted order,
+    decoded only for the page asked for.
+'''
+import argparse
+import random
+import time
+from collections import Counter
+from typing import Iterable, Iterator
+import numpy as np
+from WordDictionary import*
+
+WILDCARDS  = "?._"
+MAX_WORD_LEN = 12    # longest word that packs into a WordStore code (5 bits per letter)
+_PAGE_BYTES = 1024   # bitset bytes scanned per step when paging through matches
+
+###########################################################################
+class Matches:
+    ''' The words matching a query, as a bitset over one WordStore. Nothing
+        is decoded until words are asked for.
+    '''
+    __slots__ = ("_store", "_bits", "_count")
+
+    def __init__(self, store: WordStore, bits: int) -> None:
+        self._store = store
+        self._bits = bits
+        self._count = bits.bit_count()
+
+    def count(self) -> int:
+        ''' getter for the number of matching words '''
+        return self._count
+
+    def page(self, offset: int = 0, limit: int = 50) -> list[str]:
+        ''' returns up to limit matching words, skipping the first offset '''
+        words = []
+        for index in self._indices(offset):
+            if len(words) >= limit:
+                break
+            words.append(self._store[index])
+        return words
+
+    def __iter__(self) -> Iterator[str]:
+        for index in self._indices(0):
+            yield self._store[index]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _indices(self, offset: int) -> Iterator[int]:
+        ''' private helper: positions of the set bits from the offset-th one on,
+            skipping whole blocks of the bitset by their popcount
+        '''
+        if offset >= self._count:
+            return
+        raw = self._bits.to_bytes((len(self._store) + 7) // 8, "little")
+        seen = 0
+        for start in range(0, len(raw), _PAGE_BYTES):
+            block = raw[start:start + _PAGE_BYTES]
+            in_block = int.from_bytes(block, "little").bit_count()
+            if seen + in_block <= offset:
+                seen += in_block
+                continue
+            hits = np.flatnonzero(np.unpackbits(np.frombuffer(block, dtype = np.uint8),
+                                                bitorder = "little"))
+            for bit in hits[max(offset - seen, 0):].tolist():
+                yield 8 * start + bit
+            seen += in_block
+
+###########################################################################
+class WordQuery:
+    ''' Query engine over words of any lengths up to MAX_WORD_LEN: one
+        WordStore and LetterIndex per length, built once.
+    '''
+    __slots__ = ("_stores", "_indexes", "_no_doubles", "_skipped")
+
+    def __init__(self, words: Iterable[str] | WordStore) -> None:
+        ''' initializer: packs and indexes the words
+        Parameters:
+            words: the words to query (any mix of lengths), or a WordStore;
+                   words are lowercased, and any still not 1 to MAX_WORD_LEN
+                   letters a-z are skipped (see skipped)
+        '''
+        self._skipped = 0
+        if isinstance(words, WordStore):
+            groups = {words.wordLength(): words}
+        else:
+            by_length: dict[int, list[str]] = {}
+            for word in words:
+                word = word.lower()
+                if not 0 < len(word) <= MAX_WORD_LEN or not (word.isascii() and word.isalpha()):
+                    self._skipped += 1
+                    continue
+                by_length.setdefault(len(word), []).append(word)
+            groups = {n: WordStore(group, n) for n, group in by_length.items()}
+        self._stores: dict[int, WordStore] = groups
+        self._indexes: dict[int, LetterIndex] = {}
+        self._no_doubles: dict[int, int] = {}
+        for n, store in groups.items():
+            self._indexes[n] = LetterIndex(store)
+            doubles = 0
+            for letter in range(26):
+                doubles |= self._indexes[n].atLeast(letter, 2)
+            self._no_doubles[n] = self._indexes[n].everything() & ~doubles
+
+    @classmethod
+    def fromDictionary(cls, dictionary: WordDictionary) -> 'WordQuery':
+        ''' builds the engine over a dictionary's allowed words '''
+        return cls(dictionary.allowed())
+
+    def lengths(self) -> list[int]:
+        ''' returns the word lengths that have words '''
+        return sorted(self._stores)
+
+    def skipped(self) -> int:
+        ''' returns how many input words could not be indexed (too long, or
+            not all letters a-z)
+        '''
+        return self._skipped
+
+    def match(self, pattern: str | None = None, contains: str = "", excludes: str = "",
+              no_doubles: bool = False, length: int | None = None) -> Matches:
+        ''' finds the words meeting every constraint
+        Parameters:
+            pattern:    one character per letter, a-z for a known letter and
+                        ? . or _ for any (sets the word length)
+            contains:   letters the word must have; a repeated letter ("ee")
+                        means at least that many copies
+            excludes:   letters the word must not have
+            no_doubles: if True, only words without a repeated letter
+            length:     word length when there is no pattern (default: the
+                        only length, or 5)
+        Returns:
+            the Matches (raises ValueError for a malformed query)
+        '''
+        pattern = pattern.lower() if pattern else None
+        contains = contains.lower()
+        excludes = excludes.lower()
+        if pattern is not None:
+            if length is not None and length != len(pattern):
+                raise ValueError(f"pattern {pattern!r} is not {length} letters long")
+            length = len(pattern)
+        elif length is None:
+            length = self.lengths()[0] if len(self._stores) == 1 else 5
+        for text in (pattern or "", contains, excludes):
+            for ch in text:
+                if not ("a" <= ch <= "z" or (text is pattern and ch in WILDCARDS)):
+                    raise ValueError(f"unexpected character {ch!r} in {text!r}")
+        if length not in self._stores:
+            return Matches(WordStore([], length), 0)
+        index = self._indexes[length]
+        bits = self._no_doubles[length] if no_doubles else index.everything()
+        # a required letter that is also excluded can never match
+        if set(contains) & set(excludes):
+            bits = 0
+        for pos, ch in enumerate(pattern or ""):
+            if ch not in WILDCARDS:
+                bits &= index.position(pos, ord(ch) - 97)
+        for ch, copies in Counter(contains).items():
+            bits &= index.atLeast(ord(ch) - 97, copies)
+        for ch in set(excludes):
+            bits &= ~index.atLeast(ord(ch) - 97, 1)
+        return Matches(self._stores[length], bits)
+
+###########################################################################
+def syntheticWords(size: int, length: int, seed: int = 0) -> list[str]:
+    ''' returns size distinct random words (letter frequencies roughly like
+        English), for benchmarks
+    '''
+    rng = random.Random(seed)
+    letters = "etaoinshrdlcumwfgypbvkjxqz"
+    weights = [13, 9, 8, 8, 7, 7, 6, 6, 6, 4, 4, 3, 3, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(letters, weights, k = length)))
+    return list(words)
+
+def benchmark(engine: WordQuery, queries: list[dict], repeat: int = 200) -> list[tuple[dict, int, float]]:
+    ''' times queries plus their first page
+    Returns:
+        (query, matches, microseconds per query) for each query
+    '''
+    rows = []
+    for query in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            matches = engine.match(**query)
+            matches.page(0, 50)
+        rows.append((query, matches.count(), 1e6 * (time.perf_counter() - start) / repeat))
+    return rows
+
+###################
+def main() -> None:
+    engine = WordQuery(["crane", "abide", "speed", "eerie", "abbey", "slate", "words", "quiz"])
+    printTest(WordQuery.lengths, engine, expected=[4, 5], is_method=True)
+    printTest(Matches.page, engine.match("??a?e"), expected=["crane", "slate"], is_method=True)
+    printTest(Matches.page, engine.match(contains = "ee"), expected=["eerie", "speed"], is_method=True)
+    printTest(Matches.page, engine.match(excludes = "e", length = 5), expected=["words"], is_method=True)
+    printTest(Matches.page, engine.match(no_doubles = True), 1, 2,
+              expected=["crane", "slate"], is_method=True)
+    printTest(Matches.count, engine.match("q??z", contains = "u"), expected=1, is_method=True)
+    # an ordinary dictionary file: capitals are folded, the rest is skipped
+    engine = WordQuery(["Crane", "don't", "café", "antidisestablishment", "slate"])
+    printTest(Matches.page, engine.match("??a?e"), expected=["crane", "slate"], is_method=True)
+    printTest(WordQuery.skipped, engine, expected=3, is_method=True)
+
+    parser = argparse.ArgumentParser(description = "find words by pattern and letters")
+    parser.add_argument("pattern", nargs = "?", default = None)
+    parser.add_argument("--contains", default = "")
+    parser.add_argument("--excludes", default = "")
+    parser.add_argument("--no-doubles", action = "store_true")
+    parser.add_argument("--offset", type = int, default = 0)
+    parser.add_argument("--limit", type = int, default = 50)
+    parser.add_argument("--words", default = None,
+                        help = "word file (default: the allowed guesses); words over "
+                               f"{MAX_WORD_LEN} letters or with characters other than a-z are skipped")
+    parser.add_argument("--bench", action = "store_true")
+    parser.add_argument("--size", type = int, default = 300_000)
+    parser.add_argument("--length", type = int, default = 8)
+    args = parser.parse_args()
+
+    if args.bench:
+        queries = [{"pattern": "?a??e"}, {"pattern": "s???t", "excludes": "aeo"},
+                   {"contains": "r", "excludes": "st", "no_doubles": True, "length": 5}]
+        engine = WordQuery.fromDictionary(loadDictionary("wordle-answers.txt", "wordle-allowed-guesses.txt"))
+        big_queries = [{"pattern": "?a" + "?" * (args.length - 3) + "e"},
+                       {"contains": "rr", "excludes": "st", "length": args.length},
+                       {"pattern": "s" + "?" * (args.length - 1), "no_doubles": True}]
+        start = time.perf_counter()
+        big = WordQuery(syntheticWords(args.size, args.length))
+        print(f"indexed {args.size:,} {args.length}-letter words in {time.perf_counter() - start:.1f} s")
+        for name, target, work in (("allowed", engine, queries), (f"{args.size:,} words", big, big_queries)):
+            for query, count, us in benchmark(target, work):
+                print(f"{name:>16} {us:8.1f} us {count:7,} matches  {query}")
+        return
+
+    if args.words:
+        with open(args.words) as f:
+            engine = WordQuery(f.read().split())
+        if engine.skipped():
+            print(f"skipped {engine.skipped()} words over {MAX_WORD_LEN} letters or not all a-z")
+    else:
+        engine = WordQuery.fromDictionary(loadDictionary("wordle-answers.txt", "wordle-allowed-guesses.txt"))
+    matches = engine.match(args.pattern, args.contains, args.excludes, args.no_doubles)
+    words = matches.page(args.offset, args.limit)
+    print(f"{matches.count()} matches, showing {args.offset + 1 if words else 0}-{args.offset + len(words)}")
+    for i in range(0, len(words), 10):
+        print("  " + " ".join(words[i:i + 10]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import random
+from array import array
+from typing import Iterable, Iterator
+import numpy as np
+from printTest import*
+
+###########################################################################
+# Class:  WordStore
+#
+# Compact, sorted, read-only set of equal-length lowercase words. Each word
+# is packed into one integer with 5 bits per letter (first letter in the
+# high bits), so sorting the integers sorts the words alphabetically and
+# index <-> word conversion is pure arithmetic. Membership goes through an
+# open-addressing hash table of indices, so a 13k-word list costs a couple
+# hundred KB instead of tens of thousands of str objects.
+###########################################################################
+
+_BITS_PER_LETTER = 5
+_LETTER_MASK     = (1 << _BITS_PER_LETTER) - 1
+_HASH_MULTIPLIER = 0x9E3779B1  # Knuth's multiplicative hashing constant
+
+class WordStore:
+    __slots__ = ("_word_len", "_codes", "_table", "_table_bits")
+
+    def __init__(self, words: Iterable[str], word_len: int | None = None) -> None:
+        ''' initializer for a WordStore
+        Parameters:
+            words:    words to store, in any order (duplicates are dropped)
+            word_len: length every word must have (default: length of the first word)
+        '''
+        words = list(words)
+        if word_len is None:
+            word_len = len(words[0]) if words else 5
+        self._word_len = word_len
+        codes = set()
+        for word in words:
+            code = self.encode(word)
+            if code < 0:
+                raise ValueError(f"{word!r} is not a {word_len}-letter lowercase word")
+            codes.add(code)
+        self._codes = array(self._typecode(word_len), sorted(codes))
+        self._buildTable()
+
+    @classmethod
+    def fromCodes(cls, codes: array, word_len: int,
+                  table: array | None = None) -> 'WordStore':
+        ''' builds a WordStore directly from already-sorted packed codes
+        Parameters:
+            codes:    sorted array of packed words
+            word_len: number of letters in each word
+            table:    a previously built hash table for these codes, if any
+        '''
+        store = cls.__new__(cls)
+        store._word_len = word_len
+        store._codes = codes
+        if table is None:
+            store._buildTable()
+        else:
+            store._table = table
+            store._table_bits = max(len(table).bit_length() - 1, 0)
+        return store
+
+    @staticmethod
+    def _typecode(word_len: int) -> str:
+        ''' private helper: smallest unsigned array type for packed words '''
+        return "I" if word_len * _BITS_PER_LETTER <= 32 else "Q"
+
+    def _buildTable(self) -> None:
+        ''' private helper to build the hash table mapping code -> index + 1 '''
+        bits = max(4, (2 * len(self._codes)).bit_length())
+        table = array("I", bytes(4 << bits))
+        mask = (1 << bits) - 1
+        for i, code in enumerate(self._codes):
+            slot = self._slot(code, bits)
+            while table[slot]:
+                slot = (slot + 1) & mask
+            table[slot] = i + 1
+        self._table = table
+        self._table_bits = bits
+
+    @staticmethod
+    def _slot(code: int, bits: int) -> int:
+        ''' private helper: home slot of a code in a table of 2**bits entries '''
+        return (((code ^ (code >> 32)) * _HASH_MULTIPLIER) & 0xFFFFFFFF) >> (32 - bits)
+
+    def encode(self, word: str) -> int:
+        ''' packs a word into an integer, or returns -1 if it cannot be stored '''
+        if len(word) != self._word_len:
+            return -1
+        code = 0
+        for ch in word:
+            letter = ord(ch) - 97
+            if not 0 <= letter < 26:
+                return -1
+            code = (code << _BITS_PER_LETTER) | letter
+        return code
+
+    def decode(self, code: int) -> str:
+        ''' unpacks an integer back into its word '''
+        letters = []
+        for _ in range(self._word_len):
+            letters.append(chr(97 + (code & _LETTER_MASK)))
+            code >>= _BITS_PER_LETTER
+        return "".join(reversed(letters))
+
+    def indexOf(self, word: str) -> int:
+        ''' returns the sorted position of a word, or -1 if it is not stored '''
+        code = self.encode(word)
+        if code < 0:
+            return -1
+        table = self._table
+        codes = self._codes
+        mask = len(table) - 1
+        slot = self._slot(code, self._table_bits)
+        while True:
+            entry = table[slot]
+            if entry == 0:
+                return -1
+            if codes[entry - 1] == code:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def __contains__(self, word: str) -> bool:
+        return self.indexOf(word) >= 0
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self.decode(code) for code in self._codes[index]]
+        return self.decode(self._codes[index])
+
+    def __iter__(self) -> Iterator[str]:
+        for code in self._codes:
+            yield self.decode(code)
+
+    def randomIndex(self) -> int:
+        ''' returns a uniformly random index into the store '''
+        return random.randrange(len(self._codes))
+
+    def randomWord(self) -> str:
+        ''' returns a uniformly random stored word '''
+        return self[self.randomIndex()]
+
+    def wordLength(self) -> int:
+        ''' getter for the number of letters in each word '''
+        return self._word_len
+
+    def codes(self) -> array:
+        ''' getter for the sorted packed codes '''
+        return self._codes
+
+    def table(self) -> array:
+        ''' getter for the membership hash table (index + 1 per slot, 0 = empty) '''
+        return self._table
+
+    def letterArray(self) -> np.ndarray:
+        ''' returns the words as a (len, word_len) uint8 array of letter
+            indices (a=0 .. z=25), as used by FeedbackMatrix.scoreMany
+        '''
+        codes = np.frombuffer(self._codes, dtype=np.uint32 if self._codes.typecode == "I"
+                              else np.uint64) if len(self._codes) else np.zeros(0, np.uint64)
+        shifts = _BITS_PER_LETTER * np.arange(self._word_len - 1, -1, -1, dtype=np.uint64)
+        return ((codes.astype(np.uint64)[:, None] >> shifts) & _LETTER_MASK).astype(np.uint8)
+
+    def memoryBytes(self) -> int:
+        ''' returns the bytes held by the code array and hash table '''
+        return self._codes.itemsize * len(self._codes) + self._table.itemsize * len(self._table)
+
+###################
+def main() -> None:
+    store = WordStore(["crane", "abide", "speed", "abide"])
+    printTest(WordStore.__len__, store, expected=3, is_method=True)
+    printTest(WordStore.__getitem__, store, slice(None), expected=["abide", "crane", "speed"], is_method=True)
+    printTest(WordStore.indexOf, store, "speed", expected=2, is_method=True)
+    printTest(WordStore.indexOf, store, "zzzzz", expected=-1, is_method=True)
+    printTest(WordStore.indexOf, store, "Crane", expected=-1, is_method=True)
+    printTest(WordStore.decode, store, store.encode("crane"), expected="crane", is_method=True)
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,135 @@
-import streamlit as st
-import requests
-
-
+import logging
+import os
 import random
+import sys
+import time
 from utils import*
 from WordleGUI import*
 from printTest import*
+from WordStore import*
+from FeedbackMatrix import*
+from WordDictionary import*
+from CandidateTracker import*
+from WordleSolver import*
+from Metrics import*
+from GameHistory import*
+from DictionaryReloader import*
+from StrategyTree import*
 
-st.markdown('# Oke Wordle')
+_log = logging.getLogger("wordle")
+_metrics = Metrics.shared()
 
 class Wordle:
-    __slots__=('_solution','_allowed_words','_num_guesses', '_wordle_gui', '_solution_words')
+    __slots__=('_solution','_allowed_words','_num_guesses', '_wordle_gui', '_solution_words',
+               '_feedback', '_solution_row', '_solver', '_tracker', '_dictionary', '_hard_mode',
+               '_history', '_guesses', '_reloader', '_tree', '_tree_node')
 
     
-    def __init__(self, solutions_fname: str, allowed_words_fname: str) -> None:
+    def __init__(self, solutions_fname: str, allowed_words_fname: str, hard_mode: bool=False) -> None:
         '''This function sets the instance variables
         parameters: solutions_fname - file with list of solution words
-        allowed_words_fname - file with list of allowed words   '''
+        allowed_words_fname - file with list of allowed words
+        hard_mode - if True, guesses must reuse every revealed hint'''
         self._solution="" 
         self._num_guesses=0
         self._wordle_gui= None
-        with open(solutions_fname, "r") as f:
-            self._solution_words=f.read().split()
-        with open(allowed_words_fname, "r") as g:
-            self._allowed_words=g.read().split()
-        self._allowed_words=mergeSort(self._allowed_words)
-        self._solution_words= mergeSort(self._solution_words)
+        self._history= None
+        self._guesses= []
+        self._reloader= None
+        # words come pre-packed and pre-sorted from the cached dictionary
+        # artifact, and every (solution, guess) pattern is scored once and
+        # memory-mapped
+        self._useDictionary(loadDictionary(solutions_fname, allowed_words_fname))
+        self._hard_mode= hard_mode
+        if _metrics.enabled:
+            for name, ms in self._dictionary.timings().items():
+                _metrics.setGauge(f"dictionary_{name[:-3]}_seconds", ms / 1000)
         self.newGame()
 
     def setGUI(self,gui:'WordleGUI') -> None:
         '''This function sets the wordle gui
-        paraters: gui'''
+        paraters: gui - a WordleGUI, or any object with a setFinalMessage
+        method (e.g. a headless result sink)'''
         self._wordle_gui=gui
+
+    def setHistory(self, history: GameHistory | None) -> None:
+        '''This function sets where finished games are recorded
+        parameters: history - a GameHistory over this game's word lists,
+        or None to stop recording'''
+        self._history=history
         
     
+    def setReloader(self, reloader: DictionaryReloader | None) -> None:
+        '''This function makes every new game use the reloader's newest word
+        lists; the game in progress keeps the ones it started with
+        parameters: reloader - a DictionaryReloader, or None for fixed lists'''
+        self._reloader=reloader
+
+    def _useDictionary(self, dictionary: WordDictionary) -> None:
+        '''This function points the game at a (new) version of the word lists'''
+        self._dictionary= dictionary
+        self._solution_words= dictionary.solutions()
+        self._allowed_words= dictionary.allowed()
+        self._feedback= dictionary.feedback()
+        self._solver= WordleSolver(self._feedback)
+        self._tracker= CandidateTracker(dictionary.letterIndex(), self._solution_words)
+        # the solver's moves precomputed offline (python StrategyTree.py --build);
+        # without it hints are searched for on every call
+        self._tree= StrategyTree.cached(self._feedback)
+        self._tree_node= -1
+
+    def numGuesses(self) -> int:
+        '''This function returns how many guesses were made this game'''
+        return self._num_guesses
+
+    def solutionWords(self) -> WordStore:
+        '''This function returns the sorted list of possible solutions'''
+        return self._solution_words
+
+    def loadTimings(self) -> dict[str, float]:
+        '''This function returns how long loading the dictionary took
+        returns: dict of timing names to milliseconds'''
+        return self._dictionary.timings()
+
     def pickRandomSolution(self) ->None:
         '''This function picks a random solution'''
-        idx=random.randint(0,(len(self._solution_words)-1))
+        if _metrics.enabled:
+            start= time.perf_counter()
+        idx= self._solution_words.randomIndex()
         self._solution= self._solution_words[idx]
-        print(self._solution)
+        self._solution_row= idx
+        # the answer only goes to the log at DEBUG, never to stdout
+        _log.debug("solution: %s", self._solution)
+        if _metrics.enabled:
+            _metrics.observe("pick_solution_seconds", time.perf_counter() - start)
         
 
-    def newGame(self, debug: bool=False) -> None:
-        '''This function starts a new game'''
-        self.pickRandomSolution()
+    def newGame(self, debug: bool=False, solution: str | None=None) -> None:
+        '''This function starts a new game
+        parameters: debug - boolean
+        solution - optional word to use instead of a random solution'''
+        # switching versions only between games: a reload never changes the
+        # words of a game in progress
+        if self._reloader is not None and self._reloader.current() is not self._dictionary:
+            self._useDictionary(self._reloader.current())
+        if solution is None:
+            self.pickRandomSolution()
+        else:
+            row= self._feedback.solutionIndex(solution)
+            if row < 0:
+                raise ValueError(f"{solution!r} is not a solution word")
+            self._solution= solution
+            self._solution_row= row
         self._num_guesses=0
+        self._guesses=[]
+        self._tracker.reset()
+        self._tree_node= self._tree.root() if self._tree is not None else -1
+        if _metrics.enabled:
+            _metrics.inc("games_started_total")
         if debug == True:
-            print(self._solution)
+            _log.info("solution: %s", self._solution)
 
-    #make histogram of the solution letters using a dictionary
+    #look up the precomputed feedback pattern for this solution and guess
     def checkGuess(self, guess: str, debug: bool = False) -> tuple[list[int], list[int]] :
         '''This function checks the users guesses
         parameters: guess - users guess 
@@ -56,59 +137,138 @@ class Wordle:
         returns: a list with the list of the indeces of the characters
         in the right spot, and a list of the the indeces of the characters 
         that are just in the solution'''
-        correct=[]
-        almost=[]
-        d={}
-        letters=[]
-        for i in range (len(guess)):
-            letters.append(self._solution[i])
-        for i in range (len(letters)):
-            if letters[i] in (d.keys()):
-                d[letters[i]]+=1
-            else: 
-                d[letters[i]]=1
-        print(d)
-        for i in range (len(guess)):
-            if guess[i]== self._solution[i]:
-                correct.append(i)
-                d[letters[i]] -= 1
-            elif guess[i] in list(d.keys()) and d[letters[i]] !=0 :
-                almost.append(i)
-                d[letters[i]] -= 1
         self._num_guesses +=1
-        return [correct,almost]
+        if not _metrics.enabled:
+            result= self._feedback.lookup(self._solution_row, guess)
+        else:
+            start= time.perf_counter()
+            result= self._feedback.lookup(self._solution_row, guess)
+            _metrics.observe("check_guess_seconds", time.perf_counter() - start)
+        if debug == True:
+            _log.info("checked %s -> %s", guess, result)
+        return result
+
 
 
+    def checkGuessBatch(self, guesses: list[str]) -> np.ndarray:
+        '''This function scores many guesses against the current solution
+        without counting them as guesses
+        parameters: guesses - list of words
+        returns: array of base-3 pattern codes, one per guess
+        (decodePattern turns a code back into [correct, almost])'''
+        return self._feedback.codes(self._solution_row, guesses)
 
     def processGuess(self, guess: str, debug: bool = True) -> tuple[list[int], list[int]] | None:
         '''Ending Sceanarios 
         parameters: guess - users guess 
         debug- boolean'''
-        if self._num_guesses > 6:
-            self._wordle_gui.setFinalMessage("Out of Guesses :(") 
-        if debug == True:
-            print(self.checkGuess(guess))
-        if binarySearch(guess, self._allowed_words) == False:
+        if _metrics.enabled:
+            start= time.perf_counter()
+        if guess not in self._allowed_words or \
+                (self._hard_mode and not self._tracker.allowsHardMode(guess)):
+            if _metrics.enabled:
+                _metrics.inc("guesses_invalid_total")
+            _log.debug("rejected guess %r", guess)
             return None
-        elif guess == self._solution:
+        result= self.checkGuess(guess)
+        code= self._feedback.code(self._solution_row, guess)
+        self._tracker.update(guess, code)
+        if self._tree_node >= 0:
+            # stay on the tree only while the player follows its advice
+            self._tree_node= self._tree.child(self._tree_node, code) \
+                if guess == self._tree.guess(self._tree_node) else -1
+        self._guesses.append(guess)
+        # a finished game goes on the history writer's queue, never to disk here
+        if self._history is not None and (guess == self._solution or len(self._guesses) == MAX_GUESSES):
+            self._history.record(self._solution, self._guesses, guess == self._solution,
+                                 dictionary=self._dictionary)
+        if debug == True:
+            _log.info("%s -> %s", guess, result)
+        if guess == self._solution and self._wordle_gui is not None:
             self._wordle_gui.setFinalMessage("You Win!!! ;)") 
-            return self.checkGuess(guess)
-        else:
-            return self.checkGuess(guess)
-       
-        
-        
+        elif len(self._guesses) == MAX_GUESSES and self._wordle_gui is not None:
+            self._wordle_gui.setFinalMessage("Out of Guesses :(") 
+        if _metrics.enabled:
+            _metrics.inc("guesses_valid_total")
+            if guess == self._solution:
+                _metrics.inc("guesses_winning_total")
+            _metrics.observe("process_guess_seconds", time.perf_counter() - start)
+        return result
+
+
+    def suggestGuess(self) -> str:
+        '''This function suggests the next guess for the current game
+        returns: the guess with the most expected information over the
+        solutions that are still possible'''
+        if self._tree_node >= 0:
+            return self._tree.guess(self._tree_node)
+        return self._solver.bestGuess(self._tracker.remainingIndices())
+
+    def remainingCandidates(self) -> list[str]:
+        '''This function returns the solutions still consistent with every
+        guess so far this game'''
+        return self._tracker.remainingCandidates()
+
+    def remainingCount(self) -> int:
+        '''This function returns how many solutions are still possible'''
+        return self._tracker.remainingCount()
+
+    def setHardMode(self, hard_mode: bool) -> None:
+        '''This function turns hard mode on or off
+        parameters: hard_mode - if True, guesses must reuse every revealed hint'''
+        self._hard_mode= hard_mode
+
+
+def _finalMessages(solution: str, guesses: list[str]) -> list[str]:
+    '''This function is a test helper: plays guesses against solution with a
+    headless sink in place of the GUI
+    returns: every final message the GUI would have shown'''
+    from simulate import HeadlessSink
+    wordle = Wordle('wordle-answers.txt', 'wordle-allowed-guesses.txt')
+    sink = HeadlessSink()
+    wordle.setGUI(sink)
+    wordle.newGame(solution=solution)
+    for guess in guesses:
+        wordle.processGuess(guess, debug=False)
+    return sink.messages()
+
+def _test() -> None:
+    '''This function runs the Wordle checks without opening a window'''
+    wrong = ["slate", "crane", "abide", "speed", "eerie", "abbey"]
+    printTest(_finalMessages, "quiet", wrong, expected=["Out of Guesses :("])
+    printTest(_finalMessages, "quiet", wrong[:5], expected=[])
+    printTest(_finalMessages, "quiet", wrong[:5] + ["quiet"], expected=["You Win!!! ;)"])
+    # an invalid word is not a guess, so it cannot end the game
+    printTest(_finalMessages, "quiet", wrong[:5] + ["zzzzz"], expected=[])
 
-        
 def main() ->None:
     #guess= "blank"
     #solution= "bleak"
     #e=wordle(guess)
     #printTest(e.checkGuess, guess, expected=[0,1,4][2])
+    # WORDLE_LOG=DEBUG shows the solution and every guess
+    logging.basicConfig(level=os.environ.get("WORDLE_LOG", "WARNING").upper(),
+                        format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    # python Wordle.py --test runs the checks instead of the game
+    if "--test" in sys.argv[1:]:
+        _test()
+        return
     wordle = Wordle('wordle-answers.txt', 'wordle-allowed-guesses.txt')
+    # edits to the word lists go live at the next New Game
+    reloader = DictionaryReloader('wordle-answers.txt', 'wordle-allowed-guesses.txt',
+                                  prepare=lambda d: WordleSolver(d.feedback()).openerScores())
+    wordle.setReloader(reloader)
+    history = GameHistory(dictionary=reloader.current())
+    reloader.addListener(history.setDictionary)
+    wordle.setHistory(history)
     gui = WordleGUI(wordle.processGuess, wordle.newGame)
     wordle.setGUI(gui)
     gui.start()
+    reloader.stop()
+    history.close()
+    # WORDLE_METRICS=1 records timings and counts; dump them on exit
+    if _metrics.enabled:
+        print(_metrics.toPrometheus(), end="")
 
 
 
@@ -0,0 +1,369 @@
+''' Display-independent input handling for Wordle: the typing, submitting,
+    rollback and win/lose logic that used to live inside WordleGUI, driving
+    a pluggable renderer. WordleGUI plugs in a Tk renderer; tests and
+    benchmarks use Renderer (draws nothing) or RecordingRenderer, so
+    scripted keystrokes replay at full speed with no display.
+
+    Usage:
+        python WordleController.py [--games N] [--repeat N]
+
+    The main program replays scripted games (with typos, backspaces and
+    invalid words) through the real Wordle engine and reports keystroke
+    latency.
+'''
+import argparse
+import random
+import time
+from enum import Enum
+from typing import Callable, Iterable
+from BoardModel import*
+
+###########################################################################
+class GameState(Enum):
+    ACTIVE = 0
+    WIN    = 1
+    LOSE   = 2
+
+###########################################################################
+class Renderer:
+    ''' What the controller draws through. Used as is it draws nothing and
+        runs every scheduled step at once (the no-op renderer); subclasses
+        override draw() and the animation hooks. It counts how many widget
+        updates each kind of board update needed.
+    '''
+    __slots__ = ("_calls",)
+
+    def __init__(self) -> None:
+        self._calls: dict[str, list[int]] = {}
+
+    def apply(self, changes: list[Change], op: str) -> None:
+        ''' draws board changes and counts them under op
+            ("type", "reveal", "rollback" or "reset")
+        '''
+        for change in changes:
+            self.draw(change)
+        counts = self._calls.setdefault(op, [0, 0])
+        counts[0] += len(changes)
+        counts[1] += 1
+
+    def draw(self, change: Change) -> None:
+        ''' shows one changed tile or key '''
+
+    def schedule(self, delay: float, step: Callable) -> None:
+        ''' runs step delay seconds after the previously scheduled step '''
+        step()
+
+    def record(self, name: str, start: float) -> None:
+        ''' notes when the steps scheduled so far have all run '''
+
+    def finish(self) -> None:
+        ''' runs every step still waiting, right now '''
+
+    def dance(self, row: int) -> None:
+        ''' animates a winning row '''
+
+    def showFinal(self) -> None:
+        ''' shows the end-of-game message '''
+
+    def hideFinal(self) -> None:
+        ''' hides the end-of-game message '''
+
+    def callReport(self) -> dict[str, dict[str, float]]:
+        ''' returns widget updates per kind of board update: total calls,
+            number of board updates and calls per board update
+        '''
+        return {op: {"calls": calls, "updates": updates, "per_update": calls / updates}
+                for op, (calls, updates) in self._calls.items()}
+
+class RecordingRenderer(Renderer):
+    ''' Renderer that keeps a log of everything it was asked to draw, as
+        (event, detail) tuples, for tests that check what a player would see.
+    '''
+    __slots__ = ("_events",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._events: list[tuple[str, object]] = []
+
+    def draw(self, change: Change) -> None:
+        self._events.append(("draw", change))
+
+    def dance(self, row: int) -> None:
+        self._events.append(("dance", row))
+
+    def showFinal(self) -> None:
+        self._events.append(("final", True))
+
+    def hideFinal(self) -> None:
+        self._events.append(("final", False))
+
+    def events(self) -> list[tuple[str, object]]:
+        ''' getter for every event recorded so far '''
+        return self._events
+
+    def clearEvents(self) -> None:
+        ''' forgets the recorded events '''
+        self._events.clear()
+
+###########################################################################
+class WordleController:
+    ''' The Wordle input state machine: which tile the next letter goes in,
+        submitting a row to the handler function, rolling back invalid words
+        and moving to WIN or LOSE. Game state changes as soon as a key is
+        pressed; only the drawing goes through the renderer.
+    '''
+    __slots__ = ("_handler_function", "_reset_function", "_renderer", "_board",
+                 "_current_row", "_current_col", "_game_state", "_row_locked")
+
+    _INVALID_PAUSE : float = 1.25 # time to pause showing invalid in red
+    _INVALID_DELAY : float = 0.1  # time to delay between invalid rollbacks
+    _UPDATE_DELAY  : float = 0.1  # time to delay b/w correct/incorrect reveals
+
+    def __init__(self, handler_function: Callable, new_game_function: Callable,
+                 renderer: Renderer | None = None, max_guesses: int = 6,
+                 word_len: int = 5) -> None:
+        ''' initializer for a WordleController
+        Parameters:
+            handler_function: called with each entered word; returns None for
+                an invalid word, else (exact_matches, misplaced) index lists
+            new_game_function: called when the player starts a new game
+            renderer: what to draw through (default: draw nothing)
+            max_guesses: rows on the board
+            word_len: letters per row
+        '''
+        self._handler_function = handler_function
+        self._reset_function = new_game_function
+        self._renderer = Renderer() if renderer is None else renderer
+        self._board = BoardModel(max_guesses, word_len)
+        self._current_row = 0
+        self._current_col = 0
+        self._game_state = GameState.ACTIVE
+        self._row_locked = False
+
+    def board(self) -> BoardModel:
+        ''' getter for the board model '''
+        return self._board
+
+    def renderer(self) -> Renderer:
+        ''' getter for the renderer '''
+        return self._renderer
+
+    def gameState(self) -> GameState:
+        ''' getter for whether the game is active, won or lost '''
+        return self._game_state
+
+    def currentRow(self) -> int:
+        ''' getter for the row being typed into '''
+        return self._current_row
+
+    def currentCol(self) -> int:
+        ''' getter for the tile the next letter goes in '''
+        return self._current_col
+
+    def rowLocked(self) -> bool:
+        ''' getter for whether an invalid word is still being rolled back
+            (keys pressed meanwhile are queued behind the rollback)
+        '''
+        return self._row_locked
+
+    def press(self, key: str) -> None:
+        ''' handles one key: a letter, "BackSpace" or "Return" (anything
+            else is ignored)
+        '''
+        if key == "Return":
+            self.pressReturn()
+        elif key == "BackSpace":
+            self.pressBackspace()
+        elif len(key) == 1 and 'A' <= key.upper() <= 'Z':
+            self.pressLetter(key)
+
+    def pressLetter(self, letter: str) -> None:
+        ''' types a letter into the next tile of the current row '''
+        # while an invalid word is being rolled back, queue the key behind the
+        # rollback rather than typing into a row that is about to be cleared
+        if self._row_locked:
+            self._renderer.schedule(0, lambda: self.pressLetter(letter))
+            return
+        if self._game_state != GameState.ACTIVE: return
+        r = self._current_row;  c = self._current_col
+        if c < self._board.cols():
+            self._renderer.apply(self._board.setTile(r, c, letter.upper()), "type")
+            self._current_col += 1
+
+    def pressBackspace(self) -> None:
+        ''' clears the last typed tile of the current row '''
+        if self._row_locked:
+            self._renderer.schedule(0, self.pressBackspace)
+            return
+        if self._game_state != GameState.ACTIVE: return
+        if self._current_col > 0:
+            self._current_col -= 1
+            self._renderer.apply(self._board.setTile(self._current_row, self._current_col, ""), "type")
+
+    def pressReturn(self) -> None:
+        ''' submits the current row to the handler function '''
+        if self._row_locked:
+            self._renderer.schedule(0, self.pressReturn)
+            return
+        if self._game_state != GameState.ACTIVE: return
+
+        board = self._board
+        renderer = self._renderer
+        cols = board.cols()
+        r = self._current_row
+        word = board.word(r)
+        if len(word) < cols: return
+        result = self._handler_function(word.lower())
+
+        start = time.perf_counter()
+        if result is None:
+            # invalid guess -- mark the word as invalid (black on red),
+            # pause, then roll back letter by letter
+            self._row_locked = True
+            for c in range(cols):
+                renderer.apply(board.markTile(r, c, Mark.INVALID), "rollback")
+            for c in range(cols - 1, -1, -1):
+                delay = WordleController._INVALID_PAUSE if c == cols - 1 \
+                        else WordleController._INVALID_DELAY
+                renderer.schedule(delay, lambda c = c: renderer.apply(board.setTile(r, c, ""), "rollback"))
+            renderer.schedule(0, self._unlockRow)
+            self._current_col = 0
+            renderer.record("rollback", start)
+            return
+
+        # valid guess -- color each letter as correct, misplaced, or
+        # incorrect, then upgrade the keyboard keys that changed
+        exact_matches, misplaced = result
+        exact = set(exact_matches);  almost = set(misplaced)
+        marks = [Mark.CORRECT if c in exact else Mark.MISPLACED if c in almost
+                 else Mark.INCORRECT for c in range(cols)]
+        for c in range(cols):
+            renderer.schedule(WordleController._UPDATE_DELAY,
+                              lambda c = c: renderer.apply(board.markTile(r, c, marks[c]), "reveal"))
+        renderer.schedule(0, lambda: renderer.apply(board.markKeys(word, marks), "reveal"))
+        renderer.record("reveal", start)
+
+        if len(exact) == cols:
+            self._game_state = GameState.WIN
+            renderer.dance(r)
+            renderer.schedule(0, renderer.showFinal)
+        else:
+            self._current_row += 1
+            self._current_col = 0
+            if self._current_row >= board.rows():
+                self._game_state = GameState.LOSE
+                renderer.schedule(0, renderer.showFinal)
+
+    def newGame(self) -> None:
+        ''' resets the board and tells the new-game function '''
+        # fast-forward any animation still in flight for the previous game
+        self._renderer.finish()
+        self._row_locked = False
+        self._renderer.apply(self._board.reset(), "reset")
+        self._current_row = 0
+        self._current_col = 0
+        self._game_state = GameState.ACTIVE
+        self._renderer.hideFinal()
+        self._reset_function()
+
+    def replay(self, keys: Iterable[str]) -> int:
+        ''' presses a scripted stream of keys (see press)
+        Returns:
+            the number of keys pressed
+        '''
+        count = 0
+        for key in keys:
+            self.press(key)
+            count += 1
+        return count
+
+    def _unlockRow(self) -> None:
+        ''' private helper: end of an invalid-word rollback, accept typing again '''
+        self._row_locked = False
+
+###########################################################################
+def parseKeys(script: str) -> list[str]:
+    ''' turns a typed script into keys for replay: "\\n" is Return and
+        "\\b" is BackSpace, e.g. "cranx\\be\\n"
+    '''
+    named = {"\n": "Return", "\b": "BackSpace"}
+    return [named.get(ch, ch) for ch in script]
+
+def benchmarkReplay(controller: WordleController, scripts: list[list[str]],
+                    start_game: Callable, repeat: int = 1) -> dict[str, float]:
+    ''' replays one game per script, timing every keystroke from press to
+        updated state
+    Parameters:
+        controller: the controller to drive
+        scripts: keys for each game
+        start_game: called with the script index before each game
+        repeat: times to replay all the scripts
+    Returns:
+        dict with keys, keys_per_sec and latency percentiles in microseconds
+    '''
+    samples: list[float] = []
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(repeat):
+        for i, keys in enumerate(scripts):
+            start_game(i)
+            controller.newGame()
+            for key in keys:
+                start = clock()
+                controller.press(key)
+                samples.append(clock() - start)
+    elapsed = clock() - started
+    samples.sort()
+    def pick(fraction: float) -> float:
+        return 1e6 * samples[min(len(samples) - 1, int(fraction * len(samples)))] if samples else 0.0
+    return {"keys": len(samples), "keys_per_sec": len(samples) / elapsed,
+            "p50_us": pick(0.50), "p90_us": pick(0.90), "p99_us": pick(0.99),
+            "max_us": 1e6 * samples[-1] if samples else 0.0}
+
+###################
+def main() -> None:
+    from Wordle import Wordle
+    from printTest import printTest
+    parser = argparse.ArgumentParser(description = "replay scripted games without a display")
+    parser.add_argument("--games", type = int, default = 500)
+    parser.add_argument("--repeat", type = int, default = 3)
+    args = parser.parse_args()
+
+    wordle = Wordle('wordle-answers.txt', 'wordle-allowed-guesses.txt')
+    solutions = list(wordle.solutionWords())
+    allowed = list(solutions)
+    rng = random.Random(1)
+    games = [rng.choice(solutions) for _ in range(args.games)]
+
+    # each script: a typo fixed with backspace, an invalid word, then up to
+    # six random solution words (ending with the answer if it is reached)
+    scripts = []
+    for solution in games:
+        script = "qq\b\b" + "zzzzz\n"
+        for guess in rng.sample(allowed, 5) + [solution]:
+            script += guess + "\n"
+        scripts.append(parseKeys(script))
+
+    # correctness: an invalid word rolls back, a valid one moves on, the
+    # answer wins and further keys are ignored
+    controller = WordleController(lambda word: wordle.processGuess(word, debug = False),
+                                  lambda: None)
+    wordle.newGame(solution = "crane")
+    controller.replay(parseKeys("zzzzz\nslate\n"))
+    printTest(WordleController.currentRow, controller, expected = 1, is_method = True)
+    printTest(BoardModel.word, controller.board(), 0, expected = "SLATE", is_method = True)
+    controller.replay(parseKeys("cranx\be\nab"))
+    printTest(WordleController.gameState, controller, expected = GameState.WIN, is_method = True)
+    printTest(WordleController.currentCol, controller, expected = 5, is_method = True)
+
+    start_game = lambda i: wordle.newGame(solution = games[i])
+    for name, renderer in (("null", Renderer()), ("recording", RecordingRenderer())):
+        controller = WordleController(lambda word: wordle.processGuess(word, debug = False),
+                                      lambda: None, renderer)
+        report = benchmarkReplay(controller, scripts, start_game, args.repeat)
+        print(f"{name:10s} " + "  ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+                                         for k, v in report.items()))
+        print(f"{'':10s} widget updates: {renderer.callReport()}")
+
+if __name__ == "__main__":
+    main()
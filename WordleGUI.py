@@ -1,10 +1,12 @@
-from enum import Enum
+import argparse
+from collections import deque
 from PIL import ImageTk, Image
 import time
 import tkinter as tk
 import tkinter.ttk as ttk
 from typing import Callable
-import string
+from TileAssets import*
+from WordleController import*
 
 ###########################################################################
 # Class:         WordleGUI
@@ -18,13 +20,9 @@ class LetterBox(tk.Button):
         The class provides the ability to clear the letter, or to mark as
         correct (green), incorrect (gray), or misplaced (gold).
     '''
-    __slots__ = ("_font", "_is_key", "_marked")
+    __slots__ = ("_font", "_is_key", "_marked", "_letter")
 
-    class Marked(Enum):
-        UNMARKED  = 0
-        CORRECT   = 1
-        INCORRECT = 2
-        MISPLACED = 3
+    Marked = Mark
 
     def __init__(self, 
                  window : tk.Tk, 
@@ -46,52 +44,58 @@ class LetterBox(tk.Button):
         self._font   = font
         self._is_key = False
         self._marked = LetterBox.Marked.UNMARKED
+        self._letter = text
+
+    def _image(self, mark: Mark) -> ImageTk.PhotoImage:
+        ''' private helper: the background image for a mark '''
+        if self._is_key:
+            return {Mark.CORRECT:   WordleGUI._img_correct_key,
+                    Mark.INCORRECT: WordleGUI._img_incorrect_key,
+                    Mark.MISPLACED: WordleGUI._img_misplaced_key}.get(mark, WordleGUI._img_available_key)
+        return {Mark.CORRECT:   WordleGUI._img_correct,
+                Mark.INCORRECT: WordleGUI._img_incorrect,
+                Mark.MISPLACED: WordleGUI._img_misplaced,
+                Mark.INVALID:   WordleGUI._img_invalid}.get(mark, WordleGUI._img_blank)
+
+    def render(self, letter: str, mark: Mark) -> None:
+        ''' method to show a letter and mark with a single config call '''
+        foreground = "black" if mark in (Mark.UNMARKED, Mark.INVALID) else "white"
+        self.config(text = letter[:1], image = self._image(mark), disabledforeground = foreground)
+        self._letter = letter[:1]
+        if mark != Mark.INVALID:
+            self._marked = mark
 
     def getLetter(self) -> str:
         ''' getter to return the letter inside this LetterBox '''
-        return self.cget("text")
+        return self._letter
 
     def setLetter(self, letter: str) -> None:
         ''' setter to update the letter inside this LetterBox '''
-        self.config(text = "" if len(letter) == 0 else letter[0])
+        self._letter = "" if len(letter) == 0 else letter[0]
+        self.config(text = self._letter)
 
     def clear(self) -> None:
         ''' method to clear this LetterBox, reverting to no letter
             and empty background '''
-        self.config(disabledforeground = "black")
-        image = WordleGUI._img_blank if not self._is_key else WordleGUI._img_available_key
-        text  = "" if not self._is_key else self.getLetter()
-        self.config(image = image)
-        self.config(text = text)
-        self._marked = LetterBox.Marked.UNMARKED
+        self.render("" if not self._is_key else self._letter, Mark.UNMARKED)
 
     def markCorrect(self) -> None:
         ''' method to mark this LetterBox as correct (white on green) '''
-        self.config(disabledforeground = "white")
-        image = WordleGUI._img_correct if not self._is_key else WordleGUI._img_correct_key
-        self.config(image = image)
-        self._marked = LetterBox.Marked.CORRECT
+        self.render(self._letter, Mark.CORRECT)
 
     def markIncorrect(self) -> None:
         ''' method to mark this LetterBox as incorrect (white on gray) '''
         if self._marked in [LetterBox.Marked.CORRECT, LetterBox.Marked.MISPLACED]: return
-        self.config(disabledforeground = "white")
-        image = WordleGUI._img_incorrect if not self._is_key else WordleGUI._img_incorrect_key
-        self.config(image = image)
-        self._marked = LetterBox.Marked.INCORRECT
+        self.render(self._letter, Mark.INCORRECT)
 
     def markMisplaced(self) -> None:
         ''' method to mark this LetterBox as out of place (white on gold) '''
         if self._marked in [LetterBox.Marked.CORRECT]: return
-        self.config(disabledforeground = "white")
-        image = WordleGUI._img_misplaced if not self._is_key else WordleGUI._img_misplaced_key
-        self.config(image = image)
-        self._marked = LetterBox.Marked.MISPLACED
+        self.render(self._letter, Mark.MISPLACED)
 
     def markInvalid(self) -> None:
         ''' method to mark this LetterBox as invalid (black on red) '''
-        self.config(disabledforeground = "black")
-        self.config(image = WordleGUI._img_invalid)
+        self.render(self._letter, Mark.INVALID)
 
 ###########################################################################
 class KeyBox(LetterBox):
@@ -110,25 +114,175 @@ class KeyBox(LetterBox):
         self._is_key    = True
 
 ###########################################################################
-class GameState(Enum):
-    ACTIVE = 0
-    WIN    = 1
-    LOSE   = 2
+class FrameScheduler:
+    ''' Runs animation steps from the Tk event loop via window.after instead
+        of sleeping inside callbacks, so input keeps flowing while tiles are
+        revealed. Steps run in the order they were added; each waits for its
+        delay after the previous one. Steps with no delay run back to back
+        until the frame budget is used up, then yield to the event loop.
+        In turbo mode every step runs immediately (no animation at all).
+    '''
+    __slots__ = ("_window", "_queue", "_after_id", "_turbo", "_frame_budget",
+                 "_latencies")
+
+    _RUNNING = "running"  # _after_id while _run is executing steps
+
+    def __init__(self, window: tk.Tk, frame_budget_ms: float = 8.0, turbo: bool = False) -> None:
+        ''' initializer for a FrameScheduler
+        Parameters:
+            window:          the root tk.Tk window whose event loop runs the steps
+            frame_budget_ms: most time to spend running steps before yielding
+            turbo:           if True, run steps immediately and skip all delays
+        '''
+        self._window = window
+        self._queue: deque[tuple[float, Callable]] = deque()
+        self._after_id = None
+        self._turbo = turbo
+        self._frame_budget = frame_budget_ms / 1000
+        self._latencies: dict[str, list[float]] = {}
+
+    def setTurbo(self, turbo: bool) -> None:
+        ''' turns turbo mode on or off; turning it on finishes pending steps now '''
+        self._turbo = turbo
+        if turbo:
+            self.finish()
+
+    def add(self, delay: float, step: Callable) -> None:
+        ''' queues a step to run delay seconds after the previous step '''
+        if self._turbo and not self._queue:
+            step()
+            return
+        self._queue.append((0.0 if self._turbo else delay, step))
+        if self._after_id is None:
+            self._after_id = self._window.after(int(1000 * self._queue[0][0]), self._run)
+
+    def record(self, name: str, start: float) -> None:
+        ''' queues a step that records the time from start (a perf_counter
+            value) until this point of the animation under the given name
+        '''
+        self.add(0, lambda: self._latencies.setdefault(name, []).append(time.perf_counter() - start))
+
+    def pending(self) -> bool:
+        ''' returns True while any step is still waiting to run '''
+        return len(self._queue) > 0
+
+    def finish(self) -> None:
+        ''' runs every pending step right now, ignoring their delays '''
+        self._cancelTimer()
+        # steps run here may add more steps; the marker stops add() from
+        # starting a timer that would fire after the queue is drained
+        self._after_id = FrameScheduler._RUNNING
+        while self._queue:
+            self._queue.popleft()[1]()
+        self._cancelTimer()
+
+    def cancel(self) -> None:
+        ''' drops every pending step without running it '''
+        self._cancelTimer()
+        self._queue.clear()
+
+    def latencyReport(self) -> dict[str, dict[str, float]]:
+        ''' returns count, last, mean and max (in ms) of every recorded latency '''
+        report = {}
+        for name, samples in self._latencies.items():
+            report[name] = {"count": len(samples),
+                            "last_ms": 1000 * samples[-1],
+                            "mean_ms": 1000 * sum(samples) / len(samples),
+                            "max_ms": 1000 * max(samples)}
+        return report
+
+    def _cancelTimer(self) -> None:
+        ''' private helper to cancel the pending window.after callback '''
+        if self._after_id not in (None, FrameScheduler._RUNNING):
+            self._window.after_cancel(self._after_id)
+        self._after_id = None
+
+    def _run(self) -> None:
+        ''' private helper: the window.after callback that runs due steps '''
+        # steps may add more steps; the marker stops add() from starting a
+        # second timer while this one is still draining the queue
+        self._after_id = FrameScheduler._RUNNING
+        if not self._queue:
+            self._after_id = None
+            return
+        start = time.perf_counter()
+        self._queue.popleft()[1]()
+        while self._queue and self._queue[0][0] <= 0 \
+                and time.perf_counter() - start < self._frame_budget:
+            self._queue.popleft()[1]()
+        if self._queue:
+            # always give the event loop at least a millisecond for input
+            delay_ms = max(1, int(1000 * self._queue[0][0]))
+            self._after_id = self._window.after(delay_ms, self._run)
+        else:
+            self._after_id = None
+
+###########################################################################
+class TkRenderer(Renderer):
+    ''' Renderer drawing a WordleController's board onto the LetterBox and
+        KeyBox widgets, one config call per changed widget, with animation
+        steps run by a FrameScheduler.
+    '''
+    __slots__ = ("_letters", "_keyboard", "_final_msg", "_scheduler")
+
+    _DANCE_DELAY : float = 0.08 # time between letter dance on win
+
+    def __init__(self, letters: list[list['LetterBox']], keyboard: dict[str, 'KeyBox'],
+                 final_msg: tk.Button, scheduler: FrameScheduler) -> None:
+        ''' initializer for a TkRenderer
+        Parameters:
+            letters:   the grid of LetterBox tiles, by row then column
+            keyboard:  the KeyBox of every lowercase letter
+            final_msg: the end-of-game message button
+            scheduler: runs the animation steps from the Tk event loop
+        '''
+        super().__init__()
+        self._letters = letters
+        self._keyboard = keyboard
+        self._final_msg = final_msg
+        self._scheduler = scheduler
+
+    def draw(self, change: Change) -> None:
+        if change.kind == "tile":
+            r, c = change.where
+            self._letters[r][c].render(change.letter, change.mark)
+        else:
+            self._keyboard[change.where].render(change.letter, change.mark)
+
+    def schedule(self, delay: float, step: Callable) -> None:
+        self._scheduler.add(delay, step)
+
+    def record(self, name: str, start: float) -> None:
+        self._scheduler.record(name, start)
+
+    def finish(self) -> None:
+        self._scheduler.finish()
+
+    def dance(self, row: int) -> None:
+        schedule = self._scheduler.add
+        shift = row - 1 if row > 0 else row
+        for c, box in enumerate(self._letters[row]):
+            schedule(0, lambda box = box, c = c: (box.lift(),
+                     box.grid(column = c, row = shift, rowspan = 2)))
+            schedule(TkRenderer._DANCE_DELAY, lambda box = box, c = c:
+                     box.grid(column = c, row = row, rowspan = 1))
+
+    def showFinal(self) -> None:
+        self._final_msg.place(x = 250, y = 0)
+
+    def hideFinal(self) -> None:
+        self._final_msg.place_forget()
 
 ###########################################################################
 class WordleGUI:
-    __slots__ = ("_current_row", "_current_col", "_letters", "_keyboard", \
-                 "_handler_function", "_reset_function", "_game_state", \
+    __slots__ = ("_letters", "_keyboard", "_controller", \
                  "_window", "_word_canvas", "_keyboard_canvas", \
-                 "_menubar", "_file_menu", "_final_msg")
+                 "_menubar", "_file_menu", "_final_msg", "_scheduler", \
+                 "_startup_ms")
 
     # class-level variables
     _MAX_WORD_LEN  : int = 5
     _MAX_GUESSES   : int = 6
-    _INVALID_PAUSE : float = 1.25 # time to pause showing invalid in red
-    _INVALID_DELAY : float = 0.1  # time to delay between invalid rollbacks
-    _UPDATE_DELAY  : float = 0.1  # time to delay b/w correct/incorrect reveals
-    _DANCE_DELAY   : float = 0.08 # time between letter dance on win
 
     # these are updated once the root tk.Tk window is created in __init__
     _img_blank         : ImageTk.PhotoImage = None
@@ -145,14 +299,18 @@ class WordleGUI:
     _img_final_msg     : ImageTk.PhotoImage = None
 
     ####################################################################################
-    def __init__(self, handler_function: Callable, new_game_function: Callable) -> None:
+    def __init__(self, handler_function: Callable, new_game_function: Callable,
+                 turbo: bool = False, frame_budget_ms: float = 8.0) -> None:
         ''' initializer for the Wordle GUI, setting up the window for game play
         Parameters:
             handler_function: student-written function to call that process a
                 word entered by the player
             new_game_function: student-written function to call to let student
                 know that the player has started a new game (for resetting)
+            turbo: if True, skip all animations (automated or kiosk play)
+            frame_budget_ms: most time animation steps may take per frame
         '''
+        start = time.perf_counter()
         # create the overall tkinter window, with menus
         self._window = tk.Tk()
         self._window.configure(bg = "#ececec")
@@ -164,20 +322,25 @@ class WordleGUI:
         self._window.bind("<Key>", self._handleLetter)
         self._window.bind("<Return>", self._handleReturn)
 
-        # create the class-level images to be used as backgrounds
-        # (must occur after the root window has been created)
-        WordleGUI._img_blank         = ImageTk.PhotoImage(Image.open('images/blank.png'))
-        WordleGUI._img_correct       = ImageTk.PhotoImage(Image.open('images/correct.png'))
-        WordleGUI._img_incorrect     = ImageTk.PhotoImage(Image.open('images/incorrect.png'))
-        WordleGUI._img_misplaced     = ImageTk.PhotoImage(Image.open('images/misplaced.png'))
-        WordleGUI._img_invalid       = ImageTk.PhotoImage(Image.open('images/invalid.png'))
+        # animations run from the event loop instead of sleeping in callbacks
+        self._scheduler = FrameScheduler(self._window, frame_budget_ms, turbo)
 
-        WordleGUI._img_available_key = ImageTk.PhotoImage(Image.open('images/key_available.png'))
-        WordleGUI._img_correct_key   = ImageTk.PhotoImage(Image.open('images/key_correct.png'))
-        WordleGUI._img_incorrect_key = ImageTk.PhotoImage(Image.open('images/key_incorrect.png'))
-        WordleGUI._img_misplaced_key = ImageTk.PhotoImage(Image.open('images/key_misplaced.png'))
-
-        WordleGUI._img_final_msg     = ImageTk.PhotoImage(Image.open('images/final.png'))
+        # create the class-level images to be used as backgrounds
+        # (must occur after the root window has been created); the pixels
+        # are decoded once per process and the handles shared per window
+        assets = TileAssets.shared()
+        WordleGUI._img_blank         = assets.photo("blank", self._window)
+        WordleGUI._img_correct       = assets.photo("correct", self._window)
+        WordleGUI._img_incorrect     = assets.photo("incorrect", self._window)
+        WordleGUI._img_misplaced     = assets.photo("misplaced", self._window)
+        WordleGUI._img_invalid       = assets.photo("invalid", self._window)
+
+        WordleGUI._img_available_key = assets.photo("key_available", self._window)
+        WordleGUI._img_correct_key   = assets.photo("key_correct", self._window)
+        WordleGUI._img_incorrect_key = assets.photo("key_incorrect", self._window)
+        WordleGUI._img_misplaced_key = assets.photo("key_misplaced", self._window)
+
+        WordleGUI._img_final_msg     = assets.photo("final", self._window)
 
         # create a grid of LetterBox objects (tkButton wrappers) corresponding
         # to game grid entry boxes
@@ -193,17 +356,18 @@ class WordleGUI:
         # plop the window in the center of the screen
         self._window.eval('tk::PlaceWindow . center')
 
-        self._current_row: int = 0
-        self._current_col: int = 0
-        self._game_state:  GameState = GameState.ACTIVE
-
-        self._handler_function: Callable = handler_function
-        self._reset_function:   Callable = new_game_function
-
         self._final_msg = tk.Button(image = WordleGUI._img_final_msg, text = "", \
             compound = "center", disabledforeground = "white", state = "disabled",
             font = ('Arial', 16, 'bold'))
 
+        # the input/state logic lives in the controller; this window is only
+        # its renderer (widgets are touched just for tiles and keys that change)
+        renderer = TkRenderer(self._letters, self._keyboard, self._final_msg, self._scheduler)
+        self._controller = WordleController(handler_function, new_game_function, renderer,
+                                            WordleGUI._MAX_GUESSES, WordleGUI._MAX_WORD_LEN)
+
+        self._startup_ms = 1000 * (time.perf_counter() - start)
+
         '''# and then start listening for keypress events
         self._window.mainloop()'''
 
@@ -212,6 +376,16 @@ class WordleGUI:
         ''' method to make window start listening for keypress events '''
         self._window.mainloop()
 
+    ################################################
+    def startupStats(self) -> dict[str, float]:
+        ''' method returning how long constructing this window took and how
+            much decoded image memory the shared tile assets hold
+        '''
+        assets = TileAssets.shared()
+        stats = {"construct_ms": self._startup_ms, "image_bytes": assets.memoryBytes()}
+        stats.update({f"assets_{name}": ms for name, ms in assets.timings().items()})
+        return stats
+
     ################################################
     def setFinalMessage(self, message: str) -> None:
         ''' method to allow the user to set the final message displayed at
@@ -227,19 +401,10 @@ class WordleGUI:
         Parameters:
             event: a tk.Event, which if not an alphabetic charcter is ignored
         '''
-        # if the game is already over, ignore
-        if self._game_state != GameState.ACTIVE: return
-
-        r = self._current_row;  c = self._current_col
-        if 'A' <= event.char.upper() <= 'Z' and c < WordleGUI._MAX_WORD_LEN:
-            # update the grid with the entered letter
-            self._letters[r][c].setLetter(event.char.upper())
-            self._current_col += 1 
-        elif event.keysym == "BackSpace" and c >= 0:
-            # just clear the previous LetterBox if the user presses backspace
-            c -= 1
-            self._letters[r][c].clear()
-            self._current_col = max(c, 0)
+        if event.keysym == "BackSpace":
+            self._controller.pressBackspace()
+        elif len(event.char) == 1 and 'A' <= event.char.upper() <= 'Z':
+            self._controller.pressLetter(event.char)
 
     ################################################
     def _handleReturn(self, event: tk.Event) -> None:
@@ -247,79 +412,33 @@ class WordleGUI:
         Parameters:
             event: a tk.Event (should only be <Return>)
         '''
-        # if the game is already over, ignore
-        if self._game_state != GameState.ACTIVE: return
-
-        # call the student's code to process the entered word
-        word = "".join(box.getLetter() for box in self._letters[self._current_row])
-        if len(word) < WordleGUI._MAX_WORD_LEN: return
-        result = self._handler_function(word.lower())
-
-        r = self._current_row
-        if result is None:
-            # invalid guess -- marke the word as invalid (black on red),
-            # pause, then roll back leter by leter
-            for c in range(0, WordleGUI._MAX_WORD_LEN):
-                self._letters[r][c].markInvalid()
-            self._word_canvas.update()
-            time.sleep(WordleGUI._INVALID_PAUSE)
-            for c in range(WordleGUI._MAX_WORD_LEN - 1, -1, -1):
-                self._letters[r][c].setLetter("")
-                self._letters[r][c].clear()
-                self._word_canvas.update()
-                time.sleep(WordleGUI._INVALID_DELAY)
-            self._current_col = 0
-        else:
-            # valid guess -- exact_matches should be a list of indices
-            # where letters are correct and in place;  misplaced should be
-            # a list of indices where letters are correct but out of plac
-            #
-            (exact_matches, misplaced) = result
-            for c in range(0, WordleGUI._MAX_WORD_LEN):
-                # color each letter as correct, misplaced, or incorrect
-                if c in exact_matches:
-                    self._letters[r][c].markCorrect()
-                elif c in misplaced:
-                    self._letters[r][c].markMisplaced()
-                else:
-                    self._letters[r][c].markIncorrect()
-                time.sleep(WordleGUI._UPDATE_DELAY)
-                self._word_canvas.update()
-
-            # now update the keyboard... make sure to go in order of
-            # (a) correct, (b) misplaced, then (c) incorrect because
-            # of checks for previously-marked keys (even though inefficient)
-            for c in range(0, WordleGUI._MAX_WORD_LEN):
-                letter = self._letters[r][c].getLetter().lower()
-                if c in exact_matches: self._keyboard[letter].markCorrect()
-            for c in range(0, WordleGUI._MAX_WORD_LEN):
-                letter = self._letters[r][c].getLetter().lower()
-                if c in misplaced:     self._keyboard[letter].markMisplaced()
-            for c in range(0, WordleGUI._MAX_WORD_LEN):
-                letter = self._letters[r][c].getLetter().lower()
-                if c not in exact_matches and c not in misplaced:
-                    self._keyboard[letter].markIncorrect()
-            self._word_canvas.update()
-
-            if len(exact_matches) == WordleGUI._MAX_WORD_LEN:
-                self._game_state = GameState.WIN
-                r = self._current_row
-                for c in range(WordleGUI._MAX_WORD_LEN):
-                    shift = r - 1 if r > 0 else r
-                    self._letters[r][c].lift()
-                    self._letters[r][c].grid(column=c,row=shift,rowspan=2)
-                    self._word_canvas.update()
-                    time.sleep(WordleGUI._DANCE_DELAY)
-                    self._letters[r][c].grid(column=c,row=r,rowspan=1)
-                    self._word_canvas.update()
-                self._final_msg.place(x = 250, y = 0)
-                self._word_canvas.update()
-            else:
-                self._current_row += 1
-                self._current_col = 0
-                if self._current_row >= WordleGUI._MAX_GUESSES:
-                    self._game_state = GameState.LOSE
-                    self._final_msg.place(x = 250, y = 0)
+        self._controller.pressReturn()
+
+    ################################################
+    def controller(self) -> WordleController:
+        ''' getter for the display-independent game input controller '''
+        return self._controller
+
+    def tkCallReport(self) -> dict[str, dict[str, float]]:
+        ''' method returning how many widget config calls each kind of update
+            ("type", "reveal", "rollback", "reset") has made, in total and per
+            board update
+        '''
+        return self._controller.renderer().callReport()
+
+    ################################################
+    def setTurbo(self, turbo: bool) -> None:
+        ''' method to turn animations off (turbo) for automated or kiosk play
+        Parameters:
+            turbo: if True, every reveal, rollback and dance is drawn at once
+        '''
+        self._scheduler.setTurbo(turbo)
+
+    def revealLatency(self) -> dict[str, dict[str, float]]:
+        ''' method returning how long reveals and rollbacks took from the
+            return key until their last frame (count, last, mean, max in ms)
+        '''
+        return self._scheduler.latencyReport()
 
     #######################################
     def _newKeyboard(self) -> tk.Canvas:
@@ -406,21 +525,74 @@ class WordleGUI:
     ###########################
     def _newGame(self) -> None:
         ''' private helper method to reset to a new Wordle game '''
-        for r in range(WordleGUI._MAX_GUESSES):
-            for c in range(WordleGUI._MAX_WORD_LEN):
-                self._letters[r][c].clear()
-        for char in string.ascii_lowercase:
-            self._keyboard[char].clear() 
-        self._current_row = 0
-        self._current_col = 0
-        self._game_state = GameState.ACTIVE
-        self._final_msg.place_forget()
-        self._word_canvas.update()
-        # and let the student's code know that a new game has been started
-        self._reset_function()
+        self._controller.newGame()
 
 ###################
+class _FakeWindow:
+    ''' stands in for tk.Tk in the FrameScheduler checks: after() callbacks
+        are kept until fire() runs them, so no display is needed
+    '''
+    def __init__(self) -> None:
+        self._pending: dict[int, Callable] = {}
+        self._next_id = 0
+        self.ran: list[str] = []
+
+    def after(self, delay_ms: int, callback: Callable) -> int:
+        self._next_id += 1
+        self._pending[self._next_id] = callback
+        return self._next_id
+
+    def after_cancel(self, after_id: int) -> None:
+        del self._pending[after_id]
+
+    def fire(self) -> None:
+        ''' runs every callback registered so far '''
+        pending, self._pending = self._pending, {}
+        for callback in pending.values():
+            callback()
+
+    def timers(self) -> int:
+        return len(self._pending)
+
+    def steps(self) -> list[str]:
+        ''' returns the names the test steps appended to ran '''
+        return list(self.ran)
+
+def _testScheduler() -> None:
+    ''' checks FrameScheduler against a _FakeWindow '''
+    from printTest import printTest
+    window = _FakeWindow()
+    scheduler = FrameScheduler(window)
+    ran = window.ran
+
+    # New Game during a rollback: a step run by finish() queues a reveal,
+    # which must run inside finish() without leaving a timer behind
+    scheduler.add(0.05, lambda: ran.append("rollback"))
+    scheduler.add(0.05, lambda: scheduler.add(0.1, lambda: ran.append("reveal")))
+    scheduler.finish()
+    printTest(_FakeWindow.steps, window, expected = ["rollback", "reveal"], is_method = True)
+    printTest(FrameScheduler.pending, scheduler, expected = False, is_method = True)
+    printTest(_FakeWindow.timers, window, expected = 0, is_method = True)
+    window.fire()
+
+    # a stale timer firing on an empty queue is ignored, and later steps
+    # still get a timer of their own
+    scheduler._run()
+    scheduler.add(0.05, lambda: ran.append("later"))
+    printTest(_FakeWindow.timers, window, expected = 1, is_method = True)
+    window.fire()
+    printTest(_FakeWindow.steps, window, expected = ["rollback", "reveal", "later"], is_method = True)
+    printTest(_FakeWindow.timers, window, expected = 0, is_method = True)
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description = "play Wordle in a Tk window")
+    parser.add_argument("--test", action = "store_true",
+                        help = "check the animation scheduler without opening a window")
+    args = parser.parse_args()
+    if args.test:
+        _testScheduler()
+        return
+
     def processWord(guess: str) -> None: print(guess)
     def newGame() -> None: pass
 
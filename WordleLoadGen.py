@@ -0,0 +1,135 @@
+''' Local load generator for WordleServer: many concurrent keep-alive
+    clients each play whole games (new game, then random allowed guesses
+    until the game ends) and the request latencies are reported.
+
+    Usage:
+        python WordleLoadGen.py [--host H --port P | --spawn]
+                                [--clients N] [--seconds S]
+
+    With --spawn a server is started in this process on a free port first,
+    so one command measures the full round trip locally.
+'''
+import argparse
+import asyncio
+import json
+import random
+import time
+from WordleServer import*
+
+###########################################################################
+class _Client:
+    ''' one keep-alive HTTP connection issuing JSON requests '''
+    __slots__ = ("_reader", "_writer", "_host")
+
+    async def connect(self, host: str, port: int) -> None:
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._host = host
+
+    async def request(self, method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self._host}\r\n"
+                           f"Content-Type: application/json\r\n"
+                           f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self._writer.drain()
+        status = int((await self._reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self._reader.readexactly(length))
+
+    def close(self) -> None:
+        self._writer.close()
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    '''This function reads a percentile from an already sorted list
+    parameters: sorted_values - sorted samples
+    fraction - e.g. 0.99 for p99
+    returns: the sample at that rank (0.0 for no samples)'''
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+async def _play(host: str, port: int, words: list[str], deadline: float,
+                latencies: list[float], counts: dict[str, int]) -> None:
+    ''' one simulated player: play games back to back until the deadline '''
+    client = _Client()
+    await client.connect(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            _, game = await client.request("POST", "/new")
+            latencies.append(time.perf_counter() - start)
+            counts["games"] += 1
+            while game.get("state") == ACTIVE and time.perf_counter() < deadline:
+                start = time.perf_counter()
+                status, game = await client.request(
+                    "POST", "/guess", {"session": game["session"], "guess": random.choice(words)})
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    counts["errors"] += 1
+                    break
+    finally:
+        client.close()
+
+async def runLoad(host: str, port: int, clients: int, seconds: float) -> dict:
+    ''' drives the server with concurrent clients for a fixed time
+    Returns:
+        dict with requests, games, errors, requests_per_sec and latency
+        percentiles (p50_ms, p90_ms, p99_ms, max_ms)
+    '''
+    words = list(loadDictionary(SOLUTIONS_FNAME, ALLOWED_FNAME).allowed())
+    latencies: list[float] = []
+    counts = {"games": 0, "errors": 0}
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(_play(host, port, words, deadline, latencies, counts)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "games": counts["games"],
+        "errors": counts["errors"],
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": 1000 * percentile(latencies, 0.50),
+        "p90_ms": 1000 * percentile(latencies, 0.90),
+        "p99_ms": 1000 * percentile(latencies, 0.99),
+        "max_ms": 1000 * (latencies[-1] if latencies else 0.0),
+    }
+
+async def _spawnAndRun(clients: int, seconds: float, max_sessions: int) -> dict:
+    ''' private helper: start a server in this process, then load it '''
+    manager = SessionManager(loadDictionary(SOLUTIONS_FNAME, ALLOWED_FNAME), max_sessions)
+    server = await WordleServer(manager).start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        report = await runLoad("127.0.0.1", port, clients, seconds)
+    report.update(manager.stats())
+    return report
+
+###################
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "load-test a WordleServer")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8080)
+    parser.add_argument("--spawn", action = "store_true",
+                        help = "start a server in this process instead of using --host/--port")
+    parser.add_argument("--clients", type = int, default = 200)
+    parser.add_argument("--seconds", type = float, default = 10.0)
+    parser.add_argument("--max-sessions", type = int, default = 100_000)
+    args = parser.parse_args()
+
+    if args.spawn:
+        report = asyncio.run(_spawnAndRun(args.clients, args.seconds, args.max_sessions))
+    else:
+        report = asyncio.run(runLoad(args.host, args.port, args.clients, args.seconds))
+    for name, value in report.items():
+        print(f"{name:18s} {value:.3f}" if isinstance(value, float) else f"{name:18s} {value}")
+
+if __name__ == "__main__":
+    main()
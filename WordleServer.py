@@ -0,0 +1,427 @@
+''' Multi-session Wordle server: many concurrent games over one shared
+    dictionary, served as JSON over HTTP/1.1 with asyncio.
+
+    Usage:
+        python WordleServer.py [--host 127.0.0.1] [--port 8080]
+                               [--max-sessions N] [--ttl SECONDS]
+        python WordleServer.py --test
+
+    Endpoints (all responses are JSON):
+        POST /new                                  -> new game
+        POST /guess  {"session": ID, "guess": W}   -> score a guess
+        GET  /state?session=ID                     -> current game state
+        GET  /stats                                -> session counts
+        GET  /words?pattern=?a??e&contains=r&excludes=st&no_doubles=1
+                   &offset=0&limit=50                -> word-helper matches
+'''
+import argparse
+import asyncio
+import json
+import re
+import secrets
+import time
+from array import array
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+from WordDictionary import*
+from CandidateTracker import*
+from DictionaryReloader import*
+from WordQuery import*
+
+SOLUTIONS_FNAME = "wordle-answers.txt"
+ALLOWED_FNAME   = "wordle-allowed-guesses.txt"
+
+ACTIVE = "active"
+WIN    = "win"
+LOSE   = "lose"
+
+###########################################################################
+class GameSession:
+    ''' Compact record of one game: the word lists it started with, the
+        solution row, the guessed columns and their pattern codes. Everything
+        else is derived on demand.
+    '''
+    __slots__ = ("session_id", "dictionary", "solution_row", "guesses", "codes", "state", "last_used")
+
+    def __init__(self, session_id: str, dictionary: WordDictionary, solution_row: int) -> None:
+        self.session_id = session_id
+        self.dictionary = dictionary   # kept for the whole game, even across reloads
+        self.solution_row = solution_row
+        self.guesses = array("I")   # allowed-word column of every guess
+        # pattern code of every guess, as wide as the feedback matrix's codes
+        self.codes = array(dictionary.feedback().matrix().dtype.char)
+        self.state = ACTIVE
+        self.last_used = time.monotonic()
+
+###########################################################################
+class SessionManager:
+    ''' Keeps the live GameSessions in LRU order, evicting the least recently
+        used once max_sessions is reached and any idle for longer than ttl.
+    '''
+    __slots__ = ("_dictionary", "_reloader", "_sessions", "_max_sessions", "_ttl",
+                 "_max_guesses", "_tracker", "_evicted", "_expired")
+
+    def __init__(self, dictionary: WordDictionary, max_sessions: int = 100_000,
+                 ttl: float = 1800.0, max_guesses: int = 6,
+                 reloader: DictionaryReloader | None = None) -> None:
+        ''' initializer for the session manager
+        Parameters:
+            dictionary:   the word lists shared by every session
+            max_sessions: sessions kept before the least recently used is evicted
+            ttl:          seconds a session may sit idle before it expires
+            max_guesses:  guesses allowed per game
+            reloader:     if given, new sessions use its newest word lists
+                          instead of dictionary
+        '''
+        self._dictionary = dictionary
+        self._reloader = reloader
+        self._sessions: OrderedDict[str, GameSession] = OrderedDict()
+        self._max_sessions = max_sessions
+        self._ttl = ttl
+        self._max_guesses = max_guesses
+        # one tracker is replayed per request instead of keeping one per session
+        self._tracker = CandidateTracker(dictionary.letterIndex(), dictionary.solutions())
+        self._evicted = 0
+        self._expired = 0
+
+    def newGame(self) -> dict:
+        ''' starts a game with a random solution and returns its state '''
+        while len(self._sessions) >= self._max_sessions:
+            self._sessions.popitem(last = False)
+            self._evicted += 1
+        dictionary = self._reloader.current() if self._reloader is not None else self._dictionary
+        session = GameSession(secrets.token_urlsafe(12), dictionary,
+                              dictionary.solutions().randomIndex())
+        self._sessions[session.session_id] = session
+        return self._describe(session)
+
+    def guess(self, session_id: str, guess: str) -> dict:
+        ''' scores a guess for a session and returns the new state
+            (raises KeyError for unknown sessions, ValueError for bad guesses)
+        '''
+        session = self._touch(session_id)
+        if session.state != ACTIVE:
+            raise ValueError("game is over")
+        feedback = session.dictionary.feedback()
+        col = feedback.guessIndex(guess)
+        if col < 0:
+            raise ValueError(f"{guess!r} is not an allowed word")
+        code = feedback.code(session.solution_row, guess)
+        # both arrays grow together, so a guess is never counted without its code
+        session.codes.append(code)
+        session.guesses.append(col)
+        if code == 3 ** len(guess) - 1:
+            session.state = WIN
+        elif len(session.guesses) >= self._max_guesses:
+            session.state = LOSE
+        state = self._describe(session)
+        state["result"] = decodePattern(code, len(guess))
+        return state
+
+    def state(self, session_id: str) -> dict:
+        ''' returns the state of a session (raises KeyError if unknown) '''
+        return self._describe(self._touch(session_id))
+
+    def expire(self) -> int:
+        ''' drops every session idle for longer than the ttl
+        Returns:
+            the number of sessions dropped
+        '''
+        cutoff = time.monotonic() - self._ttl
+        dropped = 0
+        # sessions are in least-recently-used order, so stop at the first fresh one
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_used >= cutoff:
+                break
+            self._sessions.popitem(last = False)
+            dropped += 1
+        self._expired += dropped
+        return dropped
+
+    def stats(self) -> dict:
+        ''' returns session counts for monitoring '''
+        return {"sessions": len(self._sessions), "max_sessions": self._max_sessions,
+                "evicted": self._evicted, "expired": self._expired}
+
+    def _touch(self, session_id: str) -> GameSession:
+        ''' private helper: look up a session and mark it most recently used '''
+        session = self._sessions[session_id]
+        if session.last_used < time.monotonic() - self._ttl:
+            del self._sessions[session_id]
+            self._expired += 1
+            raise KeyError(session_id)
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _describe(self, session: GameSession) -> dict:
+        ''' private helper: JSON-ready state of a session '''
+        allowed = session.dictionary.allowed()
+        words = [allowed[col] for col in session.guesses]
+        if self._tracker.words() is not session.dictionary.solutions():
+            # a session started before (or after) the last reload
+            self._tracker = CandidateTracker(session.dictionary.letterIndex(),
+                                             session.dictionary.solutions())
+        self._tracker.reset()
+        for word, code in zip(words, session.codes):
+            self._tracker.update(word, code)
+        state = {
+            "session": session.session_id,
+            "state": session.state,
+            "guesses": words,
+            "patterns": [decodePattern(code, allowed.wordLength()) for code in session.codes],
+            "remaining": self._tracker.remainingCount(),
+            "guesses_left": self._max_guesses - len(words),
+        }
+        if session.state != ACTIVE:
+            state["solution"] = session.dictionary.solutions()[session.solution_row]
+        return state
+
+###########################################################################
+class WordleServer:
+    ''' Minimal asyncio HTTP/1.1 JSON front end for a SessionManager, with
+        keep-alive connections and a background task expiring idle sessions.
+    '''
+    __slots__ = ("_manager", "_words", "_sweep_interval", "_server", "_sweeper")
+
+    _REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large"}
+
+    _MAX_PAGE = 500   # most words one /words response returns
+    _MAX_BODY = 4096  # most request body bytes read; a /guess body is tiny
+
+    def __init__(self, manager: SessionManager, sweep_interval: float = 30.0,
+                 words: WordQuery | None = None) -> None:
+        self._manager = manager
+        self._words = words
+        self._sweep_interval = sweep_interval
+        self._server = None
+        self._sweeper = None
+
+    def setWords(self, words: WordQuery) -> None:
+        ''' replaces the word-helper index (e.g. after the word lists were reloaded) '''
+        self._words = words
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        ''' starts listening and the idle-session sweeper '''
+        self._server = await asyncio.start_server(self._handleConnection, host, port)
+        self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+        return self._server
+
+    async def serveForever(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        ''' starts the server and runs until cancelled '''
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def _sweep(self) -> None:
+        ''' private background task: periodically drop expired sessions '''
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            self._manager.expire()
+
+    async def _handleConnection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        ''' private helper: serve requests on one connection until it closes '''
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = headers.get("content-length", "0")
+                if len(parts) != 3 or not length.isdigit():
+                    # the body cannot be found reliably, so answer and hang up
+                    await self._respond(writer, 400, {"error": "malformed request"}, False)
+                    break
+                if int(length) > self._MAX_BODY:
+                    # refuse before buffering any of it; the unread body
+                    # leaves the stream unusable, so hang up as well
+                    await self._respond(writer, 413, {"error": "request body too large"}, False)
+                    break
+                body = await reader.readexactly(int(length)) if int(length) else b""
+                status, payload = self._route(parts[0], parts[1], body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: dict,
+                       keep_alive: bool) -> None:
+        ''' private helper: write one JSON response '''
+        data = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {self._REASONS[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                     f"\r\n".encode() + data)
+        await writer.drain()
+
+    def _route(self, method: str, target: str, body: bytes) -> tuple[int, dict]:
+        ''' private helper: dispatch one request to the session manager '''
+        url = urlsplit(target)
+        try:
+            if url.path == "/new":
+                if method != "POST":
+                    return 405, {"error": "use POST"}
+                return 200, self._manager.newGame()
+            if url.path == "/guess":
+                if method != "POST":
+                    return 405, {"error": "use POST"}
+                request = json.loads(body or b"{}")
+                if not isinstance(request, dict):
+                    raise ValueError("request body must be a JSON object")
+                return 200, self._manager.guess(str(request.get("session", "")),
+                                                str(request.get("guess", "")).lower())
+            if url.path == "/state":
+                session_id = parse_qs(url.query).get("session", [""])[0]
+                return 200, self._manager.state(session_id)
+            if url.path == "/stats":
+                return 200, self._manager.stats()
+            if url.path == "/words" and self._words is not None:
+                return 200, self._matchWords(parse_qs(url.query))
+            return 404, {"error": f"no such endpoint {url.path}"}
+        except KeyError:
+            return 404, {"error": "unknown or expired session"}
+        except ValueError as err:
+            return 400, {"error": str(err)}
+
+    def _matchWords(self, query: dict[str, list[str]]) -> dict:
+        ''' private helper: one page of word-helper matches '''
+        def param(name: str) -> str:
+            return query.get(name, [""])[0]
+        matches = self._words.match(param("pattern") or None, param("contains"), param("excludes"),
+                                    param("no_doubles").lower() in ("1", "true", "yes"),
+                                    int(param("length")) if param("length") else None)
+        offset = max(int(param("offset") or 0), 0)
+        limit = min(max(int(param("limit") or 50), 0), self._MAX_PAGE)
+        return {"count": matches.count(), "offset": offset, "words": matches.page(offset, limit)}
+
+###################
+class _RecordingWriter:
+    ''' stands in for an asyncio.StreamWriter in the checks: keeps what was written '''
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+def _exchange(raw: bytes) -> list[int]:
+    ''' private test helper: feeds raw request bytes through one connection
+        of a new server
+    Returns:
+        the status code of every response, in order
+    '''
+    server = WordleServer(SessionManager(loadDictionary(SOLUTIONS_FNAME, ALLOWED_FNAME)))
+    async def run() -> bytes:
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        writer = _RecordingWriter()
+        await server._handleConnection(reader, writer)
+        return bytes(writer.data)
+    # a response's status line follows straight after the previous JSON body
+    return [int(status) for status in re.findall(rb"HTTP/1\.1 (\d{3}) ", asyncio.run(run()))]
+
+def _request(method: str, target: str, body: bytes = b"", length: str | None = None) -> bytes:
+    ''' private test helper: one raw request (length overrides Content-Length) '''
+    length = str(len(body)) if length is None else length
+    return f"{method} {target} HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode() + body
+
+def _checkEviction() -> tuple[int, bool, bool, bool]:
+    ''' private test helper: three games in a two-session manager, touching
+        the first before the third starts
+    Returns:
+        sessions evicted, and whether the first, second and third are still live
+    '''
+    manager = SessionManager(loadDictionary(SOLUTIONS_FNAME, ALLOWED_FNAME), max_sessions = 2)
+    ids = [manager.newGame()["session"]]
+    ids.append(manager.newGame()["session"])
+    manager.state(ids[0])
+    ids.append(manager.newGame()["session"])
+    live = []
+    for session_id in ids:
+        try:
+            manager.state(session_id)
+            live.append(True)
+        except KeyError:
+            live.append(False)
+    return manager.stats()["evicted"], live[0], live[1], live[2]
+
+def _checkExpiry() -> tuple[int, int]:
+    ''' private test helper: two games idle past a short ttl, then a fresh one
+    Returns:
+        sessions expire() dropped, and sessions left
+    '''
+    manager = SessionManager(loadDictionary(SOLUTIONS_FNAME, ALLOWED_FNAME), ttl = 0.05)
+    manager.newGame()
+    manager.newGame()
+    time.sleep(0.1)
+    manager.newGame()
+    return manager.expire(), manager.stats()["sessions"]
+
+def _test() -> None:
+    ''' checks session eviction and the request handler's error answers '''
+    from printTest import printTest
+    printTest(_checkEviction, expected = (1, True, False, True))
+    printTest(_checkExpiry, expected = (2, 1))
+
+    printTest(_exchange, _request("POST", "/new") + _request("GET", "/stats"),
+              expected = [200, 200])
+    printTest(_exchange, _request("POST", "/guess", b'{"session": "nope", "guess": "crane"}'),
+              expected = [404])
+    # a body that is JSON but not an object keeps the connection open
+    printTest(_exchange, _request("POST", "/guess", b"[1]") + _request("GET", "/stats"),
+              expected = [400, 200])
+    # unreadable request lines and lengths, or too long a body, end the connection
+    printTest(_exchange, b"GARBAGE\r\n\r\n" + _request("GET", "/stats"), expected = [400])
+    printTest(_exchange, _request("POST", "/guess", length = "ten") + _request("GET", "/stats"),
+              expected = [400])
+    printTest(_exchange, _request("POST", "/guess", length = str(10 ** 12)) + _request("GET", "/stats"),
+              expected = [413])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "serve many Wordle games over HTTP")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8080)
+    parser.add_argument("--max-sessions", type = int, default = 100_000)
+    parser.add_argument("--ttl", type = float, default = 1800.0)
+    parser.add_argument("--test", action = "store_true", help = "run the self-checks and exit")
+    args = parser.parse_args()
+    if args.test:
+        _test()
+        return
+
+    # edits to the word lists apply to games started after the reload
+    reloader = DictionaryReloader(SOLUTIONS_FNAME, ALLOWED_FNAME)
+    manager = SessionManager(reloader.current(), args.max_sessions, args.ttl,
+                             reloader = reloader)
+    server = WordleServer(manager, words = WordQuery.fromDictionary(reloader.current()))
+    reloader.addListener(lambda dictionary: server.setWords(WordQuery.fromDictionary(dictionary)))
+    print(f"serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serveForever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from FeedbackMatrix import*
+
+###########################################################################
+# The solver picks the guess whose feedback splits the remaining candidate
+# solutions most evenly, i.e. the guess with the largest expected
+# information (Shannon entropy of the pattern distribution, in bits).
+# The opening move has to consider every allowed guess against every
+# solution, so it is farmed out to a process pool once and the ranked
+# table is cached next to the feedback matrix.
+###########################################################################
+
+_OPENER_MAGIC   = b"WOPN"
+_OPENER_VERSION = 1
+_OPENER_HEADER  = struct.Struct("<4sHI32s")  # magic, version, count, digest
+_COLUMN_CHUNK   = 1024                        # guesses scored per bincount pass
+
+def patternEntropy(matrix: np.ndarray, candidates: np.ndarray,
+                   col_start: int = 0, col_end: int | None = None,
+                   patterns: int = 3 ** 5) -> np.ndarray:
+    '''This function computes the expected information of a range of guesses
+    parameters: matrix - (solutions x guesses) pattern code matrix
+    candidates - rows of the solutions that are still possible
+    col_start, col_end - range of guess columns to score
+    patterns - number of distinct codes (3 ** word length)
+    returns: float array of entropies (bits), one per guess column'''
+    if col_end is None:
+        col_end = matrix.shape[1]
+    entropies = np.zeros(col_end - col_start, dtype=np.float64)
+    if len(candidates) == 0:
+        return entropies
+    rows = matrix[candidates]
+    for start in range(col_start, col_end, _COLUMN_CHUNK):
+        end = min(start + _COLUMN_CHUNK, col_end)
+        codes = rows[:, start:end].astype(np.int64)
+        # count each (guess, pattern) pair in one bincount by offsetting
+        # every guess column into its own block of pattern buckets
+        codes += np.arange(end - start, dtype=np.int64) * patterns
+        counts = np.bincount(codes.ravel(), minlength=(end - start) * patterns)
+        p = counts.reshape(end - start, patterns) / len(candidates)
+        logs = np.log2(p, out=np.zeros_like(p), where=p > 0)
+        entropies[start - col_start:end - col_start] = -(p * logs).sum(axis=1)
+    return entropies
+
+# matrix memory-mapped once per worker process by _initWorker
+_worker_matrix: np.ndarray | None = None
+_worker_patterns = 3 ** 5
+
+def _initWorker(path: str, patterns: int) -> None:
+    ''' process pool initializer: map the shared matrix file '''
+    global _worker_matrix, _worker_patterns
+    _worker_matrix = FeedbackMatrix.mapFile(path)
+    _worker_patterns = patterns
+
+def _openerChunk(bounds: tuple[int, int]) -> np.ndarray:
+    ''' process pool task: entropies for a range of guesses over all solutions '''
+    candidates = np.arange(_worker_matrix.shape[0])
+    return patternEntropy(_worker_matrix, candidates, bounds[0], bounds[1], _worker_patterns)
+
+
+###########################################################################
+class WordleSolver:
+    ''' Entropy-maximizing guess suggester over a FeedbackMatrix. The solver
+        itself holds no game state; callers pass in the candidate rows
+        that are still possible.
+    '''
+    __slots__ = ("_feedback", "_workers", "_patterns", "_opener_scores")
+
+    def __init__(self, feedback: FeedbackMatrix, workers: int | None = None) -> None:
+        ''' initializer for the solver
+        Parameters:
+            feedback: the precomputed feedback matrix
+            workers:  processes used for the opening search (default: all cores)
+        '''
+        self._feedback = feedback
+        self._workers = workers or os.cpu_count() or 1
+        self._patterns = 3 ** feedback.solutionWords().wordLength()
+        self._opener_scores = None
+
+    def allCandidates(self) -> np.ndarray:
+        ''' returns the candidate rows at the start of a game (every solution) '''
+        return np.arange(self._feedback.matrix().shape[0])
+
+    def filterCandidates(self, candidates: np.ndarray, guess: str, code: int) -> np.ndarray:
+        ''' narrows the candidate rows to those that would have produced the
+            given feedback code for the given guess
+        '''
+        col = self._feedback.guessIndex(guess)
+        if col < 0:
+            words = self._feedback.solutionWords()
+            keep = [patternCode(guess, words[row]) == code for row in candidates]
+            return candidates[np.array(keep, dtype=bool)]
+        return candidates[self._feedback.matrix()[candidates, col] == code]
+
+    def openerScores(self) -> np.ndarray:
+        ''' returns the entropy of every allowed guess as an opening move,
+            loading it from the cache or computing it on a process pool
+        '''
+        if self._opener_scores is None:
+            path = cachePath(f"openers-v{_OPENER_VERSION}-{self._feedback.digest()[:16]}.bin")
+            scores = self._loadOpeners(path)
+            if scores is None:
+                scores = self._computeOpeners()
+                self._saveOpeners(path, scores)
+            self._opener_scores = scores
+        return self._opener_scores
+
+    def rankedOpeners(self, top: int = 10) -> list[tuple[str, float]]:
+        ''' returns the best opening guesses as (word, bits) pairs '''
+        scores = self.openerScores()
+        words = self._feedback.guessWords()
+        order = np.argsort(-scores, kind="stable")[:top]
+        return [(words[i], float(scores[i])) for i in order]
+
+    def rankGuesses(self, candidates: np.ndarray, top: int = 10) -> list[tuple[str, float]]:
+        ''' returns the best guesses for the given candidates as (word, bits)
+            pairs; guesses that could themselves be the answer win ties
+        '''
+        scores = self._scores(candidates)
+        words = self._feedback.guessWords()
+        order = np.argsort(-scores, kind="stable")[:top]
+        return [(words[i], float(scores[i])) for i in order]
+
+    def bestGuess(self, candidates: np.ndarray) -> str:
+        ''' returns the single best next guess for the given candidates '''
+        solutions = self._feedback.solutionWords()
+        if len(candidates) == 0:
+            return ""
+        if len(candidates) <= 2:
+            return solutions[candidates[0]]
+        return self._feedback.guessWords()[int(np.argmax(self._scores(candidates)))]
+
+    def _scores(self, candidates: np.ndarray) -> np.ndarray:
+        ''' private helper: entropy of every guess, with a small bonus for
+            guesses that are still possible solutions
+        '''
+        if len(candidates) == self._feedback.matrix().shape[0]:
+            scores = self.openerScores().astype(np.float64)
+        else:
+            scores = patternEntropy(self._feedback.matrix(), candidates, patterns=self._patterns)
+        cols = self._feedback.solutionColumns()[candidates]
+        scores[cols[cols >= 0]] += 1e-6
+        return scores
+
+    def _computeOpeners(self) -> np.ndarray:
+        ''' private helper: score every opening guess across the process pool '''
+        matrix = self._feedback.matrix()
+        cols = matrix.shape[1]
+        if self._workers <= 1 or cols <= _COLUMN_CHUNK:
+            return patternEntropy(matrix, self.allCandidates(),
+                                  patterns=self._patterns).astype(np.float32)
+        step = max(_COLUMN_CHUNK, -(-cols // (self._workers * 4)))
+        bounds = [(start, min(start + step, cols)) for start in range(0, cols, step)]
+        with ProcessPoolExecutor(self._workers, initializer=_initWorker,
+                                 initargs=(self._feedback.path(), self._patterns)) as pool:
+            parts = list(pool.map(_openerChunk, bounds))
+        return np.concatenate(parts).astype(np.float32)
+
+    def _loadOpeners(self, path: str) -> np.ndarray | None:
+        ''' private helper to read the cached opener table, if valid '''
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _OPENER_HEADER.size:
+            return None
+        magic, version, count, digest = _OPENER_HEADER.unpack_from(data)
+        if magic != _OPENER_MAGIC or version != _OPENER_VERSION \
+                or digest != bytes.fromhex(self._feedback.digest()) \
+                or count != self._feedback.matrix().shape[1] \
+                or len(data) != _OPENER_HEADER.size + 4 * count:
+            return None
+        return np.frombuffer(data, dtype=np.float32, offset=_OPENER_HEADER.size)
+
+    def _saveOpeners(self, path: str, scores: np.ndarray) -> None:
+        ''' private helper to write the opener table atomically '''
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_OPENER_HEADER.pack(_OPENER_MAGIC, _OPENER_VERSION, len(scores),
+                                        bytes.fromhex(self._feedback.digest())))
+            f.write(scores.astype(np.float32).tobytes())
+        os.replace(tmp_path, path)
+
+###################
+def main() -> None:
+    solutions = WordStore(open("wordle-answers.txt").read().split())
+    allowed = WordStore(open("wordle-allowed-guesses.txt").read().split())
+    solver = WordleSolver(FeedbackMatrix(solutions, allowed))
+    for word, bits in solver.rankedOpeners():
+        print(f"{word}  {bits:.3f} bits")
+    # other word lengths have 3 ** length codes, not 243
+    sixes = WordStore(["banana", "bandit", "castle", "folder", "garden"], 6)
+    with scratchCache():
+        solver = WordleSolver(FeedbackMatrix(sixes, WordStore(["barber", "castle", "garden"], 6)))
+        # castle and garden split the five solutions completely, log2(5) bits
+        printTest(WordleSolver.rankedOpeners, solver, 2,
+                  expected=[("castle", 2.321928024291992), ("garden", 2.321928024291992)], is_method=True)
+
+if __name__ == "__main__":
+    main()
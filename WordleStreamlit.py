@@ -0,0 +1,154 @@
+''' Streamlit play mode for Wordle.
+
+    Usage:
+        streamlit run WordleStreamlit.py
+
+    Streamlit re-executes this script on every interaction, so everything
+    expensive lives in st.cache_resource (loaded once per server process
+    and shared by every browser session), each player's game lives in
+    st.session_state, and finished rows are rendered once and reused.
+'''
+import functools
+import time
+import streamlit as st
+from WordDictionary import*
+from CandidateTracker import*
+from WordleSolver import*
+
+SOLUTIONS_FNAME = "wordle-answers.txt"
+ALLOWED_FNAME   = "wordle-allowed-guesses.txt"
+MAX_GUESSES     = 6
+
+_COLORS = {CORRECT: "#6aaa64", MISPLACED: "#c9b458", INCORRECT: "#787c7e"}
+_TILE = ("display:inline-block;width:52px;height:52px;margin:2px;line-height:52px;"
+         "text-align:center;font:bold 28px Arial;color:{fg};background:{bg};"
+         "border:2px solid {border}")
+
+###########################################################################
+@st.cache_resource
+def sharedDictionary() -> WordDictionary:
+    ''' the word lists, feedback matrix and letter index, loaded once per
+        server process and shared by every session
+    '''
+    dictionary = loadDictionary(SOLUTIONS_FNAME, ALLOWED_FNAME)
+    dictionary.feedback()
+    dictionary.letterIndex()
+    return dictionary
+
+@st.cache_resource
+def sharedSolver() -> WordleSolver:
+    ''' the hint solver, with its opener table loaded once per process '''
+    solver = WordleSolver(sharedDictionary().feedback())
+    solver.openerScores()
+    return solver
+
+@functools.lru_cache(maxsize = 65536)
+def rowHtml(word: str, code: int) -> str:
+    ''' HTML for one scored row; rows repeat across players, so cache them '''
+    tiles = []
+    for ch in word:
+        digit = code % 3
+        code //= 3
+        color = _COLORS[digit]
+        tiles.append(f"<span style='{_TILE.format(fg = 'white', bg = color, border = color)}'>"
+                     f"{ch.upper()}</span>")
+    return "<div>" + "".join(tiles) + "</div>"
+
+@functools.lru_cache(maxsize = 1)
+def emptyRowHtml(word_len: int) -> str:
+    ''' HTML for a row that has not been guessed yet '''
+    tile = f"<span style='{_TILE.format(fg = 'black', bg = 'white', border = '#d3d6da')}'>&nbsp;</span>"
+    return "<div>" + tile * word_len + "</div>"
+
+def keyboardHtml(guesses: list[str], codes: list[int]) -> str:
+    ''' HTML for the keyboard, colored by the best feedback seen per letter '''
+    best: dict[str, int] = {}
+    for word, code in zip(guesses, codes):
+        for ch in word:
+            best[ch] = max(best.get(ch, -1), code % 3)
+            code //= 3
+    rows = []
+    for letters in ("qwertyuiop", "asdfghjkl", "zxcvbnm"):
+        keys = []
+        for ch in letters:
+            bg = _COLORS[best[ch]] if ch in best else "#d3d6da"
+            fg = "white" if ch in best else "black"
+            keys.append(f"<span style='display:inline-block;width:32px;margin:2px;padding:6px 0;"
+                        f"text-align:center;font:bold 16px Arial;color:{fg};background:{bg};"
+                        f"border-radius:4px'>{ch.upper()}</span>")
+        rows.append("<div>" + "".join(keys) + "</div>")
+    return "".join(rows)
+
+###########################################################################
+def newGame() -> None:
+    ''' resets this player's game in st.session_state '''
+    dictionary = sharedDictionary()
+    st.session_state.solution_row = dictionary.solutions().randomIndex()
+    st.session_state.guesses = []
+    st.session_state.codes = []
+    st.session_state.board_html = ""       # finished rows, appended once each
+    st.session_state.tracker = CandidateTracker(dictionary.letterIndex(), dictionary.solutions())
+    st.session_state.message = ""
+
+def submitGuess() -> None:
+    ''' form callback: score the typed guess and update the game '''
+    dictionary = sharedDictionary()
+    guess = st.session_state.guess_input.strip().lower()
+    st.session_state.guess_input = ""
+    if gameOver():
+        return
+    if guess not in dictionary.allowed():
+        st.session_state.message = f"'{guess}' is not in the word list"
+        return
+    code = dictionary.feedback().code(st.session_state.solution_row, guess)
+    st.session_state.guesses.append(guess)
+    st.session_state.codes.append(code)
+    st.session_state.board_html += rowHtml(guess, code)
+    st.session_state.tracker.update(guess, code)
+    solution = dictionary.solutions()[st.session_state.solution_row]
+    if guess == solution:
+        st.session_state.message = "You Win!!! ;)"
+    elif len(st.session_state.guesses) >= MAX_GUESSES:
+        st.session_state.message = f"Out of Guesses :( The word was {solution.upper()}"
+    else:
+        st.session_state.message = ""
+
+def gameOver() -> bool:
+    ''' True once this player has won or used every guess '''
+    guesses = st.session_state.guesses
+    solution = sharedDictionary().solutions()[st.session_state.solution_row]
+    return len(guesses) >= MAX_GUESSES or (len(guesses) > 0 and guesses[-1] == solution)
+
+###################
+def main() -> None:
+    start = time.perf_counter()
+    st.markdown("# Oke Wordle")
+    if "solution_row" not in st.session_state:
+        newGame()
+
+    word_len = sharedDictionary().solutions().wordLength()
+    empty_rows = MAX_GUESSES - len(st.session_state.guesses)
+    st.markdown(st.session_state.board_html + emptyRowHtml(word_len) * empty_rows,
+                unsafe_allow_html = True)
+    if st.session_state.message:
+        st.info(st.session_state.message)
+
+    with st.form("guess_form", clear_on_submit = False):
+        st.text_input("Your guess", max_chars = word_len, key = "guess_input",
+                      disabled = gameOver())
+        st.form_submit_button("Guess", on_click = submitGuess, disabled = gameOver())
+
+    st.markdown(keyboardHtml(st.session_state.guesses, st.session_state.codes),
+                unsafe_allow_html = True)
+
+    left, right = st.columns(2)
+    left.button("New Game", on_click = newGame)
+    if right.button("Hint", disabled = gameOver()):
+        hint = sharedSolver().bestGuess(st.session_state.tracker.remainingIndices())
+        right.write(f"Try **{hint.upper()}**")
+
+    st.sidebar.metric("Words left", st.session_state.tracker.remainingCount())
+    st.sidebar.caption(f"rerun {1000 * (time.perf_counter() - start):.1f} ms")
+
+if __name__ == "__main__":
+    main()
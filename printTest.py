@@ -1,6 +1,12 @@
 ################################################################################
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import redirect_stdout
 import io
+import json
+import pickle
+import statistics
+import sys
+import time
 from typing import Callable  # use Callable as a type hint
 import inspect
 ################################################################################
@@ -23,6 +29,11 @@ def printTest(function: Callable, *args: tuple, **kwargs: dict) -> None:
     Returns:
         nothing
     '''
+    # while a TestRunner is collecting (see TestRunner.collect), just hand it the case
+    if TestRunner._collecting is not None:
+        TestRunner._collecting.add(function, *args, **kwargs)
+        return
+
     # grab the frame object associated with the student's calling module, and then import
     # that module (outside of this module) so we can call the function to be tested
     calling_frame = inspect.stack()[-1][0]
@@ -86,6 +97,209 @@ def printTest(function: Callable, *args: tuple, **kwargs: dict) -> None:
     print(f" [{is_correct}]  Result   : {repr(result)}")
     print(f"      Expected : {repr(expected)}")
 
+################################################################################
+class TestCase:
+    ''' One printTest-style check, with its target resolved once so it can be
+        called directly (no stack inspection, no eval) and timed.
+    '''
+    __slots__ = ("function", "args", "expected", "fruitful", "is_method", "name")
+
+    def __init__(self, function: Callable, args: tuple, expected: object,
+                 fruitful: bool = True, is_method: bool = False) -> None:
+        self.function = function
+        self.args = args
+        self.expected = expected
+        self.fruitful = fruitful
+        self.is_method = is_method
+        # same text printTest shows, e.g. "computeSum(11, 22, 33)"
+        shown = args[1:] if is_method else args
+        self.name = f"{function.__name__}({', '.join(repr(arg) for arg in shown)})"
+
+    def call(self) -> object:
+        ''' calls the target once; returns its result, or what it printed
+            (stripped) if it is not fruitful
+        '''
+        if self.fruitful:
+            return self.function(*self.args)
+        f = io.StringIO()
+        with redirect_stdout(f):
+            self.function(*self.args)
+        return f.getvalue().strip()
+
+def _runCase(case: TestCase, repeat: int, number: int) -> dict:
+    ''' runs and times one case: repeat samples of number calls each
+    Returns:
+        dict with name, passed, result, expected, error and timings in
+        microseconds per call (min_us, median_us, p95_us)
+    '''
+    report = {"name": case.name, "passed": False, "result": None,
+              "expected": repr(case.expected), "error": None}
+    try:
+        result = case.call()
+        report["result"] = repr(result)
+        report["passed"] = bool(result == case.expected)
+        samples = []
+        clock = time.perf_counter
+        for _ in range(repeat):
+            start = clock()
+            for _ in range(number):
+                case.call()
+            samples.append((clock() - start) / number)
+    except Exception as err:
+        report["error"] = f"{type(err).__name__}: {err}"
+        return report
+    samples.sort()
+    report.update({"repeat": repeat, "number": number,
+                   "min_us": 1e6 * samples[0],
+                   "median_us": 1e6 * statistics.median(samples),
+                   "p95_us": 1e6 * samples[min(len(samples) - 1, int(0.95 * len(samples)))]})
+    return report
+
+def _runChunk(cases: list[TestCase], repeat: int, number: int) -> list[dict]:
+    ''' process pool task: runs a share of the cases '''
+    return [_runCase(case, repeat, number) for case in cases]
+
+class TestRunner:
+    ''' Runs printTest-style checks in bulk: each target is resolved once and
+        called directly, optionally timed (repeat samples of number calls),
+        with independent cases spread over worker processes. Results come
+        back as dicts and can be written as JSON.
+        Example usage:
+            runner = TestRunner(repeat = 5, number = 1000)
+            runner.add(computeSum, 11, 22, 33, expected = 66)
+            runner.run()
+            runner.report()
+    '''
+    __slots__ = ("_cases", "_repeat", "_number", "_workers", "_results")
+
+    # the runner printTest hands its cases to, while one is collecting
+    _collecting: 'TestRunner | None' = None
+
+    def __init__(self, repeat: int = 1, number: int = 1, workers: int = 1) -> None:
+        ''' initializer for a TestRunner
+        Parameters:
+            repeat:  timing samples per case (min/median/p95 are over these)
+            number:  calls per timing sample
+            workers: processes to spread the cases over (1 runs in this process)
+        '''
+        self._cases: list[TestCase] = []
+        self._repeat = max(1, repeat)
+        self._number = max(1, number)
+        self._workers = max(1, workers)
+        self._results: list[dict] = []
+
+    def add(self, function: Callable, *args: tuple, **kwargs: dict) -> None:
+        ''' adds a case, with the same arguments as printTest '''
+        if "expected" not in kwargs:
+            raise ValueError(f'{function.__name__}: must provide an "expected" keyword argument')
+        self._cases.append(TestCase(function, args, kwargs["expected"],
+                                    kwargs.get("fruitful", True) != False,
+                                    bool(kwargs.get("is_method", False))))
+
+    def collect(self, test_main: Callable) -> None:
+        ''' runs an existing test main, adding its printTest calls as cases
+            instead of running them
+        '''
+        TestRunner._collecting = self
+        try:
+            test_main()
+        finally:
+            TestRunner._collecting = None
+
+    def cases(self) -> list[TestCase]:
+        ''' getter for the cases added so far '''
+        return self._cases
+
+    def run(self) -> list[dict]:
+        ''' runs every case
+        Returns:
+            one result dict per case, in the order they were added
+        '''
+        local = []
+        remote = []
+        for i, case in enumerate(self._cases):
+            # cases that cannot cross a process boundary (lambdas, local
+            # functions) always run here
+            try:
+                pickle.dumps(case)
+                remote.append(i)
+            except Exception:
+                local.append(i)
+        results: list[dict | None] = [None] * len(self._cases)
+        if self._workers > 1 and len(remote) > 1:
+            shares = [remote[w::self._workers] for w in range(self._workers)]
+            shares = [share for share in shares if share]
+            with ProcessPoolExecutor(len(shares)) as pool:
+                futures = [pool.submit(_runChunk, [self._cases[i] for i in share],
+                                       self._repeat, self._number) for share in shares]
+                for share, future in zip(shares, futures):
+                    for i, result in zip(share, future.result()):
+                        results[i] = result
+        else:
+            local = list(range(len(self._cases)))
+        for i in local:
+            results[i] = _runCase(self._cases[i], self._repeat, self._number)
+        self._results = results
+        return results
+
+    def report(self, simple: bool = False) -> None:
+        ''' prints the last run's results in printTest's format, plus timings '''
+        correct, incorrect = ("+", "X") if simple else ("✓", "✗")
+        for result in self._results:
+            if result["error"] is not None:
+                print(f"ERROR in evaluating {result['name']}: {result['error']}")
+                continue
+            print(f"Testing {result['name']}:")
+            print(f" [{correct if result['passed'] else incorrect}]  Result   : {result['result']}")
+            print(f"      Expected : {result['expected']}")
+            print(f"      Time     : min {result['min_us']:.2f} us, median {result['median_us']:.2f} us,"
+                  f" p95 {result['p95_us']:.2f} us ({result['repeat']} x {result['number']} calls)")
+        passed = sum(1 for result in self._results if result["passed"])
+        print(f"{passed} of {len(self._results)} passed")
+
+    def toJSON(self, filename: str | None = None) -> str:
+        ''' returns the last run's results as JSON, also writing them to
+            filename if one is given
+        '''
+        text = json.dumps({"repeat": self._repeat, "number": self._number,
+                           "cases": self._results}, indent = 2)
+        if filename is not None:
+            with open(filename, "w") as f:
+                f.write(text + "\n")
+        return text
+
+def runMain(test_main: Callable, argv: list[str] | None = None) -> None:
+    ''' entry point for a module's test main: runs it as usual, or with
+        --bench runs its printTest calls through a TestRunner instead
+        Example usage (at the bottom of a module):
+            if __name__ == "__main__":
+                runMain(main)
+        Options:
+            --bench           collect and time the printTest calls
+            --repeat N        timing samples per case (default 5)
+            --number N        calls per timing sample (default 100)
+            --workers N       worker processes (default 1)
+            --json FILE       also write the results as JSON ("-" for stdout only)
+    '''
+    argv = sys.argv[1:] if argv is None else argv
+    if "--bench" not in argv:
+        test_main()
+        return
+    options = {"--repeat": 5, "--number": 100, "--workers": 1, "--json": None}
+    for i, arg in enumerate(argv):
+        if arg in options and i + 1 < len(argv):
+            value = argv[i + 1]
+            options[arg] = value if arg == "--json" else int(value)
+    runner = TestRunner(options["--repeat"], options["--number"], options["--workers"])
+    runner.collect(test_main)
+    runner.run()
+    if options["--json"] == "-":
+        print(runner.toJSON())
+    else:
+        runner.report()
+        if options["--json"] is not None:
+            runner.toJSON(options["--json"])
+
 ###################
 def main() -> None:
 
@@ -100,6 +314,14 @@ def main() -> None:
     printTest(Example.getDataProductSum, e, 3, 4, expected = 70, is_method = True)
     printTest(Example.printData, e, expected = "22", fruitful = False, is_method = True)
 
+    # the same checks, resolved once, timed and reported by a TestRunner
+    runner = TestRunner(repeat = 5, number = 1000)
+    runner.add(giveSum, 1, 2, 3, expected = 6)
+    runner.add(printSum, 1, 2, 3, expected = '6', fruitful = False)
+    runner.add(Example.getDataProductSum, e, 3, 4, expected = 70, is_method = True)
+    runner.run()
+    runner.report()
+
 ##########################
 if __name__ == "__main__":
 
@@ -1,35 +1,196 @@
+import os
+import re
+import numpy as np
+from typing import Iterator
 from printTest import*
 
+# PGM ("portable graymap") files: a header of whitespace-separated tokens
+# (magic number, width, height, max gray level, with "#" comments allowed
+# anywhere in between), then the pixels -- as decimal text for P2, or as raw
+# bytes for P5 (one byte per pixel, or two big-endian bytes when the max
+# level is above 255).
+
+_COMMENT = re.compile(rb"#[^\n]*")
+
+def _readHeader(f) -> tuple[str, list[str], int, int, int, int]:
+    '''This function reads the header of an open (binary) PGM file
+    parameters: f - file opened with "rb", positioned at the start
+    returns: magic number, comment lines, width, height, max level and the
+    byte offset of the first pixel'''
+    buf= f.read(4096)
+    tokens= []
+    comments= []
+    i= 0
+    while len(tokens) < 4:
+        if i >= len(buf):
+            more= f.read(4096)
+            if not more:
+                raise ValueError("truncated PGM header")
+            buf += more
+            continue
+        ch= buf[i:i+1]
+        if ch.isspace():
+            i += 1
+        elif ch == b"#":
+            end= buf.find(b"\n", i)
+            while end < 0:
+                more= f.read(4096)
+                if not more:
+                    end= len(buf)
+                    break
+                buf += more
+                end= buf.find(b"\n", i)
+            comments.append(buf[i:end].decode("latin-1").rstrip("\r"))
+            i= end
+        else:
+            start= i
+            while i < len(buf) and not buf[i:i+1].isspace() and buf[i:i+1] != b"#":
+                i += 1
+            if i >= len(buf):
+                # the token may continue in the next chunk
+                more= f.read(4096)
+                if more:
+                    buf += more
+                    i= start
+                    continue
+            tokens.append(buf[start:i].decode("latin-1"))
+    magic= tokens[0]
+    if magic not in ("P2", "P5"):
+        raise ValueError(f"not a PGM file (magic number {magic!r})")
+    width, height, max_level= int(tokens[1]), int(tokens[2]), int(tokens[3])
+    if not 0 < max_level < 65536:
+        raise ValueError(f"bad PGM max level {max_level}")
+    # exactly one whitespace byte separates the header from the pixels
+    return magic, comments, width, height, max_level, i + 1
+
+def _pixelType(max_level: int, binary: bool) -> np.dtype:
+    '''This function picks the pixel dtype for a max level
+    (16-bit P5 pixels are big-endian)'''
+    if max_level < 256:
+        return np.dtype(np.uint8)
+    return np.dtype(">u2") if binary else np.dtype(np.uint16)
+
+def _textPixels(text: bytes) -> np.ndarray:
+    '''This function parses the decimal pixels of a P2 file (or part of one)
+    parameters: text - the bytes after the header
+    returns: 1-D int64 array of every value found'''
+    if b"#" in text:
+        text= _COMMENT.sub(b" ", text)
+    if not text.strip():
+        # fromstring reads blank input as a single 0
+        return np.empty(0, dtype= np.int64)
+    return np.fromstring(text, dtype= np.int64, sep= " ")
+
+def pgmInfo(filename: str) -> dict:
+    '''This function reads just the header of a Pgm file
+    parameters: filename - the Pgm file
+    returns: dict with magic, comments, width, height, max_level and offset'''
+    with open(filename, "rb") as f:
+        magic, comments, width, height, max_level, offset= _readHeader(f)
+    return {"magic": magic, "comments": comments, "width": width, "height": height,
+            "max_level": max_level, "offset": offset}
+
+def loadPGM(filename: str, mmap: bool = True) -> np.ndarray:
+    '''This function reads a P2 or P5 Pgm file into an array
+    parameters: filename - the Pgm file
+    mmap - if True, P5 pixels are memory-mapped instead of read
+    returns: (height, width) array of pixels, uint8 for max levels up to 255
+    and 16-bit otherwise'''
+    with open(filename, "rb") as f:
+        magic, _, width, height, max_level, offset= _readHeader(f)
+        if magic == "P5":
+            dtype= _pixelType(max_level, binary= True)
+            if mmap:
+                return np.memmap(filename, dtype= dtype, mode= "r", offset= offset,
+                                 shape= (height, width))
+            f.seek(offset)
+            data= f.read(width * height * dtype.itemsize)
+            if len(data) < width * height * dtype.itemsize:
+                raise ValueError(f"{filename}: expected {width * height} pixels")
+            return np.frombuffer(data, dtype= dtype).reshape(height, width)
+        f.seek(offset - 1)
+        pixels= _textPixels(f.read())
+    if pixels.size < width * height:
+        raise ValueError(f"{filename}: expected {width * height} pixels, found {pixels.size}")
+    return pixels[:width * height].astype(_pixelType(max_level, binary= False)).reshape(height, width)
+
+def iterRows(filename: str) -> Iterator[np.ndarray]:
+    '''This function streams a Pgm file one row at a time, so images larger
+    than memory can be processed
+    parameters: filename - the Pgm file
+    returns: generator of 1-D arrays of width pixels'''
+    with open(filename, "rb") as f:
+        magic, _, width, height, max_level, offset= _readHeader(f)
+        f.seek(offset)
+        if magic == "P5":
+            dtype= _pixelType(max_level, binary= True)
+            row_bytes= width * dtype.itemsize
+            for _ in range(height):
+                data= f.read(row_bytes)
+                if len(data) < row_bytes:
+                    raise ValueError(f"{filename}: image ends early")
+                yield np.frombuffer(data, dtype= dtype)
+            return
+        dtype= _pixelType(max_level, binary= False)
+        f.seek(offset - 1)
+        pending= np.empty(0, dtype= np.int64)
+        rows= 0
+        for line in f:
+            values= _textPixels(line)
+            pending= np.concatenate((pending, values)) if pending.size else values
+            while pending.size >= width and rows < height:
+                yield pending[:width].astype(dtype)
+                pending= pending[width:]
+                rows += 1
+            if rows == height:
+                return
+        if rows < height:
+            raise ValueError(f"{filename}: image ends early")
+
+def savePGM(filename: str, pixels: np.ndarray, max_level: int | None = None,
+            comment: str = "", binary: bool = True) -> None:
+    '''This function writes a 2-D array as a Pgm file in one bulk write
+    parameters: filename - the Pgm file to write
+    pixels - (height, width) array of gray levels
+    max_level - the max gray level (default: the largest pixel, at least 1)
+    comment - optional comment line (without or with the leading "#")
+    binary - if True write P5, else P2 text with one image row per line
+    returns: None'''
+    pixels= np.asarray(pixels)
+    if pixels.ndim != 2:
+        raise ValueError("pixels must be a 2-D array")
+    height, width= pixels.shape
+    if max_level is None:
+        max_level= max(1, int(pixels.max())) if pixels.size else 1
+    header= ["P5" if binary else "P2"]
+    if comment:
+        header.append(comment if comment.startswith("#") else f"# {comment}")
+    header.append(f"{width} {height}")
+    header.append(f"{max_level}")
+    head= ("\n".join(header) + "\n").encode("latin-1")
+    if binary:
+        body= pixels.astype(_pixelType(max_level, binary= True)).tobytes()
+    else:
+        rows= pixels.astype(np.int64).tolist()
+        body= ("\n".join(" ".join(map(str, row)) for row in rows) + "\n").encode("ascii")
+    with open(filename, "wb") as f:
+        f.write(head + body)
+
 def readPGM(filename: str) -> list:
     '''This function reads a Pgm file
     parameters: filename - corresponding to the str Pgm filename you want it to read
     returns: A list of strings and ints corresponding to the pgm magic number, comment,  a list of the columns and rows, the max level, and a list correspoding to the pgm'''
-    image= open(filename, "r")
-    # read header
-    magic_num= image.readline().strip()
-    comment= image.readline().strip()
-    cols_rows= image.readline().strip()
-    max_level= int(image.readline().strip())
-    # convert string like "9 10" to list ['9', '10']
-    cols_rows_list= cols_rows.split()
-    # convert str in list to int
-    for i in range(len(cols_rows_list)):
-        cols_rows_list[i]= int(cols_rows_list[i])
-    
-    header=[magic_num, comment, cols_rows_list, max_level]
-
-
-    pixels=[]
-    # read line by line without knowing how many lines
-    pixel_value= image.readline().strip()
-    pixel_int=pixel_value.split()
-    while pixel_value != "":
-        for i in range(len(pixel_int)):
-            pixel_int[i]= int(pixel_int[i])
-            pixels.append(pixel_int[i])
-        pixel_value= image.readline().strip()
-        pixel_int=pixel_value.split()
-    image.close()
+    info= pgmInfo(filename)
+    comment= info["comments"][0] if info["comments"] else ""
+    header=[info["magic"], comment, [info["width"], info["height"]], info["max_level"]]
+    # the list API is kept for old callers; new code should use loadPGM
+    if info["magic"] == "P2":
+        # every value in the file, even past width x height, as it always was
+        with open(filename, "rb") as f:
+            f.seek(info["offset"] - 1)
+            pixels= _textPixels(f.read()).tolist()
+    else:
+        pixels= loadPGM(filename, mmap= False).ravel().tolist()
     return [header, pixels]
     
 
@@ -38,21 +199,31 @@ def writePGM(filename: str, new_list: list[list[str]]) -> None:
     parameters: filename - corresponding to the str Pgm filename you want to write
     new_list - corresponding to the list returned from readPgm
     returns: None'''
-    output_file= open(filename, "w")
-    output_file.write(f"{new_list[0][0]}\n")
-    output_file.write(f"{new_list[0][1]}\n")
-    output_file.write(f"{new_list[0][2][0]} {new_list[0][2][1]}\n")
-    output_file.write(f"{new_list[0][3]}\n")
-    for i in range(len(new_list[1])):
-        output_file.write(f"{new_list[1][i]}\n")
-    output_file.close()
+    magic, comment, (cols, rows), max_level= new_list[0]
+    pixels= np.asarray(new_list[1], dtype= np.int64)
+    if magic == "P5":
+        savePGM(filename, pixels.reshape(rows, cols), max_level, comment, binary= True)
+        return
+    # same layout as always (one pixel per line), but in a single write
+    lines= [magic]
+    if comment:
+        lines.append(comment)
+    lines.append(f"{cols} {rows}")
+    lines.append(f"{max_level}")
+    lines.extend(map(str, pixels.tolist()))
+    with open(filename, "w") as output_file:
+        output_file.write("\n".join(lines) + "\n")
     
-def main() -> None:
-    image_list= readPGM("house.pgm")
-    print(image_list)
-    printTest(readPGM, "house.pgm", expected=[['P2', '# cute little house', [7, 8], 9], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 9, 0, 0, 0, 0, 0, 9, 0, 9, 0, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 9, 9, 9, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 0, 0, 0, 0, 0, 0]])
-    printTest(readPGM, "Circle.pgm", expected=[['P2', '# circle', [5, 5], 6], [0, 6, 6, 0, 0, 6, 0, 0, 6, 0, 6, 0, 0, 6, 0, 6, 0, 0, 6, 0, 0, 6, 6, 0, 0]])
-    printTest(readPGM, "Stickman.pgm", expected=[['P2', '# stickman', [9, 9], 7], [0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 0, 0, 7, 0, 0, 0, 0, 0, 0, 0, 0, 7, 0, 0, 0, 0, 7, 7, 7, 7, 7, 7, 7, 7, 7, 0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 7, 0, 0, 0, 7, 0, 0, 0, 7, 0, 0, 0, 0, 0, 7, 0]])
+def main(folder: str) -> None:
+    # the sample images are not always checked out next to this file
+    if os.path.exists("house.pgm"):
+        image_list= readPGM("house.pgm")
+        print(image_list)
+        printTest(readPGM, "house.pgm", expected=[['P2', '# cute little house', [7, 8], 9], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 9, 0, 0, 0, 0, 0, 9, 0, 9, 0, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 9, 9, 9, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 0, 0, 0, 0, 0, 0]])
+    if os.path.exists("Circle.pgm"):
+        printTest(readPGM, "Circle.pgm", expected=[['P2', '# circle', [5, 5], 6], [0, 6, 6, 0, 0, 6, 0, 0, 6, 0, 6, 0, 0, 6, 0, 6, 0, 0, 6, 0, 0, 6, 6, 0, 0]])
+    if os.path.exists("Stickman.pgm"):
+        printTest(readPGM, "Stickman.pgm", expected=[['P2', '# stickman', [9, 9], 7], [0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 0, 0, 7, 0, 0, 0, 0, 0, 0, 0, 0, 7, 0, 0, 0, 0, 7, 7, 7, 7, 7, 7, 7, 7, 7, 0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 7, 0, 0, 0, 7, 0, 0, 0, 7, 0, 0, 0, 0, 0, 7, 0]])
     image_list= writePGM("house1.pgm", [['P2', '# cute little house', [7, 8], 9], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 9, 0, 0, 0, 0, 0, 9, 0, 9, 0, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 9, 9, 9, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 9, 0, 0, 0, 9, 0, 0, 0, 0, 0, 0, 0, 0]])
     '''House1.pgm: 
     P2
@@ -68,4 +239,42 @@ def main() -> None:
     7
     0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 0, 0, 7, 0, 0, 0, 0, 0, 0, 0, 0, 7, 0, 0, 0, 0, 7, 7, 7, 7, 7, 7, 7, 7, 7, 0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 0, 7, 7, 7, 0, 0, 0, 0, 0, 7, 0, 0, 0, 7, 0, 0, 0, 7, 0, 0, 0, 0, 0, 7, 0'''
 
-main()
\ No newline at end of file
+    # P5 (8 and 16-bit), comments in odd places, and the row iterator
+    # (the files go in folder, a temporary directory the caller removes)
+    import time
+    path= os.path.join(folder, "odd.pgm")
+    with open(path, "wb") as f:
+        f.write(b"P2 # magic\n# size next\n3\n2 # levels next\n 9\n1 2 3\n# a row\n4 5 6\n")
+    printTest(readPGM, path, expected=[['P2', '# magic', [3, 2], 9], [1, 2, 3, 4, 5, 6]])
+    wide= np.arange(12, dtype= np.uint16).reshape(3, 4) * 5000
+    path16= os.path.join(folder, "wide.pgm")
+    savePGM(path16, wide, 65535, "16-bit")
+    printTest(readPGM, path16, expected=[['P5', '# 16-bit', [4, 3], 65535], wide.ravel().tolist()])
+    # a new file, since under --bench the checks above only run at the end
+    copy_path= os.path.join(folder, "copy.pgm")
+    writePGM(copy_path, [['P2', '# copy', [3, 2], 9], [1, 2, 3, 4, 5, 6]])
+    printTest(readPGM, copy_path, expected=[['P2', '# copy', [3, 2], 9], [1, 2, 3, 4, 5, 6]])
+    rows= [row.tolist() for row in iterRows(copy_path)]
+    print(f"iterRows: {rows}")
+
+    # load times for a 4-megapixel image
+    big= (np.arange(2048 * 2048) % 251).astype(np.uint8).reshape(2048, 2048)
+    for binary in (True, False):
+        big_path= os.path.join(folder, f"big{'5' if binary else '2'}.pgm")
+        start= time.perf_counter()
+        savePGM(big_path, big, 255, binary= binary)
+        saved= time.perf_counter()
+        loaded= loadPGM(big_path)
+        total= int(loaded.sum(dtype= np.int64))
+        done= time.perf_counter()
+        print(f"{'P5' if binary else 'P2'} 2048x2048: write {1000 * (saved - start):.1f} ms, "
+              f"load+sum {1000 * (done - saved):.1f} ms, match {total == int(big.sum(dtype= np.int64))}")
+
+if __name__ == "__main__":
+    # python readPGM.py --bench [--repeat N --number N --workers N --json FILE]
+    # times every printTest check below instead of just running it
+    import tempfile
+    # the checks may only run after main returns (--bench), so the scratch
+    # directory outlives main and goes away once they are done
+    with tempfile.TemporaryDirectory() as folder:
+        runMain(lambda: main(folder))
@@ -0,0 +1,158 @@
+''' Headless simulation harness: plays one game for every solution word with
+    a pluggable guessing strategy and reports throughput and guess counts.
+
+    Usage:
+        python -m simulate [--strategy entropy | random | fixed:WORD | module:function]
+                           [--workers N] [--limit N] [--max-guesses N]
+
+    A strategy is any callable taking the Wordle object and returning the
+    next guess; it can use the public Wordle API (e.g. suggestGuess).
+'''
+import argparse
+import importlib
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+from Wordle import*
+
+SOLUTIONS_FNAME = "wordle-answers.txt"
+ALLOWED_FNAME   = "wordle-allowed-guesses.txt"
+
+###########################################################################
+class HeadlessSink:
+    ''' Stand-in for WordleGUI that records the final message instead of
+        drawing it, so Wordle can run without a display.
+    '''
+    __slots__ = ("_messages",)
+
+    def __init__(self) -> None:
+        self._messages: list[str] = []
+
+    def setFinalMessage(self, message: str) -> None:
+        ''' records the message the GUI would have displayed '''
+        self._messages.append(message)
+
+    def messages(self) -> list[str]:
+        ''' getter for every message recorded so far '''
+        return self._messages
+
+###########################################################################
+def entropyStrategy(wordle: Wordle) -> str:
+    ''' strategy: always play the solver's suggestion '''
+    return wordle.suggestGuess()
+
+def randomStrategy(wordle: Wordle) -> str:
+    ''' strategy: play a random word that could still be the solution '''
+    return random.choice(wordle.remainingCandidates())
+
+def fixedOpenerStrategy(opener: str) -> Callable:
+    ''' strategy factory: open with a fixed word, then follow the solver '''
+    def strategy(wordle: Wordle) -> str:
+        return opener if wordle.numGuesses() == 0 else wordle.suggestGuess()
+    return strategy
+
+def loadStrategy(spec: str) -> Callable:
+    ''' turns a --strategy argument into a strategy callable
+    Parameters:
+        spec: "entropy", "random", "fixed:WORD", or "module:function"
+    '''
+    if spec == "entropy":
+        return entropyStrategy
+    if spec == "random":
+        return randomStrategy
+    if spec.startswith("fixed:"):
+        return fixedOpenerStrategy(spec.split(":", 1)[1])
+    module_name, _, function_name = spec.partition(":")
+    if not function_name:
+        raise ValueError(f"unknown strategy {spec!r}")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def playGame(wordle: Wordle, strategy: Callable, solution: str, max_guesses: int) -> int:
+    ''' plays one game to the end
+    Returns:
+        the number of guesses needed, or 0 if the game was lost
+    '''
+    wordle.newGame(solution = solution)
+    for n in range(1, max_guesses + 1):
+        guess = strategy(wordle)
+        result = wordle.processGuess(guess, debug = False)
+        if result is not None and len(result[0]) == len(solution):
+            return n
+    return 0
+
+###########################################################################
+# per-process state, created once by _initWorker
+_worker_wordle: Wordle | None = None
+_worker_strategy: Callable | None = None
+
+def _initWorker(strategy_spec: str) -> None:
+    ''' process pool initializer: one Wordle and strategy per worker '''
+    global _worker_wordle, _worker_strategy
+    _worker_wordle = Wordle(SOLUTIONS_FNAME, ALLOWED_FNAME)
+    _worker_wordle.setGUI(HeadlessSink())
+    _worker_strategy = loadStrategy(strategy_spec)
+
+def _playChunk(args: tuple[list[str], int]) -> list[tuple[str, int]]:
+    ''' process pool task: plays every solution in a chunk '''
+    solutions, max_guesses = args
+    return [(s, playGame(_worker_wordle, _worker_strategy, s, max_guesses)) for s in solutions]
+
+def simulate(strategy_spec: str = "entropy", workers: int | None = None,
+             limit: int | None = None, max_guesses: int = 6) -> dict:
+    ''' plays every solution word across a process pool
+    Returns:
+        dict with games, seconds, games_per_sec, mean_guesses,
+        histogram (guesses -> games) and failures (list of words)
+    '''
+    # build the shared caches (feedback matrix, opener table) once up front
+    # so the workers only ever memory-map them
+    wordle = Wordle(SOLUTIONS_FNAME, ALLOWED_FNAME)
+    wordle.setGUI(HeadlessSink())
+    wordle.suggestGuess()
+    solutions = wordle.solutionWords()[:limit]
+
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, -(-len(solutions) // (workers * 8)))
+    tasks = [(solutions[i:i + chunk], max_guesses) for i in range(0, len(solutions), chunk)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer = _initWorker,
+                             initargs = (strategy_spec,)) as pool:
+        results = [r for part in pool.map(_playChunk, tasks) for r in part]
+    seconds = time.perf_counter() - start
+
+    histogram = Counter(n for _, n in results if n > 0)
+    failures = [s for s, n in results if n == 0]
+    wins = sum(histogram.values())
+    return {
+        "games": len(results),
+        "seconds": seconds,
+        "games_per_sec": len(results) / seconds if seconds > 0 else 0.0,
+        "mean_guesses": sum(n * c for n, c in histogram.items()) / wins if wins else 0.0,
+        "histogram": dict(sorted(histogram.items())),
+        "failures": failures,
+    }
+
+###################
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "play every Wordle answer headlessly")
+    parser.add_argument("--strategy", default = "entropy")
+    parser.add_argument("--workers", type = int, default = None)
+    parser.add_argument("--limit", type = int, default = None)
+    parser.add_argument("--max-guesses", type = int, default = 6)
+    args = parser.parse_args()
+
+    report = simulate(args.strategy, args.workers, args.limit, args.max_guesses)
+    print(f"games        : {report['games']}")
+    print(f"time         : {report['seconds']:.2f} s ({report['games_per_sec']:.1f} games/sec)")
+    print(f"mean guesses : {report['mean_guesses']:.3f}")
+    print("histogram    :")
+    for guesses, count in report["histogram"].items():
+        print(f"  {guesses}: {count:5d} {'#' * (60 * count // report['games'])}")
+    print(f"failures     : {len(report['failures'])} {' '.join(report['failures'][:20])}")
+
+if __name__ == "__main__":
+    main()
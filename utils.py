@@ -1,4 +1,54 @@
 from printTest import*
+import argparse
+import hashlib
+import heapq
+import os
+import sys
+import tempfile
+import time
+from bisect import insort
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+# directory holding derived binary artifacts (feedback matrix, etc.);
+# can be redirected with the WORDLE_CACHE_DIR environment variable
+CACHE_DIR = os.environ.get("WORDLE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".wordle_cache"))
+
+def cachePath(name: str) -> str:
+    '''This function returns the path of a file inside the cache directory,
+    creating the directory if needed
+    parameters: name - file name inside the cache directory
+    returns: the full path'''
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
+
+@contextmanager
+def scratchCache() -> Iterator[str]:
+    '''This context manager points cachePath at a new temporary directory
+    and removes it afterwards, so tests that build artifacts for throwaway
+    word lists leave the shared cache alone
+    returns: the temporary cache directory'''
+    global CACHE_DIR
+    saved = CACHE_DIR
+    with tempfile.TemporaryDirectory() as directory:
+        CACHE_DIR = directory
+        try:
+            yield directory
+        finally:
+            CACHE_DIR = saved
+
+def contentHash(*parts: bytes) -> str:
+    '''This function hashes one or more byte strings so derived artifacts
+    can be keyed by the exact content they were built from
+    parameters: parts - any number of bytes objects
+    returns: the hex sha256 digest'''
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
 def binarySearch(item: str, alist:list[str]) -> bool:
     low= 0
     high= len(alist)-1
@@ -12,23 +62,107 @@ def binarySearch(item: str, alist:list[str]) -> bool:
             low = mid + 1
     return False
         
-def mergeSort(alist: list[str]) -> list[str]:
-    if len(alist) <= 1:
-        return alist
-    mid=len(alist) // 2 
-    blist= alist[:mid]
-    clist= alist[mid:]
-    blist= mergeSort(blist)
-    clist=mergeSort(clist)
-    return merge(blist, clist)
+# below this many words mergeSort stays in one process: starting workers
+# and shipping the words to them costs more than it saves
+PARALLEL_CUTOFF = 200_000
+# length of the runs mergeSort builds by insertion before merging
+_RUN = 32
+
+def mergeSort(alist: list[str], workers: int = 1) -> list[str]:
+    '''This function sorts a list into a new list, bottom up: short runs are
+    sorted by insertion, then runs of width 32, 64, ... are merged back and
+    forth between the copy and one buffer of the same size, with no
+    recursion and no slicing per level
+    parameters: alist - the list to sort (left unchanged)
+    workers - if more than 1 and the list is long enough, sort partitions
+    in that many processes and merge them (see parallelMergeSort)
+    returns: the sorted list'''
+    if workers > 1 and len(alist) >= PARALLEL_CUTOFF:
+        return parallelMergeSort(alist, workers)
+    n = len(alist)
+    src = list(alist)
+    # short runs first, by binary insertion (bisect does the comparisons in C)
+    for lo in range(0, n, _RUN):
+        run = []
+        for word in src[lo:lo + _RUN]:
+            insort(run, word)
+        src[lo:lo + _RUN] = run
+    dst = [None] * n
+    width = _RUN
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            _mergeRuns(src, lo, min(lo + width, n), min(lo + 2 * width, n), dst)
+        src, dst = dst, src
+        width *= 2
+    return src
+
+def _mergeRuns(src: list[str], lo: int, mid: int, hi: int, dst: list[str]) -> None:
+    '''This function merges the sorted runs src[lo:mid] and src[mid:hi] into
+    dst[lo:hi] (ties keep the left word first)'''
+    if mid >= hi or not src[mid] < src[mid - 1]:
+        # a lone run, or runs already in order: copy straight across
+        dst[lo:hi] = src[lo:hi]
+        return
+    i = lo
+    j = mid
+    k = lo
+    left = src[i]
+    right = src[j]
+    while True:
+        if right < left:
+            dst[k] = right
+            k += 1
+            j += 1
+            if j == hi:
+                dst[k:hi] = src[i:mid]
+                return
+            right = src[j]
+        else:
+            dst[k] = left
+            k += 1
+            i += 1
+            if i == mid:
+                dst[k:hi] = src[j:hi]
+                return
+            left = src[i]
+
+def _sortPartition(part: list[str]) -> list[str]:
+    '''This function is the process pool task of parallelMergeSort'''
+    return mergeSort(part)
 
+def parallelMergeSort(alist: list[str], workers: int | None = None,
+                      cutoff: int = PARALLEL_CUTOFF) -> list[str]:
+    '''This function sorts one partition per worker process with mergeSort
+    and combines the sorted partitions with mergeMany; short lists (under
+    cutoff) are sorted in this process instead
+    parameters: alist - the list to sort (left unchanged)
+    workers - number of processes (default: one per core)
+    cutoff - fewest words worth sorting in parallel
+    returns: the sorted list'''
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(alist) < cutoff:
+        return mergeSort(alist)
+    step = -(-len(alist) // workers)
+    parts = [alist[i:i + step] for i in range(0, len(alist), step)]
+    with ProcessPoolExecutor(workers) as pool:
+        return mergeMany(list(pool.map(_sortPartition, parts)))
 
+def mergeMany(lists: list[list[str]]) -> list[str]:
+    '''This function merges any number of sorted lists at once with a heap
+    (k-way), instead of merging them two at a time
+    parameters: lists - the sorted lists
+    returns: one sorted list'''
+    if len(lists) <= 2:
+        return merge(*lists) if len(lists) == 2 else list(lists[0]) if lists else []
+    return list(heapq.merge(*lists))
 
 def merge(blist:list[str], clist:list[str]) -> list[str]:
     final=[]
     i=0; j=0
     while i < len(blist) and j <len(clist):
-        if blist[i] < clist[j]:
+        # ties take blist first, so merging sorted partitions stays stable
+        if not clist[j] < blist[i]:
             final.append(blist[i])
             i+=1
         else:
@@ -40,6 +174,220 @@ def merge(blist:list[str], clist:list[str]) -> list[str]:
 
 
 
+def normalizeWord(word: str) -> str:
+    '''This function puts a word in the form lexicons are sorted and
+    compared in: surrounding whitespace removed and case folded (casefold,
+    not lower, so e.g. "STRASSE" and "straße" are the same word)
+    parameters: word - the word
+    returns: the normalized word'''
+    return word.strip().casefold()
+
+def _spillRun(words: list[str], directory: str, number: int) -> str:
+    '''This function writes one sorted run to a temporary file, one word
+    per line
+    returns: the file path'''
+    path = os.path.join(directory, f"run-{number:05d}.txt")
+    with open(path, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.write("\n".join(words))
+        f.write("\n")
+    return path
+
+def _readRun(path: str) -> Iterator[str]:
+    '''This function streams the words of a spilled run back in order'''
+    with open(path, "r", encoding="utf-8", buffering=1 << 16) as f:
+        for line in f:
+            yield line[:-1]
+
+def externalSort(words: Iterable[str], run_size: int = 500_000, normalize: bool = True,
+                 dedupe: bool = True, tmp_dir: str | None = None,
+                 stats: dict | None = None) -> Iterator[str]:
+    '''This function sorts more words than fit in memory: words are read
+    run_size at a time, each run is sorted and spilled to a temporary file,
+    and the runs are merged back with a heap-based k-way merge that holds
+    one buffered line per run. Only run_size words are ever in memory.
+    parameters: words - any iterable of words (e.g. an open file)
+    run_size - words sorted in memory at a time
+    normalize - if True, words are stripped and case folded first
+    dedupe - if True, each word is returned once
+    tmp_dir - where the runs go (default: the system temp directory)
+    stats - if given, filled with words_in, words_out and runs
+    returns: an iterator over the sorted words (the temporary files are
+    removed once it is exhausted or closed)'''
+    stats = {} if stats is None else stats
+    stats.update(words_in=0, words_out=0, runs=0)
+    with tempfile.TemporaryDirectory(prefix="wordsort-", dir=tmp_dir) as directory:
+        runs = []
+        run = set() if dedupe else []
+        add = run.add if dedupe else run.append
+        for word in words:
+            stats["words_in"] += 1
+            word = normalizeWord(word) if normalize else word.rstrip("\n")
+            if not word:
+                continue
+            add(word)
+            if len(run) >= run_size:
+                runs.append(_spillRun(sorted(run), directory, len(runs)))
+                run.clear()
+        if not runs:
+            # everything fit in one run: no files needed
+            merged = iter(sorted(run))
+        else:
+            if run:
+                runs.append(_spillRun(sorted(run), directory, len(runs)))
+            run.clear()
+            merged = heapq.merge(*(_readRun(path) for path in runs))
+        stats["runs"] = len(runs)
+        previous = None
+        for word in merged:
+            if dedupe and word == previous:
+                continue
+            previous = word
+            stats["words_out"] += 1
+            yield word
+
+def sortWordFile(in_path: str, out_path: str, run_size: int = 500_000, normalize: bool = True,
+                 dedupe: bool = True, tmp_dir: str | None = None) -> dict:
+    '''This function sorts a word file (one word per line, UTF-8) into
+    another with externalSort, never holding more than run_size words
+    parameters: in_path, out_path - the input and output files
+    run_size, normalize, dedupe, tmp_dir - as for externalSort
+    returns: dict with words_in, words_out and runs'''
+    stats: dict = {}
+    with open(in_path, encoding="utf-8") as src, \
+            open(out_path, "w", encoding="utf-8", buffering=1 << 16) as dst:
+        for word in externalSort(src, run_size, normalize, dedupe, tmp_dir, stats):
+            dst.write(word)
+            dst.write("\n")
+    return stats
+
+def inMemorySort(words: Iterable[str], normalize: bool = True, dedupe: bool = True) -> list[str]:
+    '''This function is the in-memory counterpart of externalSort (same
+    normalization and deduplication, everything held in RAM)
+    returns: the sorted list'''
+    if normalize:
+        words = (normalizeWord(word) for word in words)
+    else:
+        words = (word.rstrip("\n") for word in words)
+    words = (word for word in words if word)
+    return sorted(set(words) if dedupe else words)
+
+def peakMemoryMB() -> float:
+    '''This function returns the high-water mark of this process's resident
+    memory, in MB (0.0 where the platform does not report it)'''
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+def syntheticLexicon(path: str, size: int, seed: int = 0) -> None:
+    '''This function writes a random mixed-case, multi-script word list
+    with duplicates (for sort benchmarks)
+    parameters: path - file to write
+    size - number of lines'''
+    import random
+    rng = random.Random(seed)
+    alphabets = ["abcdefghijklmnopqrstuvwxyz", "abcdefghijklmnopqrstuvwxyzàéèêëïôüßç",
+                 "абвгдеёжзийклмнопрстуфхцчшщъыьэюя", "αβγδεζηθικλμνξοπρστυφχψω"]
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(size):
+            letters = rng.choice(alphabets)
+            word = "".join(rng.choices(letters, k=rng.randint(3, 9)))
+            f.write((word.upper() if rng.random() < 0.2 else word) + "\n")
+
+def _sortFileJob(mode: str, path: str, run_size: int) -> tuple[float, float, int]:
+    '''This function sorts a word file in a fresh process, so its memory
+    high-water mark belongs to the sort alone
+    returns: (seconds, peak MB, words out)'''
+    start = time.perf_counter()
+    with open(path, encoding="utf-8") as f:
+        if mode == "external":
+            count = sum(1 for _ in externalSort(f, run_size))
+        else:
+            count = len(inMemorySort(f))
+    return time.perf_counter() - start, peakMemoryMB(), count
+
+def sortBenchmark(size: int = 2_000_000, run_size: int = 250_000) -> list[tuple[str, float, float, int]]:
+    '''This function times the external and in-memory sorts on the same
+    synthetic lexicon, each in its own process
+    returns: (mode, seconds, peak MB, words out) per mode'''
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="wordsort-bench-") as directory:
+        path = os.path.join(directory, "lexicon.txt")
+        syntheticLexicon(path, size)
+        # a baseline process that only imports this module, for reference
+        for mode in ("baseline", "external", "in-memory"):
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                if mode == "baseline":
+                    rows.append((mode, 0.0, pool.submit(peakMemoryMB).result(), 0))
+                else:
+                    seconds, peak, count = pool.submit(_sortFileJob, mode, path, run_size).result()
+                    rows.append((mode, seconds, peak, count))
+    return rows
+
+def mergeBenchmark(sizes: list[int], workers: int | None = None,
+                   seed: int = 0) -> list[tuple[int, dict[str, float]]]:
+    '''This function times mergeSort, parallelMergeSort and the built-in
+    sorted on random words
+    parameters: sizes - list lengths to try
+    workers - processes for the parallel mode (default: one per core)
+    returns: (size, {mode: seconds}) per size'''
+    import random
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    rows = []
+    for size in sizes:
+        words = ["".join(rng.choices(letters, k=rng.randint(3, 12))) for _ in range(size)]
+        expected = None
+        timings = {}
+        for mode, sort in (("sorted", sorted), ("mergeSort", mergeSort),
+                           ("parallel", lambda w: parallelMergeSort(w, workers))):
+            start = time.perf_counter()
+            result = sort(words)
+            timings[mode] = time.perf_counter() - start
+            if expected is None:
+                expected = result
+            elif result != expected:
+                raise AssertionError(f"{mode} sorted {size} words wrongly")
+        rows.append((size, timings))
+    return rows
+
+class _Tagged(str):
+    '''A word that remembers its position in the input, so tests can see
+    whether equal words kept their order'''
+
+def _checkParallelSort(words: list[str], workers: int) -> tuple[bool, bool]:
+    '''This function is a test helper: runs parallelMergeSort with no cutoff,
+    so even a short list goes through the process pool and mergeMany
+    parameters: words - the words to sort
+    workers - number of processes
+    returns: whether the result equals sorted(words), and whether equal
+    words kept their input order'''
+    tagged = []
+    for i, word in enumerate(words):
+        tagged.append(_Tagged(word))
+        tagged[-1].index = i
+    result = parallelMergeSort(tagged, workers, cutoff=0)
+    stable = all(a.index < b.index for a, b in zip(result, result[1:]) if a == b)
+    return result == sorted(words), stable
+
+def _checkSortWordFile(words: list[str], run_size: int) -> tuple[list[str], dict]:
+    '''This function runs sortWordFile on words in its own scratch directory,
+    so the check still works when --bench runs it after main has moved on
+    returns: (the words in the output file, the stats)'''
+    with tempfile.TemporaryDirectory() as directory:
+        in_path = os.path.join(directory, "in.txt")
+        out_path = os.path.join(directory, "out.txt")
+        with open(in_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(words) + "\n")
+        stats = sortWordFile(in_path, out_path, run_size)
+        with open(out_path, encoding="utf-8") as f:
+            return f.read().split(), stats
+
 def main() -> None:
     item="bow"
     alist= ["bow", "cow","dow", "how", "kow", "low", "pow", "row", "sow", "xow"]
@@ -90,10 +438,45 @@ def main() -> None:
     printTest(mergeSort, alist, expected=["america", "china", "dutch", "iran", "mumbai", "nigeria", "poland"])
     alist=["is", "it", "possible", "to", "sort", "this"]
     printTest(mergeSort, alist, expected=["is", "it", "possible", "sort", "this", "to"])
+    alist=["Straße", "apple", "STRASSE", " Apple", "éclair", "zebra", "Zebra"]
+    printTest(inMemorySort, alist, expected=["apple", "strasse", "zebra", "éclair"])
+    # runs of two words, so the merge really runs
+    printTest(_checkSortWordFile, alist, 2,
+              expected=(["apple", "strasse", "zebra", "éclair"], {"words_in": 7, "words_out": 4, "runs": 4}))
+    printTest(mergeSort, ["zebra", "éclair", "strasse", "apple"], expected=["apple", "strasse", "zebra", "éclair"])
+
+    printTest(mergeMany, [["b", "e"], ["a", "f"], ["c", "d"]], expected=["a", "b", "c", "d", "e", "f"])
+    printTest(mergeSort, ["b", "a", "b", "c", "a"], 2, expected=["a", "a", "b", "b", "c"])
+    # two partitions merge with merge, more with mergeMany's heap
+    dupes = ["pear", "fig", "kiwi", "fig", "apple", "pear", "fig", "date", "apple", "kiwi", "fig"]
+    printTest(_checkParallelSort, dupes, 2, expected=(True, True))
+    printTest(_checkParallelSort, dupes, 4, expected=(True, True))
+
+    parser = argparse.ArgumentParser(description = "utils checks and sort benchmarks")
+    # python utils.py --sort-bench [N]: external vs in-memory sort of N words
+    parser.add_argument("--sort-bench", type = int, nargs = "?", const = 2_000_000, default = None)
+    # python utils.py --merge-bench [N ...] [--workers N]: mergeSort vs sorted
+    parser.add_argument("--merge-bench", type = int, nargs = "*", default = None)
+    parser.add_argument("--workers", type = int, default = None)
+    args, _ = parser.parse_known_args()
+    if args.sort_bench:
+        size = args.sort_bench
+        print(f"{'mode':>10} {'seconds':>8} {'words/s':>10} {'peak MB':>8} {'words out':>10}")
+        for mode, seconds, peak, count in sortBenchmark(size):
+            rate = f"{size / seconds:10,.0f}" if seconds else f"{'':>10}"
+            print(f"{mode:>10} {seconds:8.2f} {rate} {peak:8.1f} {count:10,}")
+    if args.merge_bench is not None:
+        sizes = args.merge_bench or [10_000, 100_000, 1_000_000]
+        print(f"{'words':>10} {'mergeSort':>10} {'parallel':>10} {'sorted':>10}  (seconds)")
+        for size, timings in mergeBenchmark(sizes, args.workers):
+            print(f"{size:10,} " + " ".join(f"{timings[mode]:10.3f}"
+                                            for mode in ("mergeSort", "parallel", "sorted")))
     
     
 
     
 if __name__ == "__main__":
-    main()
+    # python utils.py --bench [--repeat N --number N --workers N --json FILE]
+    # times every printTest check below instead of just running it
+    runMain(main)
 
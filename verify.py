@@ -0,0 +1,134 @@
+''' Exhaustive feedback verification: scores every (solution, allowed guess)
+    pair with Wordle.checkGuess and compares it with an independent
+    reference implementation of the duplicate-letter rules.
+
+    Usage:
+        python verify.py [--workers N] [--limit N] [--show N]
+
+    --limit checks only the first N solutions; --show sets how many
+    mismatches are printed. Run a full sweep before shipping any change to
+    scoring: duplicate-letter bugs only show up on a small fraction of
+    pairs.
+'''
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from Wordle import*
+
+SOLUTIONS_FNAME = "wordle-answers.txt"
+ALLOWED_FNAME   = "wordle-allowed-guesses.txt"
+
+###########################################################################
+def referenceScore(guess: str, solution: str) -> list[list[int]]:
+    ''' scores a guess the way the official game does, written separately
+        from the engine on purpose: exact matches first, then each remaining
+        guess letter (left to right) is misplaced only while the solution
+        still has an unmatched copy of it
+    Returns:
+        [correct indices, misplaced indices]
+    '''
+    correct = [i for i in range(len(guess)) if guess[i] == solution[i]]
+    unmatched = Counter(solution[i] for i in range(len(solution)) if guess[i] != solution[i])
+    misplaced = []
+    for i in range(len(guess)):
+        if guess[i] != solution[i] and unmatched[guess[i]] > 0:
+            unmatched[guess[i]] -= 1
+            misplaced.append(i)
+    return [correct, misplaced]
+
+###########################################################################
+# per-process state, created once by _initWorker
+_worker_wordle: Wordle | None = None
+_worker_guesses: list[str] | None = None
+
+def _initWorker() -> None:
+    ''' process pool initializer: one Wordle and guess list per worker '''
+    global _worker_wordle, _worker_guesses
+    _worker_wordle = Wordle(SOLUTIONS_FNAME, ALLOWED_FNAME)
+    _worker_guesses = list(loadDictionary(SOLUTIONS_FNAME, ALLOWED_FNAME).allowed())
+
+def _verifyChunk(args: tuple[list[str], int]) -> tuple[int, int, list[tuple]]:
+    ''' process pool task: checks every allowed guess against a chunk of solutions
+    Returns:
+        pairs checked, mismatches found, and up to show of the mismatches as
+        (solution, guess, checkGuess result, reference result)
+    '''
+    solutions, show = args
+    wordle = _worker_wordle
+    pairs = 0
+    found = 0
+    examples = []
+    for solution in solutions:
+        wordle.newGame(solution = solution)
+        for guess in _worker_guesses:
+            got = wordle.checkGuess(guess)
+            expected = referenceScore(guess, solution)
+            if sorted(got[0]) != expected[0] or sorted(got[1]) != expected[1]:
+                found += 1
+                if len(examples) < show:
+                    examples.append((solution, guess, got, expected))
+        pairs += len(_worker_guesses)
+    return pairs, found, examples
+
+def sweep(workers: int | None = None, limit: int | None = None, show: int = 20,
+          progress: bool = True) -> dict:
+    ''' checks every (solution, allowed guess) pair across a process pool
+    Returns:
+        dict with pairs, seconds, pairs_per_sec, mismatches (count) and
+        examples (the first show mismatches found)
+    '''
+    # build the shared caches once up front so workers only memory-map them
+    wordle = Wordle(SOLUTIONS_FNAME, ALLOWED_FNAME)
+    solutions = list(wordle.solutionWords()[:limit])
+    guesses = len(loadDictionary(SOLUTIONS_FNAME, ALLOWED_FNAME).allowed())
+
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, -(-len(solutions) // (workers * 16)))
+    tasks = [(solutions[i:i + chunk], show) for i in range(0, len(solutions), chunk)]
+    total = len(solutions) * guesses
+
+    pairs = 0
+    found = 0
+    examples = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer = _initWorker) as pool:
+        for n, bad, some in pool.map(_verifyChunk, tasks):
+            pairs += n
+            found += bad
+            examples.extend(some[:show - len(examples)])
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(f"\r{pairs:>11,} / {total:,} pairs  {pairs / elapsed:,.0f}/s  "
+                      f"{found} mismatches", end = "", file = sys.stderr, flush = True)
+    if progress:
+        print(file = sys.stderr)
+    seconds = time.perf_counter() - start
+    return {"pairs": pairs, "seconds": seconds,
+            "pairs_per_sec": pairs / seconds if seconds > 0 else 0.0,
+            "mismatches": found, "examples": examples}
+
+###################
+def main() -> None:
+    printTest(referenceScore, "speed", "abide", expected=[[], [2, 4]])
+    printTest(referenceScore, "eerie", "abide", expected=[[4], [3]])
+    printTest(referenceScore, "abbey", "babes", expected=[[2, 3], [0, 1]])
+    printTest(referenceScore, "llama", "hello", expected=[[], [0, 1]])
+
+    parser = argparse.ArgumentParser(description = "check checkGuess against a reference scorer")
+    parser.add_argument("--workers", type = int, default = None)
+    parser.add_argument("--limit", type = int, default = None)
+    parser.add_argument("--show", type = int, default = 20)
+    args = parser.parse_args()
+
+    report = sweep(args.workers, args.limit, args.show)
+    print(f"pairs        : {report['pairs']:,}")
+    print(f"time         : {report['seconds']:.1f} s ({report['pairs_per_sec']:,.0f} pairs/sec)")
+    print(f"mismatches   : {report['mismatches']:,}")
+    for solution, guess, got, expected in report["examples"]:
+        print(f"  {solution} <- {guess}: checkGuess {got}, reference {expected}")
+
+if __name__ == "__main__":
+    main()